@@ -0,0 +1,150 @@
+"""
+대화 상태 체크포인터
+LangGraph InMemorySaver에 스레드별 최신 체크포인트만 남기는 정리(keep_latest)와
+유휴 스레드 만료(TTL/최대 스레드 수)를 추가해 대화 상태 메모리가 무한히 늘지 않게 한다
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+# 마지막 접근 후 이 시간(초)이 지난 대화 스레드는 삭제
+DEFAULT_THREAD_TTL = 24 * 60 * 60
+
+# 동시에 유지하는 최대 대화 스레드 수 (초과 시 가장 오래 사용하지 않은 스레드부터 삭제)
+DEFAULT_MAX_THREADS = 10000
+
+
+class ConversationCheckpointer(InMemorySaver):
+    """
+    정리/만료 기능을 가진 인메모리 체크포인터
+
+    InMemorySaver는 슈퍼스텝마다 전체 메시지 목록을 담은 체크포인트를 계속 쌓으므로
+    턴이 끝날 때 prune()으로 최신 체크포인트만 남기고, expire_idle()로 오래된 스레드를 지운다.
+    스레드별로 저장한 키를 인덱싱해 두어 삭제가 전체 저장소 크기와 무관하게 동작한다.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_THREAD_TTL,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_threads = max_threads
+        self._clock = clock
+        # 스레드 ID -> 마지막 접근 시각 (오래된 순서)
+        self._last_access: "OrderedDict[str, float]" = OrderedDict()
+        self._blob_keys: Dict[str, Set[Tuple]] = defaultdict(set)
+        self._write_keys: Dict[str, Set[Tuple]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def _touch(self, thread_id: str):
+        self._last_access[thread_id] = self._clock()
+        self._last_access.move_to_end(thread_id)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            self._blob_keys[thread_id].update(
+                (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+            )
+            self._touch(thread_id)
+        return result
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            self._write_keys[thread_id].add(key)
+
+    def get_tuple(self, config):
+        with self._lock:
+            return super().get_tuple(config)
+
+    def thread_ids(self) -> List[str]:
+        """체크포인트가 있는 스레드 ID 목록 (오래 사용하지 않은 순)"""
+        with self._lock:
+            return list(self._last_access)
+
+    def has_thread(self, thread_id: str) -> bool:
+        return thread_id in self._last_access
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 모든 체크포인트/쓰기/채널 값 삭제 (O(스레드 크기))"""
+        with self._lock:
+            self.storage.pop(thread_id, None)
+            for key in self._write_keys.pop(thread_id, ()):
+                self.writes.pop(key, None)
+            for key in self._blob_keys.pop(thread_id, ()):
+                self.blobs.pop(key, None)
+            self._last_access.pop(thread_id, None)
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """
+        스레드 체크포인트 정리
+
+        Args:
+            thread_ids: 정리할 스레드 ID 목록
+            strategy: "keep_latest"는 네임스페이스별 최신 체크포인트만 유지, "delete"는 전부 삭제
+        """
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"지원하지 않는 정리 전략입니다: {strategy}")
+
+        with self._lock:
+            for thread_id in thread_ids:
+                namespaces = self.storage.get(thread_id)
+                if not namespaces:
+                    continue
+
+                keep_blobs: Set[Tuple] = set()
+                keep_writes: Set[Tuple] = set()
+                for checkpoint_ns, checkpoints in namespaces.items():
+                    if not checkpoints:
+                        continue
+                    latest_id = max(checkpoints)
+                    saved, metadata, _ = checkpoints[latest_id]
+                    # 부모 체크포인트는 삭제되므로 연결을 끊어 둔다
+                    namespaces[checkpoint_ns] = {latest_id: (saved, metadata, None)}
+
+                    versions = self.serde.loads_typed(saved)["channel_versions"]
+                    keep_blobs.update(
+                        (thread_id, checkpoint_ns, channel, version) for channel, version in versions.items()
+                    )
+                    keep_writes.add((thread_id, checkpoint_ns, latest_id))
+
+                for key in self._blob_keys[thread_id] - keep_blobs:
+                    self.blobs.pop(key, None)
+                self._blob_keys[thread_id] &= keep_blobs
+                for key in self._write_keys[thread_id] - keep_writes:
+                    self.writes.pop(key, None)
+                self._write_keys[thread_id] &= keep_writes
+
+    def expire_idle(self) -> List[str]:
+        """
+        TTL이 지났거나 최대 스레드 수를 넘는 스레드 삭제
+
+        Returns:
+            삭제된 스레드 ID 목록
+        """
+        expired = []
+        with self._lock:
+            deadline = self._clock() - self.ttl_seconds
+            while self._last_access:
+                thread_id, last_access = next(iter(self._last_access.items()))
+                if last_access > deadline and len(self._last_access) <= self.max_threads:
+                    break
+                self.delete_thread(thread_id)
+                expired.append(thread_id)
+        return expired
@@ -0,0 +1,268 @@
+"""
+오프라인 결정적 가짜 LLM/검색 제공자
+외부 API(Gemini, DuckDuckGo) 없이 전체 /api/chat 경로를 현실적인 지연 시간으로
+재현 가능하게 실행하기 위한 벤치마크/부하 테스트용 구현
+"""
+
+import copy
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+class FakeProviderError(RuntimeError):
+    """에러 주입으로 발생시키는 가짜 제공자 오류"""
+
+
+class LatencyModel:
+    """
+    지연 시간 분포 모델
+
+    distribution:
+        fixed     - 항상 mean_ms
+        uniform   - [mean - jitter, mean + jitter] 균등 분포
+        normal    - 평균 mean, 표준편차 jitter 정규 분포
+        lognormal - 평균 mean, 표준편차 jitter 로그정규 분포 (꼬리가 긴 실제 API 지연과 유사)
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(
+        self,
+        mean_ms: float,
+        jitter_ms: float = 0.0,
+        distribution: str = "lognormal",
+        rng: Optional[random.Random] = None,
+    ):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"지원하지 않는 지연 분포입니다: {distribution}")
+        self.mean_ms = max(0.0, mean_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self.distribution = distribution
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+        # 로그정규 분포 파라미터 (산술 평균/표준편차 → mu/sigma)
+        if self.mean_ms > 0 and self.jitter_ms > 0:
+            variance_ratio = 1 + (self.jitter_ms / self.mean_ms) ** 2
+            self._sigma = math.sqrt(math.log(variance_ratio))
+            self._mu = math.log(self.mean_ms) - self._sigma ** 2 / 2
+        else:
+            self._sigma = 0.0
+            self._mu = 0.0
+
+    def sample(self) -> float:
+        """지연 시간 샘플 (초)"""
+        if self.mean_ms == 0 or self.distribution == "fixed" or self.jitter_ms == 0:
+            return self.mean_ms / 1000
+
+        with self._lock:
+            if self.distribution == "uniform":
+                value = self._rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+            elif self.distribution == "normal":
+                value = self._rng.gauss(self.mean_ms, self.jitter_ms)
+            else:
+                value = self._rng.lognormvariate(self._mu, self._sigma)
+        return max(0.0, value) / 1000
+
+    def wait(self):
+        """샘플링한 시간만큼 대기"""
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _ErrorInjector:
+    """확률적 에러 주입"""
+
+    def __init__(self, error_rate: float, rng: random.Random, name: str):
+        self.error_rate = min(max(error_rate, 0.0), 1.0)
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._name = name
+
+    def maybe_fail(self):
+        if self.error_rate <= 0:
+            return
+        with self._lock:
+            fail = self._rng.random() < self.error_rate
+        if fail:
+            raise FakeProviderError(f"{self._name} 에러 주입")
+
+
+def _stable_hash(text: str) -> int:
+    """프로세스와 무관하게 항상 같은 해시 (내장 hash()는 실행마다 달라짐)"""
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class FakeSearchTool:
+    """DuckDuckGoSearchRun 대체 - 쿼리마다 항상 같은 가짜 상품 검색 결과"""
+
+    SHOPS = ("쿠팡", "11번가", "G마켓", "네이버쇼핑", "SSG")
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        rng: Optional[random.Random] = None,
+        result_count: int = 5,
+    ):
+        rng = rng or random.Random()
+        self.latency = latency or LatencyModel(0)
+        self._errors = _ErrorInjector(error_rate, rng, "검색")
+        self.result_count = result_count
+
+    def run(self, query: str) -> str:
+        """가짜 웹 검색 실행"""
+        self.latency.wait()
+        self._errors.maybe_fail()
+
+        seed = _stable_hash(query)
+        base_price = 100000 + seed % 1400000
+        lines = []
+        for i in range(self.result_count):
+            price = (base_price + i * (seed % 7 + 1) * 13000) // 100 * 100
+            shop = self.SHOPS[(seed + i) % len(self.SHOPS)]
+            rating = 3.5 + ((seed >> i) % 15) / 10
+            lines.append(f"{query} 모델 {i + 1} - {shop} {price:,}원 (평점 {rating:.1f})")
+        return "\n".join(lines)
+
+
+class FakeChatModel:
+    """
+    ChatGoogleGenerativeAI 대체 - 첫 토큰 지연과 초당 토큰 수를 흉내내는 결정적 LLM
+
+    응답에는 프롬프트의 이전 대화에서 첫 사용자 질문을 다시 언급하므로
+    메모리 파이프라인이 깨지면 응답 내용으로 바로 드러난다.
+    bind_tools()로 도구를 연결하면 이전 검색 결과가 없거나 후속 질문이 아닐 때
+    검색 도구 호출을 반환한다.
+    """
+
+    _HISTORY_LINE = re.compile(r"^\d+\. 사용자: (.+)$", re.MULTILINE)
+    _RESULT_LINE = re.compile(r"^.+ - .+ [\d,]+원.*$", re.MULTILINE)
+    # 이전 대화/검색 결과로 답할 수 있는 후속 질문 표현
+    _FOLLOW_UP = re.compile(r"그\s?중|그거|이거|그것|그 제품|둘 중|그럼|[은는]\?$")
+    PREVIOUS_RESULTS_MARKER = "## 이전 검색 결과"
+
+    def __init__(
+        self,
+        first_token_latency: Optional[LatencyModel] = None,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        rng: Optional[random.Random] = None,
+    ):
+        rng = rng or random.Random()
+        self.first_token_latency = first_token_latency or LatencyModel(0)
+        self.tokens_per_second = tokens_per_second
+        self._errors = _ErrorInjector(error_rate, rng, "LLM")
+        self._tool_names: List[str] = []
+
+    def bind_tools(self, tools: Sequence, **kwargs) -> "FakeChatModel":
+        """도구 호출이 가능한 복사본 반환 (지연/에러 설정 공유)"""
+        bound = copy.copy(self)
+        bound._tool_names = [
+            t["function"]["name"] if isinstance(t, dict) else getattr(t, "name", str(t)) for t in tools
+        ]
+        return bound
+
+    @staticmethod
+    def _content(message) -> str:
+        if isinstance(message, dict):
+            return str(message.get("content", ""))
+        return str(getattr(message, "content", message))
+
+    @staticmethod
+    def _role(message) -> str:
+        if isinstance(message, dict):
+            return str(message.get("role", ""))
+        return str(getattr(message, "type", ""))
+
+    def _tool_call(self, messages: List) -> Optional[dict]:
+        """검색이 필요하면 도구 호출, 이미 검색했거나 후속 질문이면 None"""
+        if not self._tool_names:
+            return None
+        roles = [self._role(m) for m in messages]
+        if "human" not in roles and "user" not in roles:
+            return None
+        last_human = max(i for i, role in enumerate(roles) if role in ("human", "user"))
+        if "tool" in roles[last_human:]:
+            return None
+
+        query = self._content(messages[last_human]).strip()
+        has_results = any(self.PREVIOUS_RESULTS_MARKER in self._content(m) for m in messages[:last_human])
+        if has_results and self._FOLLOW_UP.search(query):
+            return None
+        return {"name": self._tool_names[0], "args": {"query": query}, "id": f"call_{_stable_hash(query):08x}"}
+
+    def _latest_results(self, messages: List) -> List[str]:
+        """검색 결과가 포함된 가장 마지막 메시지의 결과 줄 (이전 응답의 목록 줄은 제외)"""
+        for message in reversed(messages):
+            lines = [
+                line for line in self._RESULT_LINE.findall(self._content(message))
+                if not line.startswith("- ")
+            ]
+            if lines:
+                return lines
+        return []
+
+    def _compose(self, messages: List) -> str:
+        """프롬프트로부터 결정적인 응답 생성"""
+        prompt = "\n".join(self._content(m) for m in messages)
+        previous = self._HISTORY_LINE.findall(prompt)
+        results = self._latest_results(messages)
+
+        parts = []
+        if previous:
+            parts.append(f"이전에 문의하신 '{previous[0]}' 기준으로 답변드립니다.")
+        if results:
+            parts.append("검색된 상품 중 추천 목록입니다:")
+            parts.extend(f"- {line}" for line in results[:3])
+        else:
+            parts.append("관련 상품 정보를 찾았습니다.")
+        parts.append("구체적인 가격과 재고는 각 쇼핑몰에서 확인해주세요.")
+        return "\n".join(parts)
+
+    def _tokens(self, text: str) -> List[str]:
+        """공백을 유지한 채 단어 단위 토큰으로 분할"""
+        return re.findall(r"\S+\s*|\s+", text)
+
+    def invoke(self, messages: List, *args, **kwargs) -> AIMessage:
+        """응답 전체를 한 번에 반환 (토큰 생성 시간까지 대기)"""
+        self._errors.maybe_fail()
+        tool_call = self._tool_call(messages)
+        if tool_call:
+            self.first_token_latency.wait()
+            return AIMessage(content="", tool_calls=[tool_call])
+        text = self._compose(messages)
+        self.first_token_latency.wait()
+        if self.tokens_per_second > 0:
+            time.sleep(len(self._tokens(text)) / self.tokens_per_second)
+        return AIMessage(content=text)
+
+    def stream(self, messages: List, *args, **kwargs) -> Iterator[AIMessageChunk]:
+        """토큰 단위 스트리밍 (초당 토큰 수에 맞춰 전송)"""
+        self._errors.maybe_fail()
+        tool_call = self._tool_call(messages)
+        if tool_call:
+            self.first_token_latency.wait()
+            yield AIMessageChunk(content="", tool_call_chunks=[{
+                "name": tool_call["name"],
+                "args": json.dumps(tool_call["args"], ensure_ascii=False),
+                "id": tool_call["id"],
+                "index": 0,
+            }])
+            return
+        text = self._compose(messages)
+        self.first_token_latency.wait()
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for i, token in enumerate(self._tokens(text)):
+            if i and interval:
+                time.sleep(interval)
+            yield AIMessageChunk(content=token)
@@ -0,0 +1,195 @@
+"""
+후속 검색 선행 실행 (speculative prefetch)
+답변 직후 응답에 등장한 상품/모델을 백그라운드에서 미리 검색해 두어
+"그 중 ○○ 자세히 알려줘" 같은 다음 턴의 검색 단계가 캐시 적중이 되도록 한다
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from app.services.normalization import query_key
+
+# 사용자 요청 검색이 진행 중이면 선행 검색이 기다리는 최대 시간 (초) - 넘으면 해당 선행 검색은 버림
+FOREGROUND_WAIT_TIMEOUT = 10.0
+
+# 선행 검색 대상으로 쓰기에 너무 긴 이름(문장형 스니펫)은 제외
+MAX_PREFETCH_QUERY_LENGTH = 80
+
+
+def _prefetch_key(query: str) -> str:
+    """선행 검색 키 (검색어 정규화, 소문자)"""
+    return query_key(query)
+
+
+class SearchPrefetcher:
+    """
+    스레드별 선행 검색 실행기
+
+    - 동시 실행 수는 max_workers, 대기 중인 작업은 max_pending으로 제한 (초과분은 버림)
+    - 낮은 우선순위: 사용자 요청 검색(foreground)이 진행 중이면 끝날 때까지 기다렸다가 실행
+    - 취소 가능: 스레드의 새 턴이 시작되면 아직 시작하지 않은 작업을 취소하고,
+      스레드를 삭제하면 진행 중인 작업의 결과도 버린다
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str], str],
+        max_workers: int = 2,
+        max_pending: int = 32,
+        max_results_per_thread: int = 8,
+    ):
+        self._search = search
+        self.max_pending = max_pending
+        self.max_results_per_thread = max_results_per_thread
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-prefetch")
+        # 스레드 ID -> 키 -> 검색 결과 (오래된 순)
+        self._results: Dict[str, "OrderedDict[str, str]"] = {}
+        # 스레드 ID -> 키 -> (실행 대기/중인 작업, 사용자 요청 대기를 마치고 검색을 시작했는지)
+        self._pending: Dict[str, Dict[str, Tuple[Future, threading.Event]]] = {}
+        # 스레드 ID -> 세대 (forget 시 증가시켜 진행 중인 작업 결과를 버림)
+        self._generations: Dict[str, int] = {}
+        self._foreground = 0
+        self._idle = threading.Condition()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def foreground(self):
+        """사용자 요청 검색 구간 표시 (이 구간 동안 선행 검색은 시작하지 않음)"""
+        with self._idle:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._foreground -= 1
+                if self._foreground == 0:
+                    self._idle.notify_all()
+
+    def _pending_count(self) -> int:
+        return sum(len(futures) for futures in self._pending.values())
+
+    def schedule(self, thread_id: str, queries: Iterable[str]) -> int:
+        """
+        스레드의 다음 턴을 위해 검색어들을 선행 검색 예약
+
+        Args:
+            thread_id: 대화 세션 ID
+            queries: 선행 검색할 상품/모델 이름 (우선순위 순)
+
+        Returns:
+            새로 예약된 작업 수
+        """
+        scheduled = 0
+        with self._lock:
+            if self._closed:
+                return 0
+            generation = self._generations.setdefault(thread_id, 0)
+            results: Dict[str, str] = self._results.get(thread_id, {})
+            pending = self._pending.setdefault(thread_id, {})
+            for query in queries:
+                key = _prefetch_key(query)
+                if not key or len(key) > MAX_PREFETCH_QUERY_LENGTH or key in results or key in pending:
+                    continue
+                if self._pending_count() >= self.max_pending:
+                    break
+                started = threading.Event()
+                future = self._executor.submit(self._run, thread_id, key, query, generation, started)
+                pending[key] = (future, started)
+                future.add_done_callback(partial(self._done, thread_id, key))
+                scheduled += 1
+        return scheduled
+
+    def _run(
+        self, thread_id: str, key: str, query: str, generation: int, started: threading.Event
+    ) -> Optional[str]:
+        # 사용자 요청 검색이 끝날 때까지 대기 (낮은 우선순위)
+        with self._idle:
+            if not self._idle.wait_for(lambda: self._foreground == 0 or self._closed, FOREGROUND_WAIT_TIMEOUT):
+                return None
+        if self._closed or self._generations.get(thread_id) != generation:
+            return None
+
+        started.set()
+        result = self._search(query)
+
+        with self._lock:
+            if self._closed or self._generations.get(thread_id) != generation:
+                return None
+            results = self._results.setdefault(thread_id, OrderedDict())
+            results[key] = result
+            results.move_to_end(key)
+            while len(results) > self.max_results_per_thread:
+                results.popitem(last=False)
+        return result
+
+    def _done(self, thread_id: str, key: str, _future: Future):
+        with self._lock:
+            pending = self._pending.get(thread_id)
+            if pending is not None:
+                pending.pop(key, None)
+                if not pending:
+                    self._pending.pop(thread_id, None)
+
+    def lookup(self, thread_id: str, query: str) -> Optional[Tuple[str, str]]:
+        """
+        검색어가 선행 검색한 상품을 언급하면 그 결과 반환
+
+        완료된 결과를 우선 사용하고, 같은 상품을 이미 검색 중이면 중복 검색하지 않고 기다린다.
+        (사용자 요청 검색이 끝나길 기다리며 아직 검색을 시작하지 않은 작업은 기다리지 않고 미적중으로 처리)
+
+        Returns:
+            (선행 검색 키, 검색 결과) 또는 None
+        """
+        text = _prefetch_key(query)
+        with self._lock:
+            results: Dict[str, str] = self._results.get(thread_id, {})
+            for key in sorted(results, key=len, reverse=True):
+                if key in text:
+                    return key, results[key]
+            running = [
+                (key, future) for key, (future, started) in self._pending.get(thread_id, {}).items()
+                if key in text and started.is_set()
+            ]
+
+        for key, future in sorted(running, key=lambda item: len(item[0]), reverse=True):
+            try:
+                result = future.result()
+            except (CancelledError, Exception):
+                continue
+            if result is not None:
+                return key, result
+        return None
+
+    def cancel_pending(self, thread_id: str) -> int:
+        """아직 시작하지 않은 스레드의 선행 검색 취소 (새 턴 시작 시)"""
+        with self._lock:
+            futures = [future for future, _ in self._pending.get(thread_id, {}).values()]
+        return sum(1 for future in futures if future.cancel())
+
+    def forget(self, thread_id: str):
+        """스레드의 선행 검색 결과 삭제 및 진행 중인 작업 무효화"""
+        self.cancel_pending(thread_id)
+        with self._lock:
+            self._results.pop(thread_id, None)
+            if thread_id in self._generations:
+                self._generations[thread_id] += 1
+            if not self._pending.get(thread_id):
+                self._generations.pop(thread_id, None)
+
+    def pending_count(self) -> int:
+        """대기/실행 중인 선행 검색 수"""
+        with self._lock:
+            return self._pending_count()
+
+    def shutdown(self, wait: bool = False):
+        """예약된 작업을 모두 취소하고 실행기 종료"""
+        with self._lock:
+            self._closed = True
+        with self._idle:
+            self._idle.notify_all()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,14 +1,75 @@
-import os
+import random
 import uuid
+from typing import Annotated, Any, Dict, Iterator, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, MessagesState, START
-from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.config import get_stream_writer
 from langgraph.store.memory import InMemoryStore
 from langgraph.store.base import BaseStore
-from app.config import config
+from pydantic import BaseModel, Field
+from app.agents.checkpointer import ConversationCheckpointer
+from app.agents.fake_providers import FakeChatModel, FakeSearchTool, LatencyModel
+from app.agents.prefetch import SearchPrefetcher
+from app.config import config, get_settings
+from app.services.hot_queries import hot_query_index, hot_query_tracker
+from app.services.normalization import query_key
+from app.services.price_history import price_history
+from app.services.refinement import format_refined_answer, parse_refinement, parse_search_results
+from app.services.taxonomy import taxonomy
+
+
+# 한 턴에서 허용하는 최대 웹 검색(도구 호출) 횟수
+MAX_SEARCHES_PER_TURN = 2
+
+# 스레드별로 캐시하는 최대 검색 결과 수 / 프롬프트에 넣는 결과당 최대 길이
+MAX_CACHED_SEARCHES = 5
+MAX_CACHED_RESULT_CHARS = 2000
+
+
+def _search_cache_key(query: str) -> str:
+    """스레드 검색 캐시 키 (검색어 정규화 - "galaxy s24"와 "갤럭시S24"는 같은 키)"""
+    return query_key(query)
+
+
+def _merge_search_results(current: Dict[str, str], update: Dict[str, str]) -> Dict[str, str]:
+    """스레드 검색 캐시 병합 리듀서 (최근 MAX_CACHED_SEARCHES개만 유지)"""
+    merged = dict(current or {})
+    for key, value in (update or {}).items():
+        merged.pop(key, None)
+        merged[key] = value
+    return dict(list(merged.items())[-MAX_CACHED_SEARCHES:])
+
+
+def _last_human_index(messages: list) -> int:
+    """마지막 사용자 메시지 위치 (현재 턴의 시작)"""
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].type == "human":
+            return index
+    return 0
+
+
+class AgentState(MessagesState):
+    """
+    대화 메시지 + 스레드별 웹 검색 결과 캐시 (검색어 -> 결과)
+    + 마지막 구조화 결과 목록 ({"query": 검색어, "items": [상품, ...]}) - 후속 정제 질문에 사용
+    """
+    search_results: Annotated[Dict[str, str], _merge_search_results]
+    product_results: Dict
+
+
+class WebSearchArgs(BaseModel):
+    """상품의 가격, 판매처, 리뷰 정보를 웹에서 검색합니다. 이전 검색 결과에 없는 새 상품 정보가 필요할 때만 사용하세요."""
+    query: str = Field(description='검색어 (예: "갤럭시 S24 최저가")')
+
+
+# LLM에 바인딩하는 web_search 도구 스키마 (실행은 스레드 캐시를 사용하는 그래프의 tools 노드가 담당)
+WEB_SEARCH_TOOL_NAME = "web_search"
+WEB_SEARCH_TOOL = convert_to_openai_tool(WebSearchArgs)
+WEB_SEARCH_TOOL["function"]["name"] = WEB_SEARCH_TOOL_NAME
 
 
 class ProductSearchAgent:
@@ -19,48 +80,93 @@ class ProductSearchAgent:
         # LangSmith 설정
         config.configure_langsmith()
         
+        settings = get_settings()
+        
         # 메모리 시스템 초기화
-        self.checkpointer = InMemorySaver()
+        # 대화 상태(턴)는 checkpointer에만 저장하고, 유휴 스레드는 TTL/최대 개수로 정리
+        self.checkpointer = ConversationCheckpointer(
+            ttl_seconds=settings.conversation_ttl_seconds,
+            max_threads=settings.max_conversation_threads
+        )
+        # 사용자별 장기 메모리 (관심사)
         self.store = InMemoryStore()
         
-        # 대화 히스토리 저장소 (thread_id별로 관리)
-        self.conversation_history = {}
+        # 가짜 제공자용 난수 생성기 (fake_seed 지정 시 재현 가능)
+        self._rng = random.Random(settings.fake_seed)
+        
+        # 검색 도구 초기화 (항상 사용 가능)
+        self.search_tool = self._create_search_tool(settings)
         
-        # DuckDuckGo 검색 도구 초기화 (항상 사용 가능)
-        self.search_tool = DuckDuckGoSearchRun()
+        # 후속 질문 대비 선행 검색 (선택 기능)
+        self.prefetch_top_n = settings.prefetch_top_n
+        self.prefetcher = None
+        if settings.prefetch_enabled:
+            self.prefetcher = SearchPrefetcher(
+                lambda query: self._web_search(query, record=False),
+                max_workers=settings.prefetch_max_workers,
+                max_pending=settings.prefetch_max_pending
+            )
         
-        # Google API 키 환경 변수 설정 (명시적으로)
         self.llm = None
         self.agent = None
         self.graph = None
+        self._ephemeral_graph = None
         self.use_agent = False
         
-        if config.GOOGLE_API_KEY:
-            os.environ["GOOGLE_API_KEY"] = config.GOOGLE_API_KEY
-            # 추가 환경 변수들도 설정
-            os.environ["GOOGLE_GENAI_API_KEY"] = config.GOOGLE_API_KEY
-            os.environ["GEMINI_API_KEY"] = config.GOOGLE_API_KEY
-            
+        if settings.llm_provider == "fake":
+            # 외부 API 없이 동작하는 가짜 LLM
+            self.llm = FakeChatModel(
+                first_token_latency=LatencyModel(
+                    settings.fake_llm_first_token_ms,
+                    settings.fake_llm_jitter_ms,
+                    settings.fake_latency_distribution,
+                    self._rng
+                ),
+                tokens_per_second=settings.fake_llm_tokens_per_second,
+                error_rate=settings.fake_llm_error_rate,
+                rng=self._rng
+            )
+            self.use_agent = True
+        
+        elif config.GOOGLE_API_KEY:
             try:
-                # Gemini 모델 초기화
+                # Gemini 모델 초기화 (API 키는 환경 변수 대신 직접 전달)
                 self.llm = ChatGoogleGenerativeAI(
                     model="gemini-2.0-flash-exp",
                     google_api_key=config.GOOGLE_API_KEY,
-                    temperature=0.1
+                    temperature=0.1,
+                    timeout=settings.llm_timeout,
+                    max_retries=settings.llm_max_retries
                 )
-                
-                # StateGraph 기반 메모리 Agent 생성
-                self._create_memory_agent()
                 self.use_agent = True
                 
             except Exception as e:
                 print(f"Agent 초기화 실패: {e}")
-                # Agent 없이 직접 검색만 사용
+                # LLM 없이 직접 검색만 사용
                 self.use_agent = False
+        
+        # StateGraph 기반 메모리 Agent 생성 (LLM이 없으면 노드가 직접 검색으로 응답)
+        self._create_memory_agent()
+    
+    def _create_search_tool(self, settings):
+        """설정된 검색 제공자에 맞는 검색 도구 생성"""
+        if settings.search_provider == "fake":
+            return FakeSearchTool(
+                latency=LatencyModel(
+                    settings.fake_search_latency_ms,
+                    settings.fake_search_jitter_ms,
+                    settings.fake_latency_distribution,
+                    self._rng
+                ),
+                error_rate=settings.fake_search_error_rate,
+                rng=self._rng
+            )
+        # DuckDuckGo 검색 도구
+        return DuckDuckGoSearchRun()
     
     def search_products(self, query: str) -> str:
         """
-        상품 검색 실행
+        상품 검색 실행 (대화 상태를 남기지 않는 단발성 검색)
         
         Args:
             query: 검색할 상품명 또는 키워드
@@ -71,37 +177,16 @@ class ProductSearchAgent:
         if not query.strip():
             return "검색할 상품명을 입력해주세요."
         
-        # Graph를 사용할 수 있는 경우
-        if self.use_agent and self.graph:
-            try:
-                # StateGraph 실행 (기본 세션으로)
-                config = {
-                    "configurable": {
-                        "thread_id": str(uuid.uuid4()),
-                        "user_id": "default_user"
-                    }
-                }
-                
-                result = None
-                for chunk in self.graph.stream(
-                    {"messages": [{"role": "user", "content": query}]},
-                    config,
-                    stream_mode="values"
-                ):
-                    result = chunk
-                
-                # 마지막 메시지 (AI 응답) 반환
-                if result and "messages" in result:
-                    return result["messages"][-1].content
-                else:
-                    return "검색 결과를 가져올 수 없습니다."
-                    
-            except Exception as e:
-                print(f"Graph 검색 실패: {e}")
-                # 실패 시 직접 검색으로 폴백
-                return self._direct_search(query)
-        else:
-            # Graph를 사용할 수 없는 경우 직접 검색
+        try:
+            # 체크포인터 없이 컴파일한 그래프로 실행하므로 스레드 상태가 쌓이지 않음
+            return self._invoke_graph(
+                self._ephemeral_graph,
+                query,
+                {"configurable": {"user_id": "default_user", "remember": False}}
+            )
+        except Exception as e:
+            print(f"Graph 검색 실패: {e}")
+            # 실패 시 직접 검색으로 폴백
             return self._direct_search(query)
     
     def _direct_search(self, query: str) -> str:
@@ -129,41 +214,305 @@ class ProductSearchAgent:
             return f"검색 중 오류가 발생했습니다: {str(e)}"
     
     def _create_memory_agent(self):
-        """메모리 기능을 가진 StateGraph Agent 생성"""
+        """
+        메모리 기능을 가진 도구 호출(ReAct) StateGraph Agent 생성
+        
+        call_model 노드의 LLM이 web_search 도구 호출 여부를 직접 결정하고,
+        검색 결과는 스레드 상태(search_results)에 캐시되어 후속 질문에서 재사용된다.
+        대화 턴은 checkpointer에 AgentState로만 저장되며 (단일 상태 저장소),
+        같은 그래프를 체크포인터 없이 컴파일한 버전은 단발성 검색에 사용한다.
+        """
         def call_model(
-            state: MessagesState,
+            state: AgentState,
             config: RunnableConfig,
             *,
             store: BaseStore,
         ):
-            # 사용자 ID와 스레드 ID 추출
-            user_id = config.get("configurable", {}).get("user_id", "default_user")
-            thread_id = config.get("configurable", {}).get("thread_id", "default_thread")
-            namespace = ("memories", user_id)
+            configurable = config.get("configurable", {})
+            # 스트리밍 요청이면 생성되는 조각을 custom 스트림으로 바로 전송
+            write = get_stream_writer() if configurable.get("stream_tokens") else None
+            return self._model_step(state, configurable, store, write)
+        
+        def call_tools(state: AgentState, config: RunnableConfig):
+            return self._tool_step(state, config.get("configurable", {}).get("thread_id"))
+        
+        def route_after_model(state: AgentState) -> str:
+            return "tools" if getattr(state["messages"][-1], "tool_calls", None) else END
+        
+        # StateGraph 생성 (call_model ⇄ tools 루프)
+        builder = StateGraph(AgentState)
+        builder.add_node("call_model", call_model)
+        builder.add_node("tools", call_tools)
+        builder.add_edge(START, "call_model")
+        builder.add_conditional_edges("call_model", route_after_model, ["tools", END])
+        builder.add_edge("tools", "call_model")
+        
+        # 메모리 시스템과 함께 컴파일 (checkpointer로 대화 히스토리 저장)
+        self.graph = builder.compile(
+            checkpointer=self.checkpointer,
+            store=self.store
+        )
+        self._ephemeral_graph = builder.compile(store=self.store)
+    
+    def _supports_tools(self) -> bool:
+        """LLM이 도구 호출(bind_tools)을 지원하는지 확인"""
+        return callable(getattr(type(self.llm), "bind_tools", None))
+    
+    def fetch_search_results(self, query: str) -> str:
+        """상품 웹 검색 (핫 쿼리 인덱스를 거치지 않고 항상 검색 제공자 호출, 관측 가격은 이력에 기록)"""
+        result = self.search_tool.run(f"{query} 상품 가격 리뷰 구매")
+        if isinstance(result, str):
+            price_history.record_many((item["name"], item["price"]) for item in parse_search_results(result))
+        return result
+    
+    def _web_search(self, query: str, record: bool = True) -> str:
+        """
+        상품 웹 검색 - 인기 검색어는 사전 계산된 핫 쿼리 인덱스에서 응답
+        
+        Args:
+            query: 검색어
+            record: 검색어 빈도에 반영할지 여부 (선행 검색 등 내부 요청은 False)
+        """
+        if record:
+            hot_query_tracker.record(query)
+        result = hot_query_index.get(query)
+        if result is None:
+            result = self.fetch_search_results(query)
+        return result
+    
+    def _cached_search(self, query: str, cache: dict, thread_id: Optional[str] = None) -> tuple:
+        """
+        스레드 검색 캐시와 선행 검색 결과를 먼저 확인하고 없을 때만 웹 검색
+        
+        Args:
+            query: 검색어
+            cache: 스레드의 search_results
+            thread_id: 대화 세션 ID (선행 검색 결과 조회용, 단발성 검색이면 None)
             
-            # 현재 메시지
-            current_message = state["messages"][-1]
+        Returns:
+            (검색 결과, 캐시에 새로 추가할 {키: 결과} - 캐시 적중 시 빈 딕셔너리)
+        """
+        key = _search_cache_key(query)
+        if key in cache:
+            return cache[key], {}
+        if self.prefetcher is None:
+            result = self._web_search(query)
+            return result, {key: result}
+        
+        prefetched = self.prefetcher.lookup(thread_id, query) if thread_id else None
+        if prefetched:
+            result = prefetched[1]
+        else:
+            # 사용자 요청 검색이 진행되는 동안 선행 검색은 대기
+            with self.prefetcher.foreground():
+                result = self._web_search(query)
+        return result, {key: result}
+    
+    def _model_step(self, state: AgentState, configurable: dict, store: BaseStore, write=None) -> dict:
+        """call_model 노드 - 웹 검색 도구 호출 또는 최종 응답 생성"""
+        user_id = configurable.get("user_id", "default_user")
+        thread_id = configurable.get("thread_id", "default_thread")
+        session_id = configurable.get("thread_id")
+        
+        messages = state["messages"]
+        turn_start = _last_human_index(messages)
+        query = str(messages[turn_start].content)
+        current_turn = messages[turn_start:]
+        conversation_history = self._format_history(messages[:turn_start])
+        cache = state.get("search_results") or {}
+        
+        if len(current_turn) == 1:
+            # 이전 결과 목록에 가격/브랜드/정렬 조건만 적용하면 되는 후속 질문은 로컬 처리
+            refined = self._refine_previous_results(query, state.get("product_results"), cache, session_id)
+            if refined:
+                answer, product_results, new_results = refined
+                if write:
+                    write(answer)
+                if configurable.get("remember", True):
+                    self._remember_user_memory(query, thread_id, user_id, store)
+                return self._final_update(answer, current_turn, new_results, product_results)
+        
+        if not (self.use_agent and self.llm):
+            result = self._direct_search(query)
+            if write:
+                write(result)
+            return self._final_update(result, current_turn, {}, self._product_results(query, result))
+        
+        chunks = []
+        new_results = {}
+        product_results = None
+        use_tools = self._supports_tools()
+        try:
+            if use_tools:
+                prompt = self._build_agent_messages(query, conversation_history, user_id, cache, store, current_turn)
+                searches = sum(1 for m in current_turn if getattr(m, "tool_calls", None))
+                # 한 턴의 검색 횟수 제한에 도달하면 도구 없이 응답하도록 강제
+                llm = self.llm if searches >= MAX_SEARCHES_PER_TURN else self.llm.bind_tools([WEB_SEARCH_TOOL])
+            else:
+                # 도구 호출을 지원하지 않는 LLM은 매 턴 검색 결과를 프롬프트에 포함 (스레드 캐시 재사용)
+                search_results, new_results = self._cached_search(query, cache, session_id)
+                product_results = self._product_results(query, search_results)
+                prompt = self._build_memory_messages(
+                    query, conversation_history, user_id, store, search_results=search_results
+                )
+                llm = self.llm
             
-            # 기존 메모리 검색 (사용자별 관심사)
-            memories = store.search(namespace, query=str(current_message.content))
-            memory_context = self.build_memory_context([m.value for m in memories])
+            if write:
+                tool_calls = []
+                for chunk in llm.stream(prompt):
+                    if use_tools:
+                        tool_calls.extend(chunk.tool_call_chunks)
+                    text = chunk.content if isinstance(chunk.content, str) else ""
+                    if text:
+                        chunks.append(text)
+                        write(text)
+                if tool_calls:
+                    # 조각으로 나뉜 도구 호출 인자를 합쳐서 완성된 tool_calls로 변환
+                    tool_calls = AIMessageChunk(content="", tool_call_chunks=tool_calls).tool_calls
+                ai_response = "".join(chunks)
+            else:
+                response = llm.invoke(prompt)
+                tool_calls = response.tool_calls if use_tools else []
+                ai_response = response.content
+                if not tool_calls and not isinstance(ai_response, str):
+                    raise TypeError("LLM 응답 형식이 올바르지 않습니다")
             
-            # 이전 대화 히스토리 컨텍스트 생성
-            conversation_history = ""
-            if len(state["messages"]) > 1:
-                conversation_history = "\n## 이전 대화 내용:\n"
-                for i, msg in enumerate(state["messages"][:-1]):  # 현재 메시지 제외
-                    role = "사용자" if msg.type == "human" else "AI"
-                    conversation_history += f"{i+1}. {role}: {msg.content}\n"
+            if tool_calls:
+                # 검색이 필요하다고 판단 - tools 노드에서 실행
+                return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
             
-            # 시스템 프롬프트에 메모리와 대화 히스토리 포함
-            system_prompt = f"""당신은 상품 가격 비교 전문 AI 어시스턴트입니다.
+        except Exception as e:
+            print(f"메모리 검색 실패: {e}")
+            if not chunks:
+                # 아무것도 생성하지 못했으면 기본 검색으로 폴백
+                result = self._direct_search(query)
+                if write:
+                    write(result)
+                return self._final_update(result, current_turn, new_results, product_results)
+            # 스트리밍 도중 실패하면 이미 전송한 부분까지를 응답으로 저장
+            ai_response = "".join(chunks)
+        
+        if configurable.get("remember", True):
+            self._remember_user_memory(query, thread_id, user_id, store)
+        return self._final_update(ai_response, current_turn, new_results, product_results)
+    
+    def _refine_previous_results(self, query: str, previous: dict, cache: dict, thread_id: Optional[str] = None):
+        """
+        후속 정제 질문을 이전 구조화 결과에 로컬로 적용
+        
+        이전 결과로 조건을 만족하는 상품이 없으면 조건을 붙인 검색어로 한 번만 다시 검색한다.
+        
+        Returns:
+            (응답, 새 구조화 결과, 캐시에 추가할 검색 결과) - 정제 질문이 아니거나 만족할 수 없으면 None
+        """
+        refinement = parse_refinement(query)
+        if not (refinement and previous and previous.get("items")):
+            return None
+        
+        items = refinement.apply(previous["items"])
+        new_results = {}
+        if not items:
+            try:
+                search_results, new_results = self._cached_search(
+                    f"{previous['query']} {refinement.describe()}", cache, thread_id
+                )
+            except Exception as e:
+                print(f"정제 재검색 실패: {e}")
+                return None
+            items = refinement.apply(parse_search_results(search_results))
+            if not items:
+                return None
+        
+        answer = format_refined_answer(previous["query"], refinement, items)
+        return answer, {"query": previous["query"], "items": items}, new_results
+    
+    @staticmethod
+    def _product_results(query: str, search_results: str):
+        """검색 결과 텍스트를 스레드에 저장할 구조화 결과로 변환 (상품이 없으면 None)"""
+        items = parse_search_results(search_results)
+        return {"query": query, "items": items} if items else None
+    
+    @staticmethod
+    def _final_update(answer: str, current_turn: list, new_results: dict, product_results: Optional[dict] = None) -> dict:
+        """
+        최종 응답 상태 업데이트
+        
+        이번 턴의 도구 호출/결과 메시지는 search_results에 이미 캐시되어 있으므로
+        메시지 목록에서 제거해 체크포인트에는 (사용자, AI) 턴만 남긴다.
+        """
+        removed = [
+            RemoveMessage(id=message.id)
+            for message in current_turn
+            if message.id and (message.type == "tool" or getattr(message, "tool_calls", None))
+        ]
+        update: Dict[str, Any] = {"messages": [*removed, AIMessage(content=answer)]}
+        if new_results:
+            update["search_results"] = new_results
+        if product_results:
+            update["product_results"] = product_results
+        return update
+    
+    def _tool_step(self, state: AgentState, thread_id: Optional[str] = None) -> dict:
+        """tools 노드 - web_search 도구 호출 실행 (스레드 캐시 우선)"""
+        cache = dict(state.get("search_results") or {})
+        new_results = {}
+        product_results = None
+        tool_messages = []
+        last = state["messages"][-1]
+        for call in last.tool_calls if isinstance(last, AIMessage) else []:
+            query = str(call.get("args", {}).get("query", "")).strip()
+            if call.get("name") != WEB_SEARCH_TOOL_NAME or not query:
+                content = "지원하지 않는 도구 호출입니다."
+            else:
+                try:
+                    content, added = self._cached_search(query, cache, thread_id)
+                    cache.update(added)
+                    new_results.update(added)
+                    product_results = self._product_results(query, content) or product_results
+                except Exception as e:
+                    content = f"검색 중 오류가 발생했습니다: {str(e)}"
+            tool_messages.append(ToolMessage(content=content, tool_call_id=call["id"]))
+        
+        update: Dict[str, Any] = {"messages": tool_messages}
+        if new_results:
+            update["search_results"] = new_results
+        if product_results:
+            update["product_results"] = product_results
+        return update
+    
+    def _build_agent_messages(
+        self,
+        query: str,
+        conversation_history: str,
+        user_id: str,
+        cache: dict,
+        store: BaseStore,
+        current_turn: list
+    ) -> list:
+        """도구 호출 LLM 입력 메시지 구성 (사용자 메모리, 이전 대화, 이전 검색 결과 포함)"""
+        memories = store.search(("memories", user_id), query=query)
+        memory_context = self.build_memory_context([m.value for m in memories])
+        
+        previous_results = ""
+        if cache:
+            previous_results = "\n## 이전 검색 결과:\n" + "\n\n".join(
+                f"[{key}]\n{result[:MAX_CACHED_RESULT_CHARS]}" for key, result in cache.items()
+            )
+        
+        system_prompt = f"""당신은 상품 가격 비교 전문 AI 어시스턴트입니다.
 사용자가 요청한 상품에 대해 웹 검색을 통해 최저가 가격 정보를 제공합니다.
 
 {memory_context}
 
 {conversation_history}
 
+{previous_results}
+
+**검색 도구 사용 규칙**:
+- 새로운 상품이거나 이전 검색 결과에 없는 정보가 필요할 때만 web_search 도구를 호출하세요.
+- 이전에 "갤럭시 스마트폰"을 추천했다면 "그 중에서 50만원 이하인 것"과 같은 후속 질문은
+  다시 검색하지 말고 이전 대화와 이전 검색 결과를 바탕으로 맥락을 고려해 답변하세요.
+
 검색 결과를 바탕으로 다음과 같은 정보를 포함하여 응답해주세요:
 - 상품명과 브랜드
 - 주요 특징 및 사양
@@ -171,111 +520,138 @@ class ProductSearchAgent:
 - 구매 가능한 온라인 쇼핑몰
 - 사용자 리뷰나 평점 (있는 경우)
 
-**중요**: 이전 대화 내용을 참고하여 연관된 질문에 대해서는 맥락을 고려한 답변을 제공하세요.
-예를 들어, 이전에 특정 제품을 추천했다면 후속 질문에서 그 제품들을 기준으로 답변하세요.
-
 항상 한국어로 응답하며, 정확하고 유용한 정보를 제공하세요."""
-
-            # 웹 검색 수행
-            search_query = f"{current_message.content} 상품 가격 리뷰 구매"
-            search_results = self.search_tool.run(search_query)
-            
-            # LLM 응답 생성
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"다음 검색 결과를 바탕으로 '{current_message.content}'에 대해 답변해주세요:\n\n{search_results}"}
-            ]
-            
-            response = self.llm.invoke(messages)
-            
-            # 모든 대화를 메모리에 저장 (관심사 추출)
-            memory_data = {
-                "data": f"사용자 질문: {current_message.content}",
-                "timestamp": str(uuid.uuid4()),
-                "thread_id": thread_id
-            }
-            store.put(namespace, str(uuid.uuid4()), memory_data)
-            
-            # 상품 관련 키워드가 있으면 추가 메모리 저장
-            product_keywords = ["스마트폰", "노트북", "태블릿", "이어폰", "헤드폰", "카메라", "TV", "모니터"]
-            for keyword in product_keywords:
-                if keyword in current_message.content:
-                    product_memory = {
-                        "data": f"사용자가 {keyword}에 관심을 보임",
-                        "product_type": keyword,
-                        "thread_id": thread_id
-                    }
-                    store.put(namespace, str(uuid.uuid4()), product_memory)
-                    break
-            
-            return {"messages": [response]}
         
-        # StateGraph 생성
-        builder = StateGraph(MessagesState)
-        builder.add_node("call_model", call_model)
-        builder.add_edge(START, "call_model")
+        return [SystemMessage(content=system_prompt), *current_turn]
+    
+    @staticmethod
+    def _thread_config(thread_id: str, user_id: str = "default_user", **options) -> dict:
+        """스레드 실행 설정"""
+        return {"configurable": {"thread_id": thread_id, "user_id": user_id, **options}}
+    
+    @staticmethod
+    def _invoke_graph(graph, query: str, config: dict) -> str:
+        """그래프를 실행하고 마지막 AI 응답 반환"""
+        result = None
+        for chunk in graph.stream(
+            {"messages": [{"role": "user", "content": query}]},
+            config,
+            stream_mode="values"
+        ):
+            result = chunk
         
-        # 메모리 시스템과 함께 컴파일 (checkpointer로 대화 히스토리 저장)
-        self.graph = builder.compile(
-            checkpointer=self.checkpointer,
-            store=self.store
-        )
+        # 마지막 메시지 (AI 응답) 반환
+        if result and "messages" in result:
+            return result["messages"][-1].content
+        return "검색 결과를 가져올 수 없습니다."
     
-    def add_to_conversation_history(self, thread_id: str, user_message: str, ai_response: str):
-        """대화 히스토리에 메시지 추가"""
-        if thread_id not in self.conversation_history:
-            self.conversation_history[thread_id] = []
+    def _before_turn(self, thread_id: Optional[str]):
+        """새 턴 시작 전 - 아직 시작하지 않은 이전 턴의 선행 검색 취소 (사용자 요청 검색 우선)"""
+        if self.prefetcher and thread_id:
+            self.prefetcher.cancel_pending(thread_id)
+    
+    def _after_turn(self, thread_id: str):
+        """턴 종료 후 이전 체크포인트 정리, 유휴 스레드 만료 및 다음 턴 선행 검색 예약"""
+        self.checkpointer.prune([thread_id])
+        expired = self.checkpointer.expire_idle()
+        if self.prefetcher is None:
+            return
+        for expired_id in expired:
+            self.prefetcher.forget(expired_id)
+        if self.checkpointer.has_thread(thread_id):
+            state = self.graph.get_state(self._thread_config(thread_id)).values
+            self.prefetcher.schedule(thread_id, self._prefetch_candidates(state.get("product_results")))
+    
+    def _prefetch_candidates(self, product_results: dict) -> list:
+        """응답에 등장한 상위 N개 상품/모델 이름 (중복 제거)"""
+        names = []
+        for item in (product_results or {}).get("items", []):
+            name = " ".join(item["name"].split())
+            if name and name not in names:
+                names.append(name)
+            if len(names) >= self.prefetch_top_n:
+                break
+        return names
+    
+    @staticmethod
+    def _pair_turns(messages: list) -> list:
+        """메시지 목록을 (사용자, AI) 턴 목록으로 변환"""
+        turns = []
+        pending = None
+        for message in messages:
+            if message.type == "human":
+                pending = message.content
+            elif message.type == "ai" and pending is not None and not getattr(message, "tool_calls", None):
+                # 도구 호출 메시지는 턴의 중간 단계이므로 제외
+                turns.append((pending, message.content))
+                pending = None
+        return turns
+    
+    def _format_history(self, messages: list) -> str:
+        """이전 대화 메시지를 프롬프트용 문자열로 변환"""
+        turns = self._pair_turns(messages)
+        if not turns:
+            return ""
         
-        self.conversation_history[thread_id].append({
-            "user": user_message,
-            "ai": ai_response,
-            "timestamp": str(uuid.uuid4())
-        })
+        parts = ["\n## 이전 대화 내용:\n"]
+        for i, (user, ai) in enumerate(turns, 1):
+            parts.append(f"{i}. 사용자: {user}\n{i}. AI: {ai}\n\n")
+        return "".join(parts)
+    
+    def _thread_messages(self, thread_id: str) -> list:
+        """체크포인트에 저장된 스레드 메시지"""
+        if not self.checkpointer.has_thread(thread_id):
+            return []
+        return self.graph.get_state(self._thread_config(thread_id)).values.get("messages", [])
+    
+    def add_to_conversation_history(self, thread_id: str, user_message: str, ai_response: str):
+        """대화 히스토리(체크포인트)에 턴 추가"""
+        self.graph.update_state(
+            self._thread_config(thread_id),
+            {"messages": [HumanMessage(content=user_message), AIMessage(content=ai_response)]},
+            as_node="call_model"
+        )
+        self._after_turn(thread_id)
     
     def get_conversation_history(self, thread_id: str) -> str:
         """대화 히스토리를 문자열로 반환"""
-        if thread_id not in self.conversation_history or not self.conversation_history[thread_id]:
-            return ""
-        
-        history_text = "\n## 이전 대화 내용:\n"
-        for i, conv in enumerate(self.conversation_history[thread_id]):
-            history_text += f"{i+1}. 사용자: {conv['user']}\n"
-            history_text += f"{i+1}. AI: {conv['ai']}\n\n"
-        
-        return history_text
+        return self._format_history(self._thread_messages(thread_id))
     
-    def search_products_with_memory(self, query: str, thread_id: str = None, user_id: str = None) -> str:
-        """
-        메모리 기능을 포함한 상품 검색
-        
-        Args:
-            query: 검색할 상품명 또는 키워드
-            thread_id: 대화 세션 ID
-            user_id: 사용자 ID
-            
-        Returns:
-            검색 결과를 포함한 응답 문자열
-        """
-        if not query.strip():
-            return "검색할 상품명을 입력해주세요."
-        
-        # 기본값 설정
-        if not thread_id:
-            thread_id = str(uuid.uuid4())
-        if not user_id:
-            user_id = "default_user"
-        
-        # 이전 대화 히스토리 가져오기
-        conversation_history = self.get_conversation_history(thread_id)
+    def get_turns(self, thread_id: str) -> list:
+        """스레드의 대화 턴 목록 ({"user": ..., "ai": ...})"""
+        return [{"user": user, "ai": ai} for user, ai in self._pair_turns(self._thread_messages(thread_id))]
+    
+    def thread_count(self) -> int:
+        """대화 상태가 저장된 스레드 수"""
+        return len(self.checkpointer.thread_ids())
+    
+    def forget_thread(self, thread_id: str) -> int:
+        """스레드 대화 상태 삭제 후 삭제된 턴 수 반환"""
+        deleted_count = len(self.get_turns(thread_id))
+        self.checkpointer.delete_thread(thread_id)
+        if self.prefetcher:
+            self.prefetcher.forget(thread_id)
+        return deleted_count
+    
+    def _build_memory_messages(
+        self,
+        query: str,
+        conversation_history: str,
+        user_id: str,
+        store: Optional[BaseStore] = None,
+        search_results: Optional[str] = None
+    ) -> list:
+        """이전 대화, 사용자 메모리, 웹 검색 결과를 포함한 LLM 입력 메시지 구성 (도구 호출 미지원 LLM용)"""
+        store = store or self.store
         
         # 사용자별 메모리 검색
         namespace = ("memories", user_id)
-        memories = self.store.search(namespace, query=query)
+        memories = store.search(namespace, query=query)
         memory_context = self.build_memory_context([m.value for m in memories])
         
-        # 웹 검색 수행
-        search_query = f"{query} 상품 가격 리뷰 구매"
-        search_results = self.search_tool.run(search_query)
+        # 웹 검색 수행 (미리 가져온 결과가 없을 때만)
+        if search_results is None:
+            search_results = self.search_tool.run(f"{query} 상품 가격 리뷰 구매")
         
         # 시스템 프롬프트 구성
         system_prompt = f"""당신은 상품 가격 비교 전문 AI 어시스턴트입니다.
@@ -298,63 +674,126 @@ class ProductSearchAgent:
 
 항상 한국어로 응답하며, 정확하고 유용한 정보를 제공하세요."""
 
+        # 사용자 메시지에 맥락 정보 포함
+        user_message = f"현재 질문: '{query}'\n\n"
+        
+        # 이전 대화가 있다면 맥락 힌트 추가
+        if conversation_history:
+            user_message += "**중요**: 위의 이전 대화 내용을 참고하여, 현재 질문이 이전 대화와 연관된 후속 질문인지 판단하고 맥락을 고려해서 답변해주세요.\n\n"
+        
+        user_message += f"다음 검색 결과를 바탕으로 답변해주세요:\n\n{search_results}"
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _remember_user_memory(self, query: str, thread_id: str, user_id: str, store: Optional[BaseStore] = None):
+        """완료된 대화 턴의 질문을 사용자 장기 메모리에 저장"""
+        store = store or self.store
+        namespace = ("memories", user_id)
+        memory_data = {
+            "data": f"사용자 질문: {query}",
+            "thread_id": thread_id
+        }
+        store.put(namespace, str(uuid.uuid4()), memory_data)
+        
+        # 상품 분류(카테고리/브랜드/모델)가 언급되면 추가 메모리 저장
+        mentions = taxonomy.extract(query)
+        if mentions:
+            product_memory = {
+                "data": f"사용자가 {', '.join(mentions.labels())}에 관심을 보임",
+                "product_type": mentions.primary,
+                "categories": mentions.categories,
+                "brands": mentions.brands,
+                "models": mentions.models,
+                "thread_id": thread_id
+            }
+            store.put(namespace, str(uuid.uuid4()), product_memory)
+    
+    def search_products_with_memory(self, query: str, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
+        """
+        메모리 기능을 포함한 상품 검색
+        
+        Args:
+            query: 검색할 상품명 또는 키워드
+            thread_id: 대화 세션 ID (없으면 상태를 남기지 않는 단발성 대화)
+            user_id: 사용자 ID
+            
+        Returns:
+            검색 결과를 포함한 응답 문자열
+        """
+        if not query.strip():
+            return "검색할 상품명을 입력해주세요."
+        
+        user_id = user_id or "default_user"
+        
+        self._before_turn(thread_id)
+        
+        # 스레드 ID가 없으면 이어서 대화할 수 없으므로 체크포인트를 남기지 않음
+        if not thread_id:
+            graph, config = self._ephemeral_graph, {"configurable": {"user_id": user_id}}
+        else:
+            graph, config = self.graph, self._thread_config(thread_id, user_id)
+        
         try:
-            # LLM을 사용할 수 있는 경우
-            if self.use_agent and self.llm:
-                # 사용자 메시지에 맥락 정보 포함
-                user_message = f"현재 질문: '{query}'\n\n"
-                
-                # 이전 대화가 있다면 맥락 힌트 추가
-                if conversation_history:
-                    user_message += "**중요**: 위의 이전 대화 내용을 참고하여, 현재 질문이 이전 대화와 연관된 후속 질문인지 판단하고 맥락을 고려해서 답변해주세요.\n\n"
-                
-                user_message += f"다음 검색 결과를 바탕으로 답변해주세요:\n\n{search_results}"
-                
-                # LLM 응답 생성
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
-                
-                response = self.llm.invoke(messages)
-                ai_response = response.content
-                
-                # 대화 히스토리에 추가
-                self.add_to_conversation_history(thread_id, query, ai_response)
-                
-                # 사용자 메모리에 저장
-                memory_data = {
-                    "data": f"사용자 질문: {query}",
-                    "thread_id": thread_id
-                }
-                self.store.put(namespace, str(uuid.uuid4()), memory_data)
-                
-                # 상품 관련 키워드가 있으면 추가 메모리 저장
-                product_keywords = ["스마트폰", "갤럭시", "아이폰", "노트북", "태블릿", "이어폰", "헤드폰", "카메라", "TV", "모니터"]
-                for keyword in product_keywords:
-                    if keyword in query:
-                        product_memory = {
-                            "data": f"사용자가 {keyword}에 관심을 보임",
-                            "product_type": keyword,
-                            "thread_id": thread_id
-                        }
-                        self.store.put(namespace, str(uuid.uuid4()), product_memory)
-                        break
-                
-                return ai_response
-                
-            else:
-                # LLM을 사용할 수 없는 경우 기본 검색
-                result = self._direct_search(query)
-                self.add_to_conversation_history(thread_id, query, result)
-                return result
-                
+            return self._invoke_graph(graph, query, config)
         except Exception as e:
             print(f"메모리 검색 실패: {e}")
             # 실패 시 기본 검색으로 폴백
-            result = self._direct_search(query)
-            self.add_to_conversation_history(thread_id, query, result)
-            return result
+            return self._direct_search(query)
+        finally:
+            if thread_id:
+                self._after_turn(thread_id)
+    
+    def stream_products_with_memory(self, query: str, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> Iterator[str]:
+        """
+        메모리 기능을 포함한 상품 검색 (LLM 토큰 스트리밍)
+        
+        전체 응답을 기다리지 않고 LLM이 생성하는 조각을 바로 내보내며,
+        완성된 응답은 그래프 실행이 끝날 때 체크포인트에 저장된다.
+        
+        Args:
+            query: 검색할 상품명 또는 키워드
+            thread_id: 대화 세션 ID (없으면 상태를 남기지 않는 단발성 대화)
+            user_id: 사용자 ID
+            
+        Yields:
+            응답 텍스트 조각
+        """
+        if not query.strip():
+            yield "검색할 상품명을 입력해주세요."
+            return
+        
+        user_id = user_id or "default_user"
+        self._before_turn(thread_id)
+        if not thread_id:
+            graph, config = self._ephemeral_graph, {"configurable": {"user_id": user_id, "stream_tokens": True}}
+        else:
+            graph, config = self.graph, self._thread_config(thread_id, user_id, stream_tokens=True)
+        
+        emitted = False
+        try:
+            for mode, payload in graph.stream(
+                {"messages": [{"role": "user", "content": query}]},
+                config,
+                stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    emitted = True
+                    yield payload
+        except Exception as e:
+            print(f"메모리 스트리밍 실패: {e}")
+            if not emitted:
+                yield self._direct_search(query)
+        finally:
+            if thread_id:
+                self._after_turn(thread_id)
+    
+    def close(self):
+        """백그라운드 작업(선행 검색) 종료"""
+        if self.prefetcher:
+            self.prefetcher.shutdown()
     
     def store_user_memory(self, user_id: str, memory_key: str, memory_data: dict):
         """사용자 메모리 저장"""
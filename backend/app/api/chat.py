@@ -3,13 +3,19 @@
 쇼핑 챗봇과의 대화 관련 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import uuid
 from datetime import datetime
 from app.agents.product_search_agent import ProductSearchAgent
+from app.api.responses import FastJSONResponse
+from app.config import get_settings, on_settings_reload
+from app.services.chat_history import ChatHistoryStore
+from app.services.history_index import history_index
+from app.services.pagination import MAX_PAGE_LIMIT
 
 # APIRouter 인스턴스 생성
 router = APIRouter(
@@ -42,6 +48,8 @@ class ChatHistoryItem(BaseModel):
     user_message: str
     bot_response: str
     timestamp: datetime
+    thread_id: Optional[str] = None
+    user_id: Optional[str] = None
 
 
 class ChatHistory(BaseModel):
@@ -49,10 +57,36 @@ class ChatHistory(BaseModel):
     history: List[ChatHistoryItem]
     total_count: int
     status: str = "success"
+    next_cursor: Optional[str] = None
+
+
+class ChatSyncResponse(BaseModel):
+    """증분 히스토리 동기화 응답"""
+    thread_id: str
+    history: List[ChatHistoryItem]
+    cursor: str
+    has_more: bool = False
+    status: str = "success"
 
 
 # 더미 데이터 저장소 (실제로는 데이터베이스 사용)
-chat_history_store = []
+# append 전용 링 버퍼이므로 항상 시간순이며, 스레드/사용자별 인덱스를 가진다
+chat_history_store = ChatHistoryStore(get_settings().chat_history_capacity)
+
+
+@on_settings_reload
+def _apply_chat_settings(settings):
+    """설정 재로드 시 히스토리 버퍼 용량 반영"""
+    chat_history_store.resize(settings.chat_history_capacity)
+    history_index.prune("chat", chat_history_store.oldest_seq)
+
+
+def _save_history(item: ChatHistoryItem):
+    """히스토리 저장 후 기록 검색 인덱스 갱신 (링 버퍼에서 밀려난 대화는 인덱스에서도 제거)"""
+    seq = chat_history_store.append(item, thread_id=item.thread_id, user_id=item.user_id)
+    history_index.add("chat", seq, (item.user_message, item.bot_response))
+    history_index.prune("chat", chat_history_store.oldest_seq)
+
 
 # ProductSearchAgent 싱글톤 인스턴스
 _agent_instance = None
@@ -65,7 +99,13 @@ def get_agent():
     return _agent_instance
 
 
-@router.post("", response_model=ChatResponse)
+def close_agent():
+    """ProductSearchAgent 백그라운드 작업 종료 (애플리케이션 종료 시)"""
+    if _agent_instance is not None:
+        _agent_instance.close()
+
+
+@router.post("", response_model=ChatResponse, response_class=FastJSONResponse)
 async def chat_with_memory(chat_message: ChatMessage):
     """
     메모리 기능을 가진 채팅 메시지 전송
@@ -85,7 +125,9 @@ async def chat_with_memory(chat_message: ChatMessage):
     try:
         # ProductSearchAgent를 통한 메모리 기반 검색
         agent = get_agent()
-        bot_response = agent.search_products_with_memory(
+        # LLM/검색 호출은 블로킹이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        bot_response = await asyncio.to_thread(
+            agent.search_products_with_memory,
             query=chat_message.query,
             thread_id=thread_id,
             user_id=user_id
@@ -96,15 +138,17 @@ async def chat_with_memory(chat_message: ChatMessage):
             message_id=message_id,
             user_message=chat_message.query,
             bot_response=bot_response,
-            timestamp=current_time
+            timestamp=current_time,
+            thread_id=thread_id,
+            user_id=user_id
         )
-        chat_history_store.append(history_item)
+        _save_history(history_item)
         
-        return ChatResponse(
+        return FastJSONResponse(ChatResponse(
             response=bot_response,
             message_id=message_id,
             timestamp=current_time
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 중 오류가 발생했습니다: {str(e)}")
@@ -118,42 +162,94 @@ async def chat_with_memory_stream(chat_message: ChatMessage):
     if not chat_message.query.strip():
         raise HTTPException(status_code=400, detail="메시지가 비어있습니다")
     
+    # 메시지 ID 생성
+    message_id = str(uuid.uuid4())
+    current_time = datetime.now()
+    
     # 세션 ID 생성 (없으면 새로 생성)
     thread_id = chat_message.thread_id or str(uuid.uuid4())
     user_id = chat_message.user_id or str(uuid.uuid4())
     
     def generate_response():
+        chunks = []
         try:
-            # ProductSearchAgent를 통한 메모리 기반 검색
+            # ProductSearchAgent를 통한 메모리 기반 검색 (LLM 토큰을 생성되는 대로 전송)
             agent = get_agent()
-            response = agent.search_products_with_memory(
+            for chunk in agent.stream_products_with_memory(
                 query=chat_message.query,
                 thread_id=thread_id,
                 user_id=user_id
-            )
-            
-            # 응답을 청크 단위로 스트리밍
-            for chunk in response.split():
-                yield f"{chunk} "
+            ):
+                chunks.append(chunk)
+                yield chunk
                 
         except Exception as e:
             yield f"검색 중 오류가 발생했습니다: {str(e)}"
+            return
+        
+        # 스트림 완료 후 히스토리에 저장
+        history_item = ChatHistoryItem(
+            message_id=message_id,
+            user_message=chat_message.query,
+            bot_response="".join(chunks),
+            timestamp=current_time,
+            thread_id=thread_id,
+            user_id=user_id
+        )
+        _save_history(history_item)
     
-    return StreamingResponse(generate_response(), media_type="text/plain")
+    headers = {"X-Message-Id": message_id, "X-Thread-Id": thread_id}
+    return StreamingResponse(generate_response(), media_type="text/plain", headers=headers)
 
 
 @router.get("/history", response_model=ChatHistory)
-async def get_chat_history(limit: int = 50):
+async def get_chat_history(
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    thread_id: Optional[str] = None,
+    user_id: Optional[str] = None
+):
     """
     채팅 히스토리 조회
-    최근 대화 내역을 반환
+    최근 대화 내역을 최신순으로 반환 (limit/cursor 페이지네이션)
+    thread_id 또는 user_id를 지정하면 해당 인덱스만 조회한다
     """
-    # 최신 순으로 정렬하여 제한된 개수만 반환
-    recent_history = sorted(chat_history_store, key=lambda x: x.timestamp, reverse=True)[:limit]
+    # 링 버퍼가 이미 시간순이므로 정렬 없이 끝에서부터 limit개만 읽는다
+    try:
+        recent_history, next_cursor = chat_history_store.recent(
+            limit, cursor, thread_id=thread_id, user_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return ChatHistory(
         history=recent_history,
-        total_count=len(chat_history_store)
+        total_count=chat_history_store.count(thread_id=thread_id, user_id=user_id),
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/sync/{thread_id}", response_model=ChatSyncResponse)
+async def sync_thread_history(
+    thread_id: str,
+    since: Optional[str] = None,
+    limit: int = Query(default=MAX_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
+):
+    """
+    스레드 대화 증분 동기화
+    since 커서 이후에 추가된 턴만 시간순으로 반환하고, 다음 동기화에 쓸 커서를 돌려준다
+    (재접속한 클라이언트가 전체 대화가 아니라 새 턴만 받아가도록)
+    """
+    try:
+        items, cursor, has_more = chat_history_store.since(since, thread_id=thread_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ChatSyncResponse(
+        thread_id=thread_id,
+        history=items,
+        cursor=cursor,
+        has_more=has_more
     )
 
 
@@ -163,10 +259,15 @@ async def clear_thread_history(thread_id: str):
     특정 스레드의 대화 히스토리 삭제
     """
     try:
+        # 증분 동기화/기록 검색으로 삭제된 대화가 다시 보이지 않도록 스레드 인덱스와 검색 인덱스에서도 제거
+        seqs = chat_history_store.thread_seqs(thread_id)
+        chat_history_store.forget_thread(thread_id)
+        for seq in seqs:
+            history_index.remove("chat", seq)
+        
         agent = get_agent()
-        if thread_id in agent.conversation_history:
-            deleted_count = len(agent.conversation_history[thread_id])
-            del agent.conversation_history[thread_id]
+        deleted_count = agent.forget_thread(thread_id)
+        if deleted_count:
             return {
                 "status": "success",
                 "message": f"스레드 {thread_id}의 {deleted_count}개 대화가 삭제되었습니다",
@@ -191,14 +292,14 @@ async def get_thread_debug_info(thread_id: str):
     """
     try:
         agent = get_agent()
-        conversation_count = len(agent.conversation_history.get(thread_id, []))
+        turns = agent.get_turns(thread_id)
         
         return {
             "thread_id": thread_id,
-            "conversation_count": conversation_count,
-            "has_history": thread_id in agent.conversation_history,
-            "total_threads": len(agent.conversation_history),
-            "conversation_history": agent.conversation_history.get(thread_id, [])[:5]  # 최대 5개만 반환
+            "conversation_count": len(turns),
+            "has_history": bool(turns),
+            "total_threads": agent.thread_count(),
+            "conversation_history": turns[:5]  # 최대 5개만 반환
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"디버깅 정보 조회 중 오류가 발생했습니다: {str(e)}")
@@ -210,9 +311,8 @@ async def clear_chat_history():
     채팅 히스토리 삭제
     모든 대화 내역을 삭제
     """
-    global chat_history_store
-    deleted_count = len(chat_history_store)
-    chat_history_store.clear()
+    deleted_count = chat_history_store.clear()
+    history_index.clear("chat")
     
     return {
         "status": "success",
@@ -226,9 +326,10 @@ async def get_chat_status():
     """
     채팅 서비스 상태 확인
     """
+    last_item = chat_history_store.last()
     return {
         "status": "active",
         "service": "Shopping Chat Agent",
         "total_conversations": len(chat_history_store),
-        "last_activity": chat_history_store[-1].timestamp if chat_history_store else None
+        "last_activity": last_item.timestamp if last_item else None
     } 
\ No newline at end of file
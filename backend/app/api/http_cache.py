@@ -0,0 +1,49 @@
+"""
+HTTP 조건부 요청 지원
+저장된 결과에서 강한 ETag를 만들고 If-None-Match가 일치하면 304 Not Modified로 응답한다
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    리소스 식별 정보로부터 강한 ETag 생성
+
+    본문을 직렬화하지 않고도 같은 리소스/버전이면 항상 같은 값이 나오도록
+    저장소 키, 버전, 페이지 파라미터 등을 입력으로 사용한다.
+    """
+    raw = "\x1f".join("" if part is None else str(part) for part in parts)
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 값이 ETag와 일치하는지 확인 (약한 비교, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    """조건부 요청용 응답 헤더 (클라이언트는 매번 ETag로 재검증)"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified_response(request: Request, etag: str) -> Optional[Response]:
+    """요청의 If-None-Match가 ETag와 일치하면 304 응답, 아니면 None 반환"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
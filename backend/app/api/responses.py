@@ -0,0 +1,49 @@
+"""
+고속 JSON 응답 클래스
+핫 엔드포인트에서 response_model 재검증을 건너뛰고 orjson으로 바로 직렬화한다
+"""
+
+import json
+from types import ModuleType
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 JSON 경로로 동작
+    orjson = None
+
+
+def _orjson_default(obj: Any) -> Any:
+    """orjson이 직접 처리하지 못하는 객체 변환 (중첩된 Pydantic 모델 등)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Pydantic 모델/딕셔너리를 JSON 바이트로 직렬화"""
+    if orjson is None:
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson 기반 JSON 응답
+
+    엔드포인트가 이미 검증된 모델 인스턴스를 이 응답으로 감싸 반환하면
+    FastAPI의 response_model 검증/jsonable_encoder 단계를 거치지 않는다.
+    (response_model은 OpenAPI 문서용으로 그대로 유지)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
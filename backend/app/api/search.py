@@ -3,12 +3,26 @@
 상품 검색 및 최저가 비교 관련 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Dict, Tuple
+import asyncio
+import time
 import uuid
 from datetime import datetime
 from app.agents.product_search_agent import ProductSearchAgent
+from app.api.chat import chat_history_store
+from app.api.http_cache import cache_headers, make_etag, not_modified_response
+from app.api.responses import FastJSONResponse
+from app.config import get_settings
+from app.services.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, encode_cursor, paginate
+from app.services.catalog import CatalogEntry, catalog
+from app.services.history_index import history_index
+from app.services.normalization import normalize_query, query_key
+from app.services.price_history import MAX_BUCKETS, price_history, product_key
+from app.services.product_records import ProductRecord, StoredSearchResult
 
 # APIRouter 인스턴스 생성
 router = APIRouter(
@@ -36,10 +50,15 @@ class ProductSearchRequest(BaseModel):
     min_price: Optional[float] = None
     max_price: Optional[float] = None
     sort_by: Optional[str] = "price"  # price, rating, popularity
+    limit: Optional[int] = Field(
+        default=None, ge=1, le=MAX_PAGE_LIMIT, description="첫 페이지 상품 수 (없으면 전체 상품)"
+    )
 
 
 class ProductInfo(BaseModel):
-    """상품 정보 모델"""
+    """상품 정보 모델 (저장용 ProductRecord 등 같은 속성을 가진 객체에서도 검증 가능)"""
+    model_config = ConfigDict(from_attributes=True)
+
     product_id: str
     name: str
     price: float
@@ -62,6 +81,7 @@ class SearchResult(BaseModel):
     search_time: float
     timestamp: datetime
     status: str = "success"
+    next_cursor: Optional[str] = None
 
 
 class SearchSummary(BaseModel):
@@ -75,6 +95,51 @@ class SearchSummary(BaseModel):
     timestamp: datetime
 
 
+class HistorySearchHit(BaseModel):
+    """기록 검색 결과 항목"""
+    kind: str  # search (저장된 검색 결과), chat (채팅 히스토리)
+    id: str  # search_id 또는 message_id
+    query: str  # 검색어 또는 사용자 메시지
+    snippet: Optional[str] = None  # 일치한 상품명 또는 챗봇 응답 앞부분
+    timestamp: datetime
+    thread_id: Optional[str] = None
+
+
+class HistorySearchResponse(BaseModel):
+    """기록 검색 응답"""
+    query: str
+    results: List[HistorySearchHit]
+    next_cursor: Optional[str] = None
+    status: str = "success"
+
+
+# 기록 검색 응답의 챗봇 응답 미리보기 길이
+HISTORY_SNIPPET_LENGTH = 100
+
+
+class PricePoint(BaseModel):
+    """가격 이력 버킷 (버킷 안 첫 관측 시각 기준)"""
+    timestamp: datetime
+    min: float
+    max: float
+    avg: float
+    last: float
+    count: int
+
+
+class PriceHistoryResponse(BaseModel):
+    """상품 가격 이력 응답"""
+    key: str
+    name: str
+    points: List[PricePoint]
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    avg_price: Optional[float] = None
+    latest_price: Optional[float] = None
+    observation_count: int
+    status: str = "success"
+
+
 class SearchRequest(BaseModel):
     """Agent 검색 요청 모델"""
     query: str
@@ -86,21 +151,119 @@ class SearchResponse(BaseModel):
     query: str
 
 
-# 더미 데이터 저장소
-search_results_store: Dict[str, SearchResult] = {}
+# 배치 검색 한 요청당 최대 쿼리 수 / 최대 동시 실행 수 상한
+# (실제 적용 값은 Settings.batch_* 로 이 범위 안에서 조정)
+BATCH_MAX_QUERIES = 50
+BATCH_MAX_CONCURRENCY = 16
+
+
+class BatchSearchRequest(BaseModel):
+    """Agent 배치 검색 요청 모델"""
+    queries: List[str] = Field(min_length=1, max_length=BATCH_MAX_QUERIES)
+    max_concurrency: Optional[int] = Field(
+        default=None, ge=1, le=BATCH_MAX_CONCURRENCY, description="동시 실행 검색 수 (없으면 서버 기본값)"
+    )
+    stream: bool = Field(default=False, description="True면 완료되는 순서대로 NDJSON 스트리밍")
+
+
+class BatchSearchItem(BaseModel):
+    """배치 검색 개별 결과"""
+    index: int
+    query: str
+    result: Optional[str] = None
+    status: str = "success"
+    error: Optional[str] = None
+
+
+class BatchSearchResponse(BaseModel):
+    """Agent 배치 검색 응답 모델"""
+    results: List[BatchSearchItem]
+    total_count: int
+    unique_count: int
+    status: str = "success"
+
+
+# 더미 데이터 저장소 (상품은 압축 레코드로 보관하고 응답할 때 페이지만 ProductInfo로 변환)
+search_results_store: Dict[str, StoredSearchResult] = {}
+
+# 저장 순서(=시간순) 목록 - 히스토리 페이지를 저장소 복사 없이 위치로 바로 잘라낸다
+search_results_order: List[StoredSearchResult] = []
 
+# 다음 카탈로그 스냅샷에 넣을 검색어별 최신 전체 상품 목록 (필터 적용 전, 오래된 순)
+MAX_CATALOG_QUERIES = 10000
+catalog_updates: "OrderedDict[str, Tuple[str, float, List[ProductRecord]]]" = OrderedDict()
 
-def generate_dummy_products(query: str, count: int = 10) -> List[ProductInfo]:
-    """더미 상품 데이터 생성"""
+# 상품 카테고리 (정적 데이터이므로 ETag도 한 번만 계산)
+CATEGORIES = [
+    {"id": "electronics", "name": "전자제품", "count": 1500},
+    {"id": "fashion", "name": "패션/의류", "count": 2300},
+    {"id": "home", "name": "홈/리빙", "count": 800},
+    {"id": "beauty", "name": "뷰티/화장품", "count": 1200},
+    {"id": "sports", "name": "스포츠/레저", "count": 600},
+    {"id": "books", "name": "도서/문구", "count": 900},
+    {"id": "food", "name": "식품/건강", "count": 700}
+]
+CATEGORIES_ETAG = make_etag("categories", CATEGORIES)
+
+
+def _paginate_or_400(items, limit: int, cursor: Optional[str], newest_first: bool = False):
+    """페이지네이션 수행 (잘못된 커서는 400 에러로 변환)"""
+    try:
+        return paginate(items, limit, cursor, newest_first=newest_first)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def to_product_infos(records: Iterable[ProductRecord]) -> List[ProductInfo]:
+    """
+    저장용 상품 레코드를 응답 모델로 변환
+    내부에서 만든 신뢰 가능한 값이므로 검증 없이 model_construct로 생성한다
+    """
+    return [ProductInfo.model_construct(**record.to_dict()) for record in records]
+
+
+def _page_of_result(result: StoredSearchResult, limit: Optional[int], cursor: Optional[str] = None) -> SearchResult:
+    """
+    저장된 검색 결과에서 상품 한 페이지만 담은 응답 생성 (total_count는 전체 개수 유지)
+    limit과 cursor가 모두 없으면 전체 상품을 담는다
+    """
+    if limit is None and cursor is None:
+        page, next_cursor = result.products, None
+    else:
+        page, next_cursor = _paginate_or_400(result.products, limit or DEFAULT_PAGE_LIMIT, cursor)
+    return SearchResult.model_construct(
+        search_id=result.search_id,
+        query=result.query,
+        products=to_product_infos(page),
+        total_count=result.total_count,
+        search_time=result.search_time,
+        timestamp=result.timestamp,
+        status=result.status,
+        next_cursor=next_cursor
+    )
+
+
+def save_search_result(result: StoredSearchResult):
+    """검색 결과 저장 (저장소/저장 순서 목록/기록 검색 인덱스 갱신)"""
+    search_results_store[result.search_id] = result
+    search_results_order.append(result)
+    history_index.add("search", result.search_id, [result.query, *(p.name for p in result.products)])
+
+
+def generate_dummy_products(query: str, count: int = 10) -> List[ProductRecord]:
+    """
+    더미 상품 데이터 생성
+    저장소에 그대로 보관하도록 압축 레코드로 생성한다 (응답 시 to_product_infos로 변환)
+    """
     products = []
     base_price = 100000  # 기본 가격
     
     for i in range(count):
         product_id = str(uuid.uuid4())
-        price = base_price + (i * 5000) + (hash(query) % 50000)
+        price = float(base_price + (i * 5000) + (hash(query) % 50000))
         original_price = price + (price * 0.1)  # 10% 할인
         
-        product = ProductInfo(
+        product = ProductRecord(
             product_id=product_id,
             name=f"{query} - 상품 {i+1}번",
             price=price,
@@ -120,11 +283,29 @@ def generate_dummy_products(query: str, count: int = 10) -> List[ProductInfo]:
     return products
 
 
-@router.post("/products", response_model=SearchResult)
+def _catalog_products(query: str) -> Optional[List[ProductRecord]]:
+    """카탈로그 스냅샷에 있는 검색어면 저장된 상품 목록 반환 (없거나 오래되면 None)"""
+    rows = catalog.lookup(query, max_age=get_settings().catalog_max_age)
+    if rows is None:
+        return None
+    return [ProductRecord.from_dict(row) for row in rows]
+
+
+def catalog_entries() -> List[CatalogEntry]:
+    """
+    카탈로그 스냅샷에 저장할 이번 프로세스의 최신 검색 결과 (CatalogSnapshotter 수집 함수)
+    요청 처리 중 바뀌는 catalog_updates를 이벤트 루프에서 복사한다 (기존 스냅샷과의 병합은 저장 스레드에서)
+    """
+    return list(reversed(catalog_updates.values()))
+
+
+@router.post("/products", response_model=SearchResult, response_class=FastJSONResponse)
 async def search_products(search_request: ProductSearchRequest):
     """
     상품 검색
     주어진 검색어로 상품을 검색하고 최저가 순으로 정렬하여 반환
+    전체 결과는 정렬된 상태로 저장되고, limit을 지정하면 응답에는 첫 페이지만 포함된다
+    (다음 페이지는 next_cursor로 /results/{search_id}에서 조회)
     """
     if not search_request.query.strip():
         raise HTTPException(status_code=400, detail="검색어가 비어있습니다")
@@ -133,8 +314,21 @@ async def search_products(search_request: ProductSearchRequest):
     search_id = str(uuid.uuid4())
     start_time = datetime.now()
     
-    # 더미 상품 데이터 생성
-    products = generate_dummy_products(search_request.query, 15)
+    # 카탈로그 스냅샷에 있는 검색어는 저장된 상품으로 바로 응답
+    products = _catalog_products(search_request.query)
+    if products is None:
+        # 더미 상품 데이터 생성
+        products = generate_dummy_products(search_request.query, 15)
+        # 필터 적용 전 전체 관측 가격을 이력에 기록하고 다음 스냅샷에 반영
+        price_history.record_many((p.name, p.price) for p in products)
+        key = query_key(search_request.query)
+        catalog_updates.pop(key, None)
+        catalog_updates[key] = (search_request.query, time.time(), products)
+        while len(catalog_updates) > MAX_CATALOG_QUERIES:
+            catalog_updates.popitem(last=False)
+    
+    # 필터/정렬이 저장된 목록을 바꾸지 않도록 복사본 사용
+    products = list(products)
     
     # 가격 필터링
     if search_request.min_price:
@@ -152,48 +346,116 @@ async def search_products(search_request: ProductSearchRequest):
     # 검색 시간 계산
     search_time = (datetime.now() - start_time).total_seconds()
     
-    # 검색 결과 생성
-    result = SearchResult(
+    # 검색 결과 생성 (상품은 압축 레코드 그대로 저장)
+    result = StoredSearchResult(
         search_id=search_id,
         query=search_request.query,
         products=products,
-        total_count=len(products),
         search_time=search_time,
         timestamp=datetime.now()
     )
     
-    # 결과 저장
-    search_results_store[search_id] = result
+    # 결과 저장 (정렬된 전체 결과)
+    save_search_result(result)
     
-    return result
+    return FastJSONResponse(_page_of_result(result, search_request.limit))
 
 
-@router.get("/results/{search_id}", response_model=SearchResult)
-async def get_search_results(search_id: str):
+@router.get("/products/{key}/price-history", response_model=PriceHistoryResponse, response_class=FastJSONResponse)
+async def get_price_history(
+    key: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    buckets: int = Query(default=50, ge=1, le=MAX_BUCKETS, description="최대 다운샘플링 버킷 수")
+):
+    """
+    상품 가격 이력 조회
+    검색 때마다 기록한 가격 관측을 구간(start~end)으로 잘라 버킷별 최저/평균/최고가로 반환
+    (key는 상품 키 또는 상품명)
+    """
+    history = price_history.query(
+        key,
+        start=start.timestamp() if start else None,
+        end=end.timestamp() if end else None,
+        buckets=buckets
+    )
+    if history is None:
+        raise HTTPException(status_code=404, detail="가격 이력이 없는 상품입니다")
+    
+    points = [
+        PricePoint.model_construct(**{**point, "timestamp": datetime.fromtimestamp(point["timestamp"])})
+        for point in history["points"]
+    ]
+    return FastJSONResponse(PriceHistoryResponse.model_construct(
+        key=product_key(key),
+        name=history["name"],
+        points=points,
+        min_price=history["min_price"],
+        max_price=history["max_price"],
+        avg_price=history["avg_price"],
+        latest_price=history["latest_price"],
+        observation_count=history["count"],
+        status="success"
+    ))
+
+
+@router.get("/results/{search_id}", response_model=SearchResult, response_class=FastJSONResponse)
+async def get_search_results(
+    request: Request,
+    search_id: str,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_LIMIT, description="페이지 상품 수 (없으면 전체 상품)"),
+    cursor: Optional[str] = None
+):
     """
     검색 결과 조회
-    저장된 검색 결과를 ID로 조회
+    저장된 검색 결과를 ID로 조회 (limit/cursor 페이지네이션, limit이 없으면 전체 상품)
+    저장된 결과는 변하지 않으므로 ETag가 같으면 304로 응답한다
     """
     if search_id not in search_results_store:
         raise HTTPException(status_code=404, detail="검색 결과를 찾을 수 없습니다")
     
-    return search_results_store[search_id]
+    etag = make_etag("result", search_id, limit, cursor)
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    
+    return FastJSONResponse(
+        _page_of_result(search_results_store[search_id], limit, cursor),
+        headers=cache_headers(etag)
+    )
 
 
 @router.get("/history")
-async def get_search_history(limit: int = 20):
+async def get_search_history(
+    request: Request,
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None
+):
     """
     검색 히스토리 조회
-    최근 검색 기록을 반환
+    최근 검색 기록을 최신순으로 반환 (limit/cursor 페이지네이션)
+    페이지 내용이 바뀌지 않았으면 304로 응답한다
     """
-    # 검색 요약 정보만 반환
-    summaries = []
+    # 저장 순서 목록은 시간순이므로 정렬/복사 없이 끝에서부터 페이지만 잘라낸다
+    page, next_cursor = _paginate_or_400(search_results_order, limit, cursor, newest_first=True)
     
-    for search_id, result in search_results_store.items():
+    # ETag는 프로세스 로컬 카운터가 아니라 페이지 내용(검색 ID/시각)으로 계산
+    # (재시작 후나 다른 워커에서 같은 값이 다른 데이터를 가리키지 않도록)
+    etag = make_etag(
+        "history", len(search_results_order), next_cursor,
+        *(f"{result.search_id}@{result.timestamp.isoformat()}" for result in page)
+    )
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+    
+    # 검색 요약 정보는 해당 페이지에 대해서만 계산
+    summaries = []
+    for result in page:
         prices = [p.price for p in result.products]
         
         summary = SearchSummary(
-            search_id=search_id,
+            search_id=result.search_id,
             query=result.query,
             product_count=len(result.products),
             lowest_price=min(prices) if prices else None,
@@ -203,14 +465,81 @@ async def get_search_history(limit: int = 20):
         )
         summaries.append(summary)
     
-    # 최신순 정렬
-    summaries.sort(key=lambda x: x.timestamp, reverse=True)
-    
-    return {
-        "history": summaries[:limit],
-        "total_count": len(summaries),
+    return FastJSONResponse({
+        "history": summaries,
+        "total_count": len(search_results_order),
+        "next_cursor": next_cursor,
         "status": "success"
-    }
+    }, headers=cache_headers(etag))
+
+
+def _history_hit(q: str, kind: str, ref) -> Optional[HistorySearchHit]:
+    """인덱스 검색 결과를 원본 기록으로 채운 응답 항목 (원본이 없으면 None)"""
+    if kind == "search":
+        result = search_results_store.get(ref)
+        if result is None:
+            return None
+        snippet = next((p.name for p in result.products if history_index.matches(q, p.name)), None)
+        return HistorySearchHit.model_construct(
+            kind=kind, id=result.search_id, query=result.query,
+            snippet=snippet, timestamp=result.timestamp, thread_id=None
+        )
+    item = chat_history_store.get(ref)
+    if item is None:
+        return None
+    return HistorySearchHit.model_construct(
+        kind=kind, id=item.message_id, query=item.user_message,
+        snippet=item.bot_response[:HISTORY_SNIPPET_LENGTH], timestamp=item.timestamp, thread_id=item.thread_id
+    )
+
+
+@router.get("/history/search", response_model=HistorySearchResponse, response_class=FastJSONResponse)
+async def search_history(
+    q: str = Query(min_length=1, description="검색어 (모든 단어를 포함한 기록만)"),
+    kind: Optional[str] = Query(default=None, pattern="^(search|chat)$", description="search 또는 chat만 조회"),
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None
+):
+    """
+    검색/대화 기록 검색
+    저장된 검색 결과(검색어, 상품명)와 채팅 메시지에서 검색어를 포함한 기록을 최신순으로 반환
+    (추가될 때마다 갱신되는 n-gram 역색인으로 조회하므로 전체 기록을 훑지 않는다)
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어가 비어있습니다")
+    
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 원본이 이미 밀려난 문서는 인덱스에서 지우고 건너뛰며, 한 건 더 찾아 다음 페이지 유무 판단
+    results: List[HistorySearchHit] = []
+    last_doc_id = 0
+    next_cursor = None
+    while next_cursor is None:
+        wanted = limit + 1 - len(results)
+        hits = history_index.search(q, kind=kind, limit=wanted, before=before)
+        for doc_id, hit_kind, ref in hits:
+            before = doc_id
+            hit = _history_hit(q, hit_kind, ref)
+            if hit is None:
+                history_index.remove(hit_kind, ref)
+            elif len(results) < limit:
+                results.append(hit)
+                last_doc_id = doc_id
+            else:
+                next_cursor = encode_cursor(last_doc_id)
+                break
+        if len(hits) < wanted:
+            break
+    
+    return FastJSONResponse(HistorySearchResponse.model_construct(
+        query=q,
+        results=results,
+        next_cursor=next_cursor,
+        status="success"
+    ))
 
 
 @router.delete("/history")
@@ -219,9 +548,10 @@ async def clear_search_history():
     검색 히스토리 삭제
     모든 검색 기록을 삭제
     """
-    global search_results_store
     deleted_count = len(search_results_store)
     search_results_store.clear()
+    search_results_order.clear()
+    history_index.clear("search")
     
     return {
         "status": "success",
@@ -231,25 +561,19 @@ async def clear_search_history():
 
 
 @router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """
     상품 카테고리 목록 조회
     """
-    categories = [
-        {"id": "electronics", "name": "전자제품", "count": 1500},
-        {"id": "fashion", "name": "패션/의류", "count": 2300},
-        {"id": "home", "name": "홈/리빙", "count": 800},
-        {"id": "beauty", "name": "뷰티/화장품", "count": 1200},
-        {"id": "sports", "name": "스포츠/레저", "count": 600},
-        {"id": "books", "name": "도서/문구", "count": 900},
-        {"id": "food", "name": "식품/건강", "count": 700}
-    ]
+    not_modified = not_modified_response(request, CATEGORIES_ETAG)
+    if not_modified:
+        return not_modified
     
-    return {
-        "categories": categories,
-        "total_categories": len(categories),
+    return FastJSONResponse({
+        "categories": CATEGORIES,
+        "total_categories": len(CATEGORIES),
         "status": "success"
-    }
+    }, headers=cache_headers(CATEGORIES_ETAG))
 
 
 @router.post("/search", response_model=SearchResponse)
@@ -282,4 +606,103 @@ async def search_products(request: SearchRequest):
         raise HTTPException(
             status_code=500,
             detail=f"검색 처리 중 오류가 발생했습니다: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+def _batch_key(query: str) -> str:
+    """배치 내 중복 제거용 쿼리 키 (띄어쓰기/단위/별칭 변형은 같은 키)"""
+    return query_key(query)
+
+
+async def _run_batch_search(queries: List[str], max_concurrency: int):
+    """
+    중복을 제거한 쿼리들을 제한된 동시성으로 실행하고 완료되는 순서대로 반환
+
+    Yields:
+        (쿼리 키, 결과 문자열 또는 None, 에러 메시지 또는 None)
+    """
+    search_agent = get_agent()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(key: str, query: str):
+        async with semaphore:
+            try:
+                # Agent 검색은 동기 호출이므로 스레드 풀에서 실행
+                result = await asyncio.to_thread(search_agent.search_products, query)
+                return key, result, None
+            except Exception as e:
+                return key, None, str(e)
+
+    # 키별로 처음 나온 쿼리를 정규화해 검색
+    unique_queries: Dict[str, str] = {}
+    for query in queries:
+        unique_queries.setdefault(_batch_key(query), normalize_query(query))
+    tasks = [asyncio.create_task(run_one(key, query)) for key, query in unique_queries.items()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_products_batch(request: BatchSearchRequest):
+    """
+    상품 배치 검색 API 엔드포인트
+    여러 쿼리를 한 번에 받아 중복을 제거한 뒤 제한된 동시성으로 검색한다
+    
+    Args:
+        request: 검색할 쿼리 목록과 동시 실행 수
+        
+    Returns:
+        BatchSearchResponse: 입력 순서대로 정렬된 쿼리별 결과
+        (stream=True면 완료 순서대로 한 줄씩 BatchSearchItem을 NDJSON으로 전송)
+    """
+    settings = get_settings()
+    if len(request.queries) > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=400,
+            detail=f"배치 검색은 최대 {settings.batch_max_queries}개 쿼리까지 가능합니다"
+        )
+    max_concurrency = min(
+        request.max_concurrency or settings.batch_default_concurrency,
+        settings.batch_max_concurrency
+    )
+    
+    # 같은 키를 가진 입력 위치들
+    positions: Dict[str, List[int]] = {}
+    for index, query in enumerate(request.queries):
+        positions.setdefault(_batch_key(query), []).append(index)
+
+    def items_for(key: str, result: Optional[str], error: Optional[str]) -> List[BatchSearchItem]:
+        return [
+            BatchSearchItem(
+                index=index,
+                query=request.queries[index],
+                result=result,
+                status="error" if error else "success",
+                error=error
+            )
+            for index in positions[key]
+        ]
+
+    if request.stream:
+        async def generate_ndjson():
+            async for key, result, error in _run_batch_search(request.queries, max_concurrency):
+                for item in items_for(key, result, error):
+                    yield item.model_dump_json() + "\n"
+
+        return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+    completed: Dict[int, BatchSearchItem] = {}
+    async for key, result, error in _run_batch_search(request.queries, max_concurrency):
+        for item in items_for(key, result, error):
+            completed[item.index] = item
+    results = [completed[index] for index in range(len(request.queries))]
+
+    return FastJSONResponse(BatchSearchResponse(
+        results=results,
+        total_count=len(results),
+        unique_count=len(positions)
+    ))
@@ -4,20 +4,21 @@
 """
 
 import os
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Callable, List, Optional
 
-# 환경 변수 로드
-load_dotenv()
+# .env 탐색 경로 (뒤쪽 파일이 우선) - 실행 위치와 관계없이 프로젝트 루트/백엔드의 .env를 읽는다
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENV_FILES = (str(BACKEND_DIR.parent / ".env"), str(BACKEND_DIR / ".env"), ".env")
 
 
 class Settings(BaseSettings):
     """애플리케이션 설정 클래스"""
     
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=ENV_FILES,
         env_file_encoding="utf-8",
         case_sensitive=False
     )
@@ -38,10 +39,69 @@ class Settings(BaseSettings):
     gemini_api_key: Optional[str] = Field(default=None, description="Gemini API 키")
     langsmith_project: Optional[str] = Field(default="langgraph-agent", description="LangSmith 프로젝트명")
     
+    # LLM/검색 제공자 선택 (fake: 외부 API 없이 동작하는 오프라인 결정적 구현)
+    llm_provider: str = Field(default="gemini", description="LLM 제공자 (gemini/fake)")
+    search_provider: str = Field(default="duckduckgo", description="검색 제공자 (duckduckgo/fake)")
+    
+    # 가짜 제공자 설정 (벤치마크/부하 테스트용)
+    fake_latency_distribution: str = Field(default="lognormal", description="지연 분포 (fixed/uniform/normal/lognormal)")
+    fake_llm_first_token_ms: float = Field(default=300.0, ge=0, description="가짜 LLM 첫 토큰 지연 평균 (ms)")
+    fake_llm_jitter_ms: float = Field(default=100.0, ge=0, description="가짜 LLM 첫 토큰 지연 편차 (ms)")
+    fake_llm_tokens_per_second: float = Field(default=60.0, ge=0, description="가짜 LLM 초당 토큰 수 (0이면 즉시)")
+    fake_llm_error_rate: float = Field(default=0.0, ge=0, le=1, description="가짜 LLM 에러 주입 확률")
+    fake_search_latency_ms: float = Field(default=400.0, ge=0, description="가짜 검색 지연 평균 (ms)")
+    fake_search_jitter_ms: float = Field(default=150.0, ge=0, description="가짜 검색 지연 편차 (ms)")
+    fake_search_error_rate: float = Field(default=0.0, ge=0, le=1, description="가짜 검색 에러 주입 확률")
+    fake_seed: Optional[int] = Field(default=None, description="가짜 제공자 난수 시드 (재현용)")
+    
     # 환경 설정
     environment: str = Field(default="development", description="실행 환경 (development/production)")
     debug: bool = Field(default=True, description="디버그 모드")
     
+    # 운영 서버 설정 (environment=production일 때 적용)
+    server_workers: int = Field(default=0, ge=0, description="워커 프로세스 수 (0이면 CPU 코어 수)")
+    server_backlog: int = Field(default=2048, ge=1, description="대기 연결 큐 크기")
+    server_keep_alive_timeout: int = Field(default=75, ge=1, description="Keep-Alive 유지 시간 (초, 로드밸런서 유휴 시간보다 길게)")
+    server_graceful_timeout: int = Field(default=30, ge=0, description="종료 시 진행 중인 요청 대기 시간 (초)")
+    
+    # 성능 설정 (reload_settings()로 재시작 없이 적용되는 값은 [hot] 표시)
+    chat_history_capacity: int = Field(default=10000, ge=1, description="[hot] 채팅 히스토리 링 버퍼 용량")
+    batch_max_queries: int = Field(default=50, ge=1, le=50, description="[hot] 배치 검색 요청당 최대 쿼리 수")
+    batch_default_concurrency: int = Field(default=4, ge=1, le=16, description="[hot] 배치 검색 기본 동시 실행 수")
+    batch_max_concurrency: int = Field(default=16, ge=1, le=16, description="[hot] 배치 검색 최대 동시 실행 수")
+    conversation_ttl_seconds: int = Field(default=86400, ge=1, description="유휴 대화 스레드 상태 유지 시간 (초)")
+    max_conversation_threads: int = Field(default=10000, ge=1, description="대화 상태를 유지하는 최대 스레드 수")
+    compression_minimum_size: int = Field(default=1000, ge=0, description="응답 압축 최소 크기 (바이트)")
+    llm_timeout: float = Field(default=60.0, gt=0, description="LLM 요청 타임아웃 (초)")
+    llm_max_retries: int = Field(default=2, ge=0, description="LLM 요청 재시도 횟수")
+    
+    # 후속 질문 대비 선행 검색 (응답에 등장한 상위 N개 상품을 백그라운드에서 미리 검색)
+    prefetch_enabled: bool = Field(default=False, description="선행 검색 사용 여부")
+    prefetch_top_n: int = Field(default=3, ge=1, le=10, description="턴마다 선행 검색할 최대 상품 수")
+    prefetch_max_workers: int = Field(default=2, ge=1, le=8, description="선행 검색 동시 실행 수")
+    prefetch_max_pending: int = Field(default=32, ge=1, description="대기 가능한 최대 선행 검색 수 (초과분은 버림)")
+    
+    # 인기 검색어 사전 계산 (상위 K개 검색어 결과를 만료 전에 백그라운드에서 갱신)
+    hot_query_enabled: bool = Field(default=False, description="핫 쿼리 스케줄러 사용 여부")
+    hot_query_top_k: int = Field(default=20, ge=1, le=200, description="사전 계산할 인기 검색어 수")
+    hot_query_min_hits: float = Field(default=3.0, ge=1, description="인기 검색어로 보는 최소 (감쇠) 요청 수")
+    hot_query_refresh_interval: float = Field(default=60.0, gt=0, description="갱신 주기 (초)")
+    hot_query_ttl: float = Field(default=600.0, gt=0, description="사전 계산 결과 유효 시간 (초)")
+    hot_query_half_life: float = Field(default=3600.0, gt=0, description="검색어 빈도 감쇠 반감기 (초)")
+    
+    # 상품 가격 이력 (없으면 메모리에만 보관, 경로를 지정하면 로그 파일에 이어 쓰고 시작 시 복원)
+    price_history_path: Optional[str] = Field(default=None, description="가격 이력 로그 디렉터리")
+    price_history_max_points: int = Field(default=10000, ge=10, description="상품별 최대 가격 관측 수")
+    price_history_max_series: int = Field(default=10000, ge=1, description="가격 이력을 유지하는 최대 상품 수")
+
+    # 상품 카탈로그 스냅샷 (경로를 지정하면 주기적으로 저장하고 시작 시 mmap으로 열어 바로 응답)
+    catalog_snapshot_path: Optional[str] = Field(default=None, description="카탈로그 스냅샷 파일 경로")
+    catalog_snapshot_interval: float = Field(default=300.0, gt=0, description="스냅샷 저장 주기 (초)")
+    catalog_max_age: float = Field(default=86400.0, gt=0, description="스냅샷 상품을 그대로 응답하는 최대 경과 시간 (초)")
+
+    # 설정 재로드 엔드포인트 토큰 (없으면 개발 환경에서만 허용)
+    admin_token: Optional[str] = Field(default=None, description="관리 API 토큰")
+    
     # 로깅 설정
     log_level: str = Field(default="INFO", description="로그 레벨")
         
@@ -57,9 +117,12 @@ class Settings(BaseSettings):
 class Config:
     """Agent 관련 설정"""
     
-    def __init__(self, settings: Settings = None):
-        if settings is None:
-            settings = Settings()
+    def __init__(self, settings: Optional[Settings] = None):
+        # 설정을 넘기지 않으면 캐시된 현재 설정 사용 (환경 변수를 다시 파싱하지 않음)
+        self.apply(settings if settings is not None else get_settings())
+        
+    def apply(self, settings: Settings):
+        """설정 값 반영 (재로드 시에도 사용)"""
         self.GOOGLE_API_KEY = settings.google_api_key or ""
         self.LANGSMITH_API_KEY = settings.langsmith_api_key or ""
         self.LANGSMITH_PROJECT = settings.langsmith_project or "langgraph-agent"
@@ -72,11 +135,47 @@ class Config:
             os.environ["LANGCHAIN_PROJECT"] = self.LANGSMITH_PROJECT
 
 
-# 전역 설정 인스턴스
-settings = Settings()
-config = Config(settings)
+# 현재 설정 (처음 조회할 때 한 번 파싱, reload_settings가 검증한 새 인스턴스로 교체)
+_current_settings: Optional[Settings] = None
 
 
 def get_settings() -> Settings:
-    """설정 인스턴스 반환 (의존성 주입용)"""
-    return settings 
\ No newline at end of file
+    """설정 인스턴스 반환 (의존성 주입용, 프로세스당 한 번만 파싱)"""
+    global _current_settings
+    if _current_settings is None:
+        _current_settings = Settings()
+    return _current_settings
+
+
+# 전역 설정 인스턴스 (기존 코드 호환용 - 재로드 후 값은 get_settings()로 조회)
+settings = get_settings()
+config = Config(settings)
+
+# 설정 재로드 시 호출할 콜백 목록
+_reload_callbacks: List[Callable[[Settings], None]] = []
+
+
+def on_settings_reload(callback: Callable[[Settings], None]) -> Callable[[Settings], None]:
+    """설정 재로드 시 새 설정으로 호출될 콜백 등록 (데코레이터로도 사용 가능)"""
+    _reload_callbacks.append(callback)
+    return callback
+
+
+def reload_settings() -> Settings:
+    """
+    환경 변수와 .env를 다시 읽어 설정 갱신 (SIGHUP 또는 관리 API에서 호출)
+    
+    Returns:
+        Settings: 새로 파싱된 설정
+    
+    Raises:
+        pydantic.ValidationError: 새 설정 값이 유효하지 않은 경우 (기존 설정 유지)
+    """
+    global settings, _current_settings
+    # 한 번만 파싱/검증하고, 잘못된 값이면 예외가 나므로 기존 설정 유지
+    new_settings = Settings()
+    _current_settings = settings = new_settings
+    config.apply(new_settings)
+    for callback in list(_reload_callbacks):
+        callback(new_settings)
+    return new_settings 
\ No newline at end of file
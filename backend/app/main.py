@@ -3,18 +3,85 @@ FastAPI 메인 애플리케이션
 온라인 쇼핑 최저가 검색 챗봇 Agent 백엔드 서버
 """
 
+import asyncio
+import signal
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import os
-from dotenv import load_dotenv
-from app.config import settings, config
-from app.api.chat import router as chat_router
-from app.api.search import router as search_router
-
-# 환경 변수 로드
-load_dotenv()
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import ValidationError
+from app.config import settings, get_settings, reload_settings
+from app.api.chat import close_agent, get_agent, router as chat_router
+from app.api.search import catalog_entries, router as search_router
+from app.services.catalog import CatalogSnapshotter, catalog
+from app.services.hot_queries import HotQueryScheduler, hot_query_index, hot_query_tracker
+from app.services.price_history import price_history
+
+# Brotli 압축은 선택 의존성 (brotli-asgi 미설치 시 GZip만 사용)
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 이 크기(바이트) 미만의 응답은 압축하지 않음 (미들웨어 구성 시 한 번만 적용)
+COMPRESSION_MINIMUM_SIZE = settings.compression_minimum_size
+
+
+def _reload_on_signal():
+    """SIGHUP 수신 시 설정 재로드 (워커 재시작 없이 [hot] 설정 반영)"""
+    try:
+        reload_settings()
+        print("🔄 설정을 다시 불러왔습니다")
+    except ValidationError as e:
+        print(f"⚠️ 설정 재로드 실패 - 기존 설정 유지: {e}")
+
+
+def _install_reload_signal() -> bool:
+    """SIGHUP 핸들러 등록 (지원하지 않는 플랫폼/메인 스레드가 아닌 루프에서는 건너뜀)"""
+    if not hasattr(signal, "SIGHUP"):
+        return False
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_on_signal)
+    except (NotImplementedError, RuntimeError, ValueError):
+        return False
+    return True
+
+
+def _create_hot_query_scheduler(settings) -> Optional[HotQueryScheduler]:
+    """설정에 따라 인기 검색어 사전 계산 스케줄러 생성 (비활성화면 None)"""
+    if not settings.hot_query_enabled:
+        return None
+    hot_query_tracker.half_life = settings.hot_query_half_life
+    return HotQueryScheduler(
+        hot_query_tracker,
+        hot_query_index,
+        # Agent는 인기 검색어가 생긴 뒤 첫 갱신 시점에 생성
+        lambda query: get_agent().fetch_search_results(query),
+        top_k=settings.hot_query_top_k,
+        interval=settings.hot_query_refresh_interval,
+        ttl=settings.hot_query_ttl,
+        min_hits=settings.hot_query_min_hits
+    )
+
+
+def _open_catalog(settings) -> Optional[CatalogSnapshotter]:
+    """카탈로그 스냅샷을 매핑하고 주기적 저장기 생성 (경로 미설정이면 None)"""
+    if not settings.catalog_snapshot_path:
+        return None
+    try:
+        rows = catalog.load(settings.catalog_snapshot_path)
+        print(f"🗂️ 카탈로그 스냅샷 상품 {rows}개 로드")
+    except ValueError as e:
+        # 손상된 스냅샷은 무시하고 다음 저장 때 새로 작성
+        print(f"⚠️ {e}")
+    return CatalogSnapshotter(
+        settings.catalog_snapshot_path,
+        catalog_entries,
+        interval=settings.catalog_snapshot_interval,
+        max_age=settings.catalog_max_age
+    )
 
 
 @asynccontextmanager
@@ -23,8 +90,30 @@ async def lifespan(app: FastAPI):
     # 시작 시 실행
     print("🚀 Shopping Chat Agent API Server started!")
     print(f"📖 API Documentation: http://localhost:8000/docs")
+    reload_signal = _install_reload_signal()
+    current = get_settings()
+    price_history.max_points = current.price_history_max_points
+    price_history.max_series = current.price_history_max_series
+    if current.price_history_path:
+        restored = price_history.open(current.price_history_path)
+        print(f"📈 가격 이력 {restored}건 복원")
+    catalog_snapshotter = _open_catalog(current)
+    if catalog_snapshotter:
+        catalog_snapshotter.start()
+    hot_query_scheduler = _create_hot_query_scheduler(current)
+    if hot_query_scheduler:
+        hot_query_scheduler.start()
     yield
+    if reload_signal:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
     # 종료 시 실행
+    if hot_query_scheduler:
+        await hot_query_scheduler.stop()
+    if catalog_snapshotter:
+        await catalog_snapshotter.stop()
+        catalog.close()
+    close_agent()
+    price_history.close()
     print("🛑 Shopping Chat Agent API Server stopped!")
 
 
@@ -45,8 +134,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# 응답 압축 미들웨어 (Brotli 가능 시 Brotli, 미지원 클라이언트는 GZip)
+if BROTLI_AVAILABLE:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
 # API 라우터 포함
 app.include_router(chat_router, prefix="/api")
 app.include_router(search_router, prefix="/api")
@@ -89,21 +185,41 @@ async def api_info():
     }
 
 
+@app.post("/admin/reload-settings")
+async def reload_settings_endpoint(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    설정 재로드 엔드포인트 - 환경 변수/.env를 다시 읽어 [hot] 설정을 즉시 반영
+    (요청을 받은 워커에만 적용되므로 멀티 워커에서는 각 워커에 SIGHUP 사용)
+    """
+    current = get_settings()
+    if current.admin_token:
+        if x_admin_token != current.admin_token:
+            raise HTTPException(status_code=403, detail="관리 토큰이 올바르지 않습니다")
+    elif current.is_production():
+        raise HTTPException(status_code=403, detail="운영 환경에서는 ADMIN_TOKEN 설정이 필요합니다")
+    
+    try:
+        new_settings = reload_settings()
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"설정 값이 올바르지 않습니다: {e.errors()}")
+    
+    return {
+        "status": "reloaded",
+        "settings": new_settings.model_dump(include={
+            "chat_history_capacity",
+            "batch_max_queries",
+            "batch_default_concurrency",
+            "batch_max_concurrency"
+        })
+    }
+
+
 # 기존 on_event는 lifespan으로 대체됨
 
 
 if __name__ == "__main__":
     import uvicorn
+    from app.server import build_server_options
     
-    # 환경 변수에서 설정 읽기
-    host = os.getenv("FASTAPI_HOST", "localhost")
-    port = int(os.getenv("FASTAPI_PORT", "8000"))
-    
-    # 서버 실행
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    # run_server.py와 같은 실행 옵션 사용 (개발: reload, 운영: 멀티 워커)
+    uvicorn.run(**build_server_options(settings))
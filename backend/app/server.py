@@ -0,0 +1,62 @@
+"""
+uvicorn 실행 옵션 구성
+개발 환경은 파일 감시 reload 단일 프로세스, 운영 환경은 코어 수만큼의 워커와
+uvloop/httptools, keep-alive/backlog 튜닝, graceful shutdown을 사용한다
+"""
+
+import importlib.util
+import os
+
+from app.config import Settings
+
+APP_PATH = "app.main:app"
+
+
+def _installed(module: str) -> bool:
+    """선택 의존성 설치 여부"""
+    return importlib.util.find_spec(module) is not None
+
+
+def default_worker_count() -> int:
+    """프로세스가 사용할 수 있는 CPU 코어 수 (컨테이너 CPU 제한 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def build_server_options(settings: Settings) -> dict:
+    """
+    실행 환경에 맞는 uvicorn.run 인자 생성
+
+    Args:
+        settings: 애플리케이션 설정
+
+    Returns:
+        dict: uvicorn.run에 그대로 전달할 키워드 인자
+    """
+    options = {
+        "app": APP_PATH,
+        "host": settings.fastapi_host,
+        "port": settings.fastapi_port,
+        "log_level": settings.log_level.lower(),
+    }
+
+    if not settings.is_production():
+        # 개발 모드: 코드 변경 시 자동 재시작
+        options.update(reload=True, workers=1)
+        return options
+
+    options.update(
+        reload=False,
+        workers=settings.server_workers or default_worker_count(),
+        # uvloop/httptools는 선택 의존성 - 없으면 표준 구현 사용
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive_timeout,
+        # SIGTERM 수신 시 새 연결을 받지 않고 진행 중인 요청을 이 시간까지 마무리
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=False,
+        proxy_headers=True,
+    )
+    return options
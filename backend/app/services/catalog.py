@@ -0,0 +1,399 @@
+"""
+상품 카탈로그 스냅샷
+검색 결과를 고정 폭 컬럼 배열(가격/정가/할인율/평점/리뷰 수) + 문자열 테이블로 이루어진
+단일 바이너리 파일로 주기적으로 저장하고, 시작 시 mmap으로 열어 파싱 없이 바로 조회한다.
+읽기 전용 매핑이므로 같은 파일을 여는 워커 프로세스들은 페이지 캐시를 공유한다.
+저장할 때는 파일 잠금을 잡고 디스크의 스냅샷과 병합하므로 여러 워커가 같은 파일에 저장해도
+서로의 검색 결과를 지우지 않는다.
+
+파일 형식 (리틀 엔디언, 각 구역은 8바이트 정렬):
+    헤더      magic "PCAT", 버전, 행 수 N, 검색어 수 Q, 문자열 수 M
+    숫자 컬럼  price/original_price/discount_rate/rating f64[N], review_count i64[N] (없음: NaN / -1)
+    문자열 열  행마다 STRING_FIELDS 순서의 문자열 번호 u32 (없음: 0xFFFFFFFF)
+    검색어     (키 문자열 번호 u32, 시작 행 u32, 행 수 u32, 예약 u32, 저장 시각 f64) x Q
+    문자열     끝 오프셋 u64[M] + UTF-8 바이트 (중복 문자열은 한 번만 저장)
+"""
+
+import asyncio
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Iterable, Literal, Optional, Tuple
+
+from app.services.normalization import query_key
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # fcntl이 없는 플랫폼(Windows)에서는 워커 간 잠금 없이 저장
+    fcntl = None
+
+MAGIC = b"PCAT"
+VERSION = 1
+
+# 숫자 컬럼 (없음은 NaN) / 정수 컬럼 (없음은 -1) / 문자열 컬럼
+FLOAT_FIELDS = ("price", "original_price", "discount_rate", "rating")
+INT_FIELDS = ("review_count",)
+STRING_FIELDS = ("product_id", "name", "seller", "url", "image_url", "shipping_info")
+
+_HEADER = struct.Struct("<4sIIII4x")
+_QUERY = struct.Struct("<IIIId")
+_NO_STRING = 0xFFFFFFFF
+
+# 스냅샷 항목: (검색어, 저장 시각(Unix 초), 상품 목록)
+CatalogEntry = Tuple[str, float, List]
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _field(product, name: str):
+    """상품 객체 또는 딕셔너리(스냅샷에서 읽은 행)의 필드 값"""
+    return product.get(name) if isinstance(product, dict) else getattr(product, name)
+
+
+def write_catalog_snapshot(path: str, entries: Iterable[CatalogEntry]) -> int:
+    """
+    카탈로그 스냅샷 파일 작성 (임시 파일에 쓴 뒤 교체하므로 기존 매핑을 연 프로세스에 영향 없음)
+
+    Args:
+        path: 스냅샷 파일 경로
+        entries: (검색어, 저장 시각(Unix 초), 상품 목록) - 상품은 FLOAT/INT/STRING_FIELDS 속성을 가진 객체 또는 딕셔너리
+
+    Returns:
+        저장한 상품 행 수
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        return strings.setdefault(value, len(strings))
+
+    floats: Dict[str, List[float]] = {field: [] for field in FLOAT_FIELDS}
+    ints: Dict[str, List[int]] = {field: [] for field in INT_FIELDS}
+    string_ids: List[int] = []
+    queries = []
+    seen = set()
+    for query, saved_at, products in entries:
+        key = query_key(query)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        queries.append((intern(key), len(string_ids) // len(STRING_FIELDS), len(products), saved_at))
+        for product in products:
+            for field in FLOAT_FIELDS:
+                value = _field(product, field)
+                floats[field].append(math.nan if value is None else float(value))
+            for field in INT_FIELDS:
+                value = _field(product, field)
+                ints[field].append(-1 if value is None else int(value))
+            string_ids.extend(intern(_field(product, field)) for field in STRING_FIELDS)
+
+    rows = len(string_ids) // len(STRING_FIELDS)
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = []
+    end = 0
+    for value in encoded:
+        end += len(value)
+        offsets.append(end)
+
+    def padded(data: bytes) -> bytes:
+        return data + b"\0" * (_aligned(len(data)) - len(data))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, rows, len(queries), len(encoded)))
+        for field in FLOAT_FIELDS:
+            f.write(struct.pack(f"<{rows}d", *floats[field]))
+        for field in INT_FIELDS:
+            f.write(struct.pack(f"<{rows}q", *ints[field]))
+        f.write(padded(struct.pack(f"<{len(string_ids)}I", *string_ids)))
+        for entry in queries:
+            f.write(_QUERY.pack(*entry[:3], 0, entry[3]))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(b"".join(encoded))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return rows
+
+
+@contextmanager
+def _snapshot_lock(path: str) -> Iterator[None]:
+    """스냅샷 파일 저장 잠금 (워커 프로세스 간 배타 잠금 - 별도 .lock 파일 사용)"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def merge_catalog_snapshot(path: str, entries: Iterable[CatalogEntry], max_age: Optional[float] = None) -> int:
+    """
+    디스크의 기존 스냅샷과 병합해서 저장
+
+    잠금을 잡은 상태에서 파일을 다시 읽어 검색어별로 저장 시각이 가장 최근인 항목을 남기므로,
+    마지막에 저장한 워커가 다른 워커의 검색 결과를 덮어쓰지 않는다 (손상된 파일은 새로 작성).
+
+    Args:
+        path: 스냅샷 파일 경로
+        entries: 이번 프로세스의 (검색어, 저장 시각, 상품 목록)
+        max_age: 이 시간(초)보다 오래된 항목은 버림
+
+    Returns:
+        저장한 상품 행 수
+    """
+    merged: Dict[str, CatalogEntry] = {}
+
+    def keep(entry: CatalogEntry):
+        key = query_key(entry[0])
+        if key and (key not in merged or entry[1] > merged[key][1]):
+            merged[key] = entry
+
+    for entry in entries:
+        keep(entry)
+    with _snapshot_lock(path):
+        existing = CatalogSnapshot()
+        try:
+            existing.load(path)
+            for entry in existing.entries():
+                keep(entry)
+        except ValueError as e:
+            print(f"기존 카탈로그 스냅샷을 읽지 못해 새로 작성합니다: {e}")
+        finally:
+            existing.close()
+        deadline = None if max_age is None else time.time() - max_age
+        fresh = [entry for entry in merged.values() if deadline is None or entry[1] >= deadline]
+        fresh.sort(key=lambda entry: entry[1], reverse=True)
+        return write_catalog_snapshot(path, fresh)
+
+
+class CatalogSnapshot:
+    """mmap으로 연 카탈로그 스냅샷 (행은 조회 시점에만 디코딩)"""
+
+    def __init__(self):
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List["memoryview[Any]"] = []
+        self._columns: Dict[str, "memoryview[Any]"] = {}
+        self._string_ids: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+        self._blob: Optional[memoryview] = None
+        # 검색어 키 -> (시작 행, 행 수, 저장 시각)
+        self._queries: Dict[str, Tuple[int, int, float]] = {}
+        self._lock = threading.Lock()
+        self.path: Optional[str] = None
+
+    def load(self, path: str) -> int:
+        """
+        스냅샷 파일을 매핑 (파일이 없으면 빈 카탈로그)
+
+        Returns:
+            매핑한 상품 행 수
+
+        Raises:
+            ValueError: 스냅샷 형식이 올바르지 않은 경우
+        """
+        with self._lock:
+            self._close()
+            self.path = path
+            if not os.path.exists(path) or os.path.getsize(path) < _HEADER.size:
+                return 0
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                rows = self._map(mapped)
+            except (ValueError, TypeError, IndexError, struct.error) as e:
+                self._close()
+                mapped.close()
+                raise ValueError(f"카탈로그 스냅샷 형식이 올바르지 않습니다: {e}") from None
+            self._mmap = mapped
+            return rows
+
+    def _map(self, mapped: mmap.mmap) -> int:
+        magic, version, rows, query_count, string_count = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("magic/버전 불일치")
+        buffer = memoryview(mapped)
+        self._views.append(buffer)
+        position = _HEADER.size
+
+        def section(size: int, fmt: Literal["d", "q", "I", "B", "Q"]) -> "memoryview[Any]":
+            nonlocal position
+            if position + size > len(buffer):
+                raise ValueError("파일이 잘렸습니다")
+            view = buffer[position:position + size].cast(fmt)
+            self._views.append(view)
+            position = _aligned(position + size)
+            return view
+
+        for field in FLOAT_FIELDS:
+            self._columns[field] = section(rows * 8, "d")
+        for field in INT_FIELDS:
+            self._columns[field] = section(rows * 8, "q")
+        self._string_ids = section(rows * len(STRING_FIELDS) * 4, "I")
+        query_bytes = section(query_count * _QUERY.size, "B")
+        self._offsets = section(string_count * 8, "Q")
+        blob_size = self._offsets[-1] if string_count else 0
+        self._blob = section(blob_size, "B")
+
+        for key_id, start, count, _, saved_at in _QUERY.iter_unpack(query_bytes):
+            key = self._string(key_id)
+            if key is None or start + count > rows:
+                raise ValueError("검색어 항목이 올바르지 않습니다")
+            self._queries[key] = (start, count, saved_at)
+        return rows
+
+    def _string(self, string_id: int) -> Optional[str]:
+        """문자열 번호 -> 문자열 (번호/오프셋이 손상되었으면 IndexError 또는 UnicodeDecodeError)"""
+        offsets, blob = self._offsets, self._blob
+        if string_id == _NO_STRING or offsets is None or blob is None:
+            return None
+        start = offsets[string_id - 1] if string_id else 0
+        end = offsets[string_id]
+        if not start <= end <= len(blob):
+            raise IndexError("문자열 오프셋이 올바르지 않습니다")
+        return str(blob[start:end], "utf-8")
+
+    def _row(self, row: int) -> Dict:
+        product: Dict[str, Any] = {}
+        for field in FLOAT_FIELDS:
+            value = self._columns[field][row]
+            product[field] = None if math.isnan(value) else value
+        for field in INT_FIELDS:
+            value = self._columns[field][row]
+            product[field] = None if value < 0 else value
+        base = row * len(STRING_FIELDS)
+        string_ids = self._string_ids
+        for offset, field in enumerate(STRING_FIELDS):
+            product[field] = None if string_ids is None else self._string(string_ids[base + offset])
+        return product
+
+    def _rows(self, start: int, count: int) -> Optional[List[Dict]]:
+        """행 범위 디코딩 (손상된 행이 있으면 None - 요청 처리를 중단시키지 않음)"""
+        try:
+            return [self._row(row) for row in range(start, start + count)]
+        except (IndexError, ValueError):
+            return None
+
+    def lookup(self, query: str, max_age: Optional[float] = None) -> Optional[List[Dict]]:
+        """
+        검색어의 저장된 상품 목록 (저장 순서)
+
+        Args:
+            query: 검색어 (정규화 키로 조회)
+            max_age: 이 시간(초)보다 오래된 스냅샷 항목은 무시
+
+        Returns:
+            상품 필드 딕셔너리 목록 (없거나 오래되면 None)
+        """
+        with self._lock:
+            entry = self._queries.get(query_key(query))
+            if entry is None:
+                return None
+            start, count, saved_at = entry
+            if max_age is not None and time.time() - saved_at > max_age:
+                return None
+            return self._rows(start, count)
+
+    def entries(self) -> List[CatalogEntry]:
+        """저장된 (검색어 키, 저장 시각, 상품 목록) 전체 - 스냅샷 재작성 시 병합용 (손상된 항목은 제외)"""
+        with self._lock:
+            entries = []
+            for key, (start, count, saved_at) in self._queries.items():
+                products = self._rows(start, count)
+                if products is not None:
+                    entries.append((key, saved_at, products))
+            return entries
+
+    def _close(self):
+        self._queries.clear()
+        self._columns.clear()
+        self._string_ids = self._offsets = self._blob = None
+        # 매핑을 닫기 전에 파생 뷰를 모두 해제해야 한다
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def __contains__(self, query: str) -> bool:
+        return query_key(query) in self._queries
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+
+class CatalogSnapshotter:
+    """
+    카탈로그 스냅샷 주기적 저장 (lifespan에서 시작/종료, 종료 시 한 번 더 저장)
+
+    수집 함수는 요청 처리와 같은 이벤트 루프에서 호출해 검색 결과 목록을 복사하고,
+    디스크 스냅샷과의 병합/저장만 스레드에서 실행한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        collect: Callable[[], Iterable[CatalogEntry]],
+        interval: float = 300.0,
+        max_age: Optional[float] = None,
+    ):
+        self.path = path
+        self.collect = collect
+        self.interval = interval
+        self.max_age = max_age
+        self._task: Optional[asyncio.Task] = None
+
+    def write_once(self) -> int:
+        """현재 검색 결과를 기존 스냅샷과 병합해서 저장 (저장한 상품 행 수)"""
+        return merge_catalog_snapshot(self.path, list(self.collect()), self.max_age)
+
+    async def _save(self):
+        entries = list(self.collect())
+        try:
+            await asyncio.to_thread(merge_catalog_snapshot, self.path, entries, self.max_age)
+        except Exception as e:
+            print(f"카탈로그 스냅샷 저장 실패: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._save()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """주기적 저장 중지 후 마지막 스냅샷 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._save()
+
+
+# 전역 카탈로그 (스냅샷 경로 설정 시 lifespan에서 load)
+catalog = CatalogSnapshot()
@@ -0,0 +1,275 @@
+"""
+채팅 히스토리 저장소
+고정 크기 링 버퍼에 append 전용으로 저장하여 항상 시간순을 유지하고,
+thread_id / user_id 보조 인덱스로 스레드별 조회 시 전체 스캔을 피한다
+"""
+
+from bisect import bisect_left
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.services.pagination import decode_cursor, encode_cursor
+
+# 링 버퍼 기본 용량 (초과 시 가장 오래된 항목부터 덮어씀)
+DEFAULT_CHAT_HISTORY_CAPACITY = 10000
+
+# 삭제된 스레드 항목 자리 표시 (링 버퍼 위치는 유지하고 모든 조회에서 제외)
+_FORGOTTEN = object()
+
+
+class ChatHistoryStore:
+    """시간순 링 버퍼 + 스레드/사용자 보조 인덱스"""
+
+    def __init__(self, capacity: int = DEFAULT_CHAT_HISTORY_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity는 1 이상이어야 합니다")
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._next_seq = 0
+        self._size = 0
+        # 버퍼에 남아 있는 삭제 표시 항목 수
+        self._forgotten = 0
+        # 인덱스는 오름차순 seq 목록 (append 순서 그대로이므로 항상 정렬됨)
+        self._by_thread: Dict[str, Deque[int]] = {}
+        self._by_user: Dict[str, Deque[int]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return self._size - self._forgotten
+
+    @property
+    def _oldest_seq(self) -> int:
+        return self._next_seq - self._size
+
+    def append(self, item: Any, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> int:
+        """항목 추가 후 부여된 시퀀스 번호 반환"""
+        with self._lock:
+            if self._size == self.capacity:
+                self._evict_oldest()
+
+            seq = self._next_seq
+            self._slots[seq % self.capacity] = (item, thread_id, user_id)
+            self._next_seq += 1
+            self._size += 1
+
+            if thread_id is not None:
+                self._by_thread.setdefault(thread_id, deque()).append(seq)
+            if user_id is not None:
+                self._by_user.setdefault(user_id, deque()).append(seq)
+            return seq
+
+    def _evict_oldest(self):
+        """가장 오래된 항목 제거 및 인덱스 정리 (O(1))"""
+        seq = self._oldest_seq
+        slot = seq % self.capacity
+        item, thread_id, user_id = self._slots[slot]
+        self._slots[slot] = None
+        self._size -= 1
+        if item is _FORGOTTEN:
+            self._forgotten -= 1
+        self._drop_from_index(self._by_thread, thread_id, seq)
+        self._drop_from_index(self._by_user, user_id, seq)
+
+    @staticmethod
+    def _drop_from_index(index: Dict[str, Deque[int]], key: Optional[str], seq: int):
+        if key is None:
+            return
+        seqs = index.get(key)
+        if seqs and seqs[0] == seq:
+            seqs.popleft()
+            if not seqs:
+                del index[key]
+
+    @property
+    def oldest_seq(self) -> int:
+        """버퍼에 남아 있는 가장 오래된 항목의 시퀀스 번호 (이보다 작은 번호는 밀려남)"""
+        return self._oldest_seq
+
+    def get(self, seq: int) -> Optional[Any]:
+        """시퀀스 번호로 항목 조회 (밀려났거나 삭제된 항목은 None)"""
+        with self._lock:
+            if not self._oldest_seq <= seq < self._next_seq:
+                return None
+            return self._live_item(seq)
+
+    def _live_item(self, seq: int) -> Optional[Any]:
+        """버퍼 안 seq의 항목 (비었거나 삭제 표시면 None)"""
+        slot = self._slots[seq % self.capacity]
+        if slot is None or slot[0] is _FORGOTTEN:
+            return None
+        return slot[0]
+
+    def _is_live(self, seq: int) -> bool:
+        slot = self._slots[seq % self.capacity]
+        return slot is not None and slot[0] is not _FORGOTTEN
+
+    def last(self) -> Optional[Any]:
+        """가장 최근 항목 반환 (삭제된 스레드 항목 제외)"""
+        with self._lock:
+            for seq in range(self._next_seq - 1, self._oldest_seq - 1, -1):
+                if self._is_live(seq):
+                    return self._slots[seq % self.capacity][0]
+            return None
+
+    def _index_seqs(self, thread_id: Optional[str], user_id: Optional[str]) -> Optional[Deque[int]]:
+        """스레드(우선)/사용자 인덱스의 시퀀스 번호 목록 (둘 다 없으면 None = 전체)"""
+        if thread_id is not None:
+            return self._by_thread.get(thread_id, deque())
+        if user_id is not None:
+            return self._by_user.get(user_id, deque())
+        return None
+
+    def count(self, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> int:
+        """조건에 맞는 항목 수"""
+        seqs = self._index_seqs(thread_id, user_id)
+        return self._size - self._forgotten if seqs is None else len(seqs)
+
+    def thread_seqs(self, thread_id: str) -> List[int]:
+        """스레드 항목의 시퀀스 번호 (오래된 순)"""
+        with self._lock:
+            return list(self._by_thread.get(thread_id, ()))
+
+    def recent(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        최신순으로 최대 limit개 항목 조회 (O(limit))
+
+        Args:
+            limit: 페이지 크기
+            cursor: 이전 응답의 next_cursor
+            thread_id: 지정 시 해당 스레드 항목만 조회
+            user_id: 지정 시 해당 사용자 항목만 조회
+
+        Returns:
+            (항목 리스트, 다음 페이지 커서 또는 None)
+
+        Raises:
+            ValueError: 커서 형식이 올바르지 않은 경우
+        """
+        with self._lock:
+            before = self._next_seq if cursor is None else decode_cursor(cursor)
+
+            seqs = self._index_seqs(thread_id, user_id)
+            if seqs is not None:
+                if cursor is None:
+                    end = len(seqs)
+                else:
+                    end = bisect_left(seqs, before)
+                start = max(0, end - limit)
+                selected = [seqs[i] for i in range(end - 1, start - 1, -1)]
+                has_more = start > 0
+            else:
+                # 삭제 표시 항목은 건너뛴다 (없으면 정확히 limit개만 확인)
+                seq = min(before, self._next_seq) - 1
+                selected = []
+                while seq >= self._oldest_seq and len(selected) < limit:
+                    if self._is_live(seq):
+                        selected.append(seq)
+                    seq -= 1
+                has_more = any(self._is_live(older) for older in range(seq, self._oldest_seq - 1, -1))
+
+            items = [self._slots[seq % self.capacity][0] for seq in selected]
+            next_cursor = encode_cursor(selected[-1]) if has_more and selected else None
+            return items, next_cursor
+
+    def since(
+        self,
+        cursor: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Any], str, bool]:
+        """
+        커서 이후에 추가된 항목을 시간순으로 조회 (증분 동기화용)
+
+        Args:
+            cursor: 이전 동기화 응답의 커서 (없으면 버퍼에 남은 가장 오래된 항목부터)
+            thread_id: 지정 시 해당 스레드 항목만 조회
+            limit: 최대 항목 수
+
+        Returns:
+            (항목 리스트, 다음 동기화에 사용할 커서, 남은 항목 존재 여부)
+
+        Raises:
+            ValueError: 커서 형식이 올바르지 않은 경우
+        """
+        with self._lock:
+            after = 0 if cursor is None else decode_cursor(cursor)
+
+            if thread_id is not None:
+                seqs = self._by_thread.get(thread_id, deque())
+                start = bisect_left(seqs, after)
+                available = len(seqs) - start
+                count = available if limit is None else min(available, limit)
+                selected = [seqs[i] for i in range(start, start + count)]
+            else:
+                start = max(after, self._oldest_seq)
+                live = [seq for seq in range(start, self._next_seq) if self._is_live(seq)]
+                available = len(live)
+                count = available if limit is None else min(available, limit)
+                selected = live[:count]
+
+            items = [self._slots[seq % self.capacity][0] for seq in selected]
+            # 다음 커서는 마지막으로 전달한 항목 바로 다음 (없으면 현재 끝)
+            next_after = selected[-1] + 1 if selected else max(after, self._next_seq)
+            return items, encode_cursor(next_after), count < available
+
+    def forget_thread(self, thread_id: str) -> int:
+        """
+        스레드 항목 삭제 후 삭제된 개수 반환
+        링 버퍼 위치는 삭제 표시로 남겨 시퀀스 번호/커서를 유지하고, 모든 조회와 사용자 인덱스에서 제외한다
+        """
+        with self._lock:
+            seqs = self._by_thread.pop(thread_id, ())
+            forgotten = set()
+            users = set()
+            for seq in seqs:
+                slot = seq % self.capacity
+                _, _, user_id = self._slots[slot]
+                self._slots[slot] = (_FORGOTTEN, None, None)
+                self._forgotten += 1
+                forgotten.add(seq)
+                if user_id is not None:
+                    users.add(user_id)
+            for user_id in users:
+                remaining = deque(seq for seq in self._by_user[user_id] if seq not in forgotten)
+                if remaining:
+                    self._by_user[user_id] = remaining
+                else:
+                    del self._by_user[user_id]
+            return len(seqs)
+
+    def resize(self, capacity: int):
+        """
+        버퍼 용량 변경 (설정 재로드 시 사용, O(n))
+        줄어드는 경우 가장 오래된 항목부터 제거하고 시퀀스 번호와 커서는 그대로 유지한다
+        """
+        if capacity < 1:
+            raise ValueError("capacity는 1 이상이어야 합니다")
+        with self._lock:
+            if capacity == self.capacity:
+                return
+            while self._size > capacity:
+                self._evict_oldest()
+
+            slots: List[Any] = [None] * capacity
+            for seq in range(self._oldest_seq, self._next_seq):
+                slots[seq % capacity] = self._slots[seq % self.capacity]
+            self._slots = slots
+            self.capacity = capacity
+
+    def clear(self) -> int:
+        """모든 항목 삭제 후 삭제된 개수 반환 (시퀀스 번호는 계속 증가)"""
+        with self._lock:
+            deleted_count = self._size - self._forgotten
+            self._slots = [None] * self.capacity
+            self._size = 0
+            self._forgotten = 0
+            self._by_thread.clear()
+            self._by_user.clear()
+            return deleted_count
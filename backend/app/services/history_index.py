@@ -0,0 +1,211 @@
+"""
+검색/대화 기록 전문 검색 인덱스
+저장된 검색 결과(검색어 + 상품명)와 채팅 메시지를 추가될 때마다 n-gram 역색인에 넣어두고,
+검색 시 전체 기록을 훑지 않고 게시 목록(posting) 교집합으로 후보를 좁힌 뒤 원문 포함 여부로 확인한다.
+
+한국어는 띄어쓰기가 일정하지 않고 조사가 붙으므로 단어를 글자 2-gram으로 쪼개 색인한다
+("갤럭시폰" -> "갤럭", "럭시", "시폰" 이므로 "갤럭시"로도 찾을 수 있음).
+텍스트는 검색어 캐시 키와 같은 정규화(query_text - 띄어쓰기는 유지)를 거치므로 "galaxy"로 "갤럭시"를 찾을 수 있다.
+"""
+
+import heapq
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.normalization import query_text
+
+# n-gram 길이 (이보다 짧은 단어는 단어 그대로 색인)
+NGRAM = 2
+
+
+def _grams(word: str) -> Set[str]:
+    if len(word) <= NGRAM:
+        return {word}
+    return {word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1)}
+
+
+def _terms(normalized: str) -> Set[str]:
+    terms: Set[str] = set()
+    for word in normalized.split():
+        terms |= _grams(word)
+    return terms
+
+
+def tokenize(text: str) -> Set[str]:
+    """텍스트의 색인 단위 (정규화한 단어별 n-gram 집합)"""
+    return _terms(query_text(text))
+
+
+class HistoryIndex:
+    """
+    기록 종류(kind)별 참조 키 -> 문서 역색인 (스레드 안전)
+
+    문서는 (kind, ref)로 식별하며 원본 항목은 저장하지 않는다.
+    검색 결과의 ref는 search_id, 채팅의 ref는 ChatHistoryStore 시퀀스 번호다.
+    """
+
+    def __init__(self):
+        # 색인 단위 -> 문서 번호 집합
+        self._postings: Dict[str, Set[int]] = {}
+        # 글자 -> 그 글자를 포함한 색인 단위 (n-gram보다 짧은 검색 단어용)
+        self._char_terms: Dict[str, Set[str]] = {}
+        # 문서 번호 -> (kind, ref, 정규화 텍스트, 색인 단위)
+        self._docs: Dict[int, Tuple[str, Any, str, Set[str]]] = {}
+        # kind -> ref -> 문서 번호 (추가 순서 유지)
+        self._refs: Dict[str, "OrderedDict[Any, int]"] = {}
+        self._next_id = 0
+        self._lock = Lock()
+
+    def add(self, kind: str, ref: Any, texts: Iterable[str]) -> int:
+        """
+        문서 추가 (같은 ref가 이미 있으면 교체)
+
+        Args:
+            kind: 기록 종류 ("search", "chat")
+            ref: 원본 항목 참조 키
+            texts: 색인할 텍스트 목록 (검색어, 상품명, 메시지 등)
+
+        Returns:
+            색인 단위 수
+        """
+        text = "\n".join(query_text(value) for value in texts if value)
+        terms = _terms(text)
+        with self._lock:
+            self._remove(kind, ref)
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = (kind, ref, text, terms)
+            self._refs.setdefault(kind, OrderedDict())[ref] = doc_id
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = set()
+                    for char in set(term):
+                        self._char_terms.setdefault(char, set()).add(term)
+                postings.add(doc_id)
+        return len(terms)
+
+    def _remove(self, kind: str, ref: Any) -> bool:
+        doc_id = self._refs.get(kind, {}).pop(ref, None)
+        if doc_id is None:
+            return False
+        _, _, _, terms = self._docs.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[term]
+                # "11", "ㅋㅋ"처럼 같은 글자가 반복된 단위도 글자별로 한 번만 정리
+                for char in set(term):
+                    char_terms = self._char_terms[char]
+                    char_terms.discard(term)
+                    if not char_terms:
+                        del self._char_terms[char]
+        return True
+
+    def remove(self, kind: str, ref: Any) -> bool:
+        with self._lock:
+            return self._remove(kind, ref)
+
+    def prune(self, kind: str, below: Any) -> int:
+        """
+        추가 순서상 앞쪽에서 ref가 below보다 작은 문서 제거 (링 버퍼에서 밀려난 채팅 정리용)
+
+        Returns:
+            제거한 문서 수
+        """
+        removed = 0
+        with self._lock:
+            refs = self._refs.get(kind)
+            while refs:
+                oldest = next(iter(refs))
+                if oldest >= below:
+                    break
+                self._remove(kind, oldest)
+                removed += 1
+        return removed
+
+    def clear(self, kind: Optional[str] = None) -> int:
+        """kind 문서(없으면 전체) 삭제 후 삭제한 문서 수 반환"""
+        with self._lock:
+            if kind is None:
+                deleted = len(self._docs)
+                self._postings.clear()
+                self._char_terms.clear()
+                self._docs.clear()
+                self._refs.clear()
+                return deleted
+            refs = list(self._refs.get(kind, ()))
+            for ref in refs:
+                self._remove(kind, ref)
+            return len(refs)
+
+    def _candidates(self, word: str) -> Set[int]:
+        """단어의 n-gram을 모두 가진 문서 번호 (n-gram보다 짧은 단어는 그 글자를 포함한 색인 단위 전체)"""
+        if len(word) < NGRAM:
+            found: Set[int] = set()
+            for term in self._char_terms.get(word, ()):
+                found |= self._postings[term]
+            return found
+        # 게시 목록이 짧은 것부터 교집합
+        lists = sorted((self._postings.get(term, set()) for term in _grams(word)), key=len)
+        found = set(lists[0])
+        for postings in lists[1:]:
+            found &= postings
+            if not found:
+                break
+        return found
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        limit: Optional[int] = None,
+        before: Optional[int] = None,
+    ) -> List[Tuple[int, str, Any]]:
+        """
+        검색어의 모든 단어를 포함한 문서를 최신순으로 조회
+
+        Args:
+            query: 검색어 (공백으로 나뉜 단어를 모두 포함해야 일치)
+            kind: 지정 시 해당 종류 문서만
+            limit: 최대 문서 수 (없으면 전체)
+            before: 이 문서 번호보다 먼저 추가된 문서만 (이전 페이지 마지막 문서 번호)
+
+        Returns:
+            (문서 번호, kind, ref) 목록 (최신순)
+        """
+        words = sorted(query_text(query).split(), key=len, reverse=True)
+        if not words:
+            return []
+        with self._lock:
+            found = self._candidates(words[0])
+            for word in words[1:]:
+                if not found:
+                    break
+                found &= self._candidates(word)
+            # 전체 후보를 정렬하지 않고 before 이전 문서만 힙에서 최신순으로 limit개까지 꺼냄
+            newest = [-doc_id for doc_id in found if before is None or doc_id < before]
+            heapq.heapify(newest)
+            hits: List[Tuple[int, str, Any]] = []
+            while newest and (limit is None or len(hits) < limit):
+                doc_id = -heapq.heappop(newest)
+                doc_kind, ref, text, _ = self._docs[doc_id]
+                # n-gram은 순서를 보지 않으므로 원문에 단어가 그대로 있는지 확인
+                if (kind is None or doc_kind == kind) and all(word in text for word in words):
+                    hits.append((doc_id, doc_kind, ref))
+            return hits
+
+    @staticmethod
+    def matches(query: str, text: str) -> bool:
+        """텍스트가 검색어의 모든 단어를 포함하는지 (응답에 일치한 부분을 고를 때 사용)"""
+        normalized = query_text(text)
+        return all(word in normalized for word in query_text(query).split())
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+# 전역 기록 인덱스 (검색 결과 저장소/채팅 히스토리에 추가될 때 함께 갱신)
+history_index = HistoryIndex()
@@ -0,0 +1,209 @@
+"""
+인기 검색어(핫 쿼리) 사전 계산 인덱스
+검색어 빈도를 시간 감쇠 점수로 집계하고, 백그라운드 스케줄러가 상위 K개 검색어의
+웹 검색 결과를 만료 전에 미리 갱신해 두어 인기 검색어는 요청 경로에서 외부 검색을 호출하지 않는다
+(프로세스별 인메모리 상태 - 워커마다 따로 집계/갱신)
+"""
+
+import asyncio
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.normalization import canonical_query
+
+# 빈도 점수 반감기 (초) - 오래된 요청일수록 점수에 덜 반영
+DEFAULT_HALF_LIFE = 60 * 60
+
+# 추적하는 최대 검색어 수 (초과 시 점수가 낮은 절반을 버림)
+MAX_TRACKED_QUERIES = 10000
+
+
+def hot_query_key(query: str) -> str:
+    """핫 쿼리 키 (검색어 표준 형태 - 갱신 시 이 키로 다시 검색하므로 대소문자는 유지)"""
+    return canonical_query(query)
+
+
+class QueryFrequencyTracker:
+    """시간 감쇠 검색어 빈도 집계"""
+
+    def __init__(
+        self,
+        half_life: float = DEFAULT_HALF_LIFE,
+        max_queries: int = MAX_TRACKED_QUERIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.half_life = half_life
+        self.max_queries = max_queries
+        self._clock = clock
+        # 키 -> (점수, 마지막 갱신 시각)
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def record(self, query: str, weight: float = 1.0):
+        """검색어 요청 기록"""
+        key = hot_query_key(query)
+        if not key:
+            return
+        now = self._clock()
+        with self._lock:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated_at, now) + weight, now)
+            if len(self._scores) > self.max_queries:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        ranked = sorted(self._scores, key=lambda key: self._decayed(*self._scores[key], now), reverse=True)
+        for key in ranked[self.max_queries // 2:]:
+            del self._scores[key]
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """현재 점수 기준 상위 k개 (키, 점수)"""
+        now = self._clock()
+        with self._lock:
+            scored = [(key, self._decayed(score, updated_at, now)) for key, (score, updated_at) in self._scores.items()]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class HotQueryIndex:
+    """사전 계산된 핫 쿼리 검색 결과 (만료 시각 포함)"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # 키 -> (검색 결과, 만료 시각)
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[str]:
+        """만료되지 않은 결과 반환 (없으면 None)"""
+        entry = self._entries.get(hot_query_key(query))
+        if entry is None or entry[1] <= self._clock():
+            return None
+        return entry[0]
+
+    def put(self, query: str, result: str, ttl: float):
+        with self._lock:
+            self._entries[hot_query_key(query)] = (result, self._clock() + ttl)
+
+    def needs_refresh(self, query: str, refresh_ahead: float) -> bool:
+        """결과가 없거나 refresh_ahead초 안에 만료되면 True"""
+        entry = self._entries.get(hot_query_key(query))
+        return entry is None or entry[1] - self._clock() <= refresh_ahead
+
+    def retain(self, keys: Iterable[str]) -> int:
+        """주어진 키 외의 결과 삭제 (더 이상 인기 검색어가 아닌 항목)"""
+        keep = set(keys)
+        with self._lock:
+            removed = [key for key in self._entries if key not in keep]
+            for key in removed:
+                del self._entries[key]
+        return len(removed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HotQueryScheduler:
+    """
+    핫 쿼리 인덱스 주기적 갱신 스케줄러 (lifespan에서 시작/종료)
+
+    interval초마다 점수가 min_hits 이상인 상위 top_k 검색어를 골라,
+    결과가 없거나 다음 갱신 전에 만료될 항목만 제한된 동시성으로 다시 검색한다.
+    """
+
+    def __init__(
+        self,
+        tracker: QueryFrequencyTracker,
+        index: HotQueryIndex,
+        fetch: Callable[[str], str],
+        top_k: int = 20,
+        interval: float = 60.0,
+        ttl: float = 600.0,
+        min_hits: float = 3.0,
+        max_concurrency: int = 2,
+    ):
+        self.tracker = tracker
+        self.index = index
+        self.fetch = fetch
+        self.top_k = top_k
+        self.interval = interval
+        self.ttl = ttl
+        self.min_hits = min_hits
+        self.max_concurrency = max_concurrency
+        self._task: Optional[asyncio.Task] = None
+
+    def hot_queries(self) -> List[str]:
+        """현재 인기 검색어 키 목록"""
+        return [key for key, score in self.tracker.top(self.top_k) if score >= self.min_hits]
+
+    async def refresh_once(self) -> int:
+        """
+        인기 검색어 결과를 한 번 갱신
+
+        Returns:
+            새로 갱신된 검색어 수
+        """
+        hot = self.hot_queries()
+        self.index.retain(hot)
+        # 다음 갱신 주기 전에 만료될 항목까지 미리 갱신
+        due = [key for key in hot if self.index.needs_refresh(key, self.interval * 2)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def refresh(key: str) -> bool:
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(self.fetch, key)
+                except Exception as e:
+                    print(f"핫 쿼리 갱신 실패 ({key}): {e}")
+                    return False
+            self.index.put(key, result, self.ttl)
+            return True
+
+        refreshed = await asyncio.gather(*(refresh(key) for key in due))
+        return sum(refreshed)
+
+    async def _run(self):
+        # 시작 직후에는 집계된 트래픽이 없으므로 한 주기 뒤부터 갱신
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                print(f"핫 쿼리 스케줄러 오류: {e}")
+
+    def start(self):
+        """현재 이벤트 루프에서 주기적 갱신 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """주기적 갱신 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 전역 빈도 집계/인덱스 (Agent 검색, 상품 검색 API가 공유)
+hot_query_tracker = QueryFrequencyTracker()
+hot_query_index = HotQueryIndex()
@@ -0,0 +1,158 @@
+"""
+검색어 정규화
+전각 문자, 띄어쓰기 변형("갤럭시S24"/"갤럭시 S24"), 금액/용량 단위 동의어("50만원"/"500,000원",
+"256기가"/"256GB"), 상품 별칭을 하나의 형태로 맞춰 캐시/단일 실행(single-flight)/중복 제거 키의
+적중률을 높인다. 패턴은 모듈 import 시 한 번만 컴파일한다.
+"""
+
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+from app.services.taxonomy import taxonomy
+
+# 폭 없는 문자 (복사/붙여넣기로 섞여 들어옴)
+_ZERO_WIDTH = re.compile("[\\u200b\\u200c\\u200d\\u2060\\ufeff]")
+_WHITESPACE = re.compile(r"\s+")
+
+# 한글-영문, 영문-한글, 한글-숫자 경계 ("갤럭시S24", "Z플립", "아이폰15") - 숫자-한글("50만원")은 붙여 둠
+_HANGUL_LATIN = re.compile(r"(?<=[가-힣])(?=[A-Za-z])|(?<=[A-Za-z])(?=[가-힣])|(?<=[가-힣])(?=\d)")
+
+# 한글 단어 사이 공백 ("무선 이어폰" / "무선이어폰" - 키에서는 붙여 씀)
+_HANGUL_SPACE = re.compile(r"(?<=[가-힣]) (?=[가-힣])")
+
+# 금액 숫자: "1,250,000", "1250000", "1.5" (천 단위 구분은 쉼표만 - "1.250.000", "v1.2.3"은 금액이 아님)
+PRICE_NUMBER = r"(?<![\d.,])(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)(?![.,]?\d)"
+
+# 금액 조각: "1,250,000", "125만", "5천만", "1.5억"
+_PRICE_PART = re.compile(PRICE_NUMBER + r"\s*(억|천만|백만|만|천)?")
+_PRICE_UNITS = {"억": 100000000, "천만": 10000000, "백만": 1000000, "만": 10000, "천": 1000}
+
+# 가격 범위 구분자: "10만~20만원", "10만원 - 20만원", "10만원부터 20만원까지"
+_RANGE_SEPARATOR = re.compile(r"\s*(?:~|∼|–|-|부터)\s*")
+
+# 금액: "50만원", "50 만", "₩500,000", "1.5억원" -> 원 단위 정수 (단위나 원 표기가 있을 때만)
+_MONEY = re.compile(
+    r"₩\s*" + PRICE_NUMBER
+    + r"|" + PRICE_NUMBER + r"\s*(?:(억|만|천)(?:\s*원)?|원)(?!(?!이하|이상|미만|초과|대|짜리|까지|부터|정도|안팎)[가-힣])"
+)
+
+# 용량/크기 단위 동의어
+_UNIT_SYNONYMS = [
+    (re.compile(r"(\d+(?:\.\d+)?)\s*(?:기가바이트|기가|gb|GB|Gb)(?![A-Za-z])"), r"\1GB"),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*(?:테라바이트|테라|tb|TB|Tb)(?![A-Za-z])"), r"\1TB"),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*(?:인치|inch|in|\")(?![A-Za-z])"), r"\1인치"),
+]
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 호환 정규화(전각 -> 반각), 폭 없는 문자 제거, 공백 정리"""
+    if not text:
+        return ""
+    text = _ZERO_WIDTH.sub("", unicodedata.normalize("NFKC", text))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def parse_price(text: Optional[str]) -> Optional[int]:
+    """
+    가격 문자열을 원 단위 정수로 변환합니다.
+
+    "1,250,000원", "₩1,250,000", "125만원", "125만 5천원", "1.5억" 형식을 지원하며
+    큰 단위에서 작은 단위로 이어지는 조각을 하나의 금액으로 합칩니다.
+    검색어 금액 정규화, 검색 결과 가격 추출, 가격 표시 유틸리티가 같은 파서를 사용합니다.
+
+    Returns:
+        원 단위 정수 (금액이 없으면 None)
+    """
+    if not text:
+        return None
+    text = normalize_text(text)
+    total = None
+    last_unit = None
+    position = None
+    for match in _PRICE_PART.finditer(text):
+        if position is not None and text[position:match.start()].strip():
+            break
+        number, unit = match.groups()
+        multiplier = _PRICE_UNITS.get(unit, 1)
+        if last_unit is not None and multiplier >= last_unit:
+            break
+        total = (total or 0) + float(number.replace(",", "")) * multiplier
+        last_unit = multiplier
+        position = match.end()
+        if multiplier == 1:
+            break
+    return None if total is None else int(round(total))
+
+
+def parse_prices(texts: Iterable[Optional[str]]) -> List[Optional[int]]:
+    """가격 문자열 목록을 한 번에 원 단위 정수로 변환합니다. (변환할 수 없으면 None)"""
+    return [parse_price(text) for text in texts]
+
+
+def parse_price_range(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    가격 범위 문자열을 (최저, 최고)로 변환합니다.
+
+    "10만~20만원"처럼 앞쪽 단위가 생략되면 뒤쪽 단위를 따르며,
+    구분자가 없으면 같은 가격을 최저/최고로 반환합니다.
+    """
+    if not text:
+        return None, None
+    parts = _RANGE_SEPARATOR.split(normalize_text(text).replace("까지", ""), maxsplit=1)
+    if len(parts) == 1:
+        price = parse_price(parts[0])
+        return price, price
+    low_text, high_text = (part.strip() for part in parts)
+    low, high = parse_price(low_text), parse_price(high_text)
+    high_part = _PRICE_PART.match(high_text)
+    if low is not None and high is not None and low_text.isdigit() and high_part and high_part.group(2):
+        # "10~20만원" -> 단위가 생략된 앞쪽 숫자에 뒤쪽 단위 적용
+        scaled = low * _PRICE_UNITS[high_part.group(2)]
+        if scaled <= high:
+            low = scaled
+    return low, high
+
+
+def _money(match: re.Match) -> str:
+    amount = parse_price(match.group(0))
+    return match.group(0) if amount is None else f"{amount}원"
+
+
+def normalize_query(query: str) -> str:
+    """
+    검색어 정규화 (검색에 그대로 쓸 수 있는 형태)
+
+    Args:
+        query: 사용자 검색어
+
+    Returns:
+        띄어쓰기/단위를 표준화한 검색어 (대소문자는 유지)
+    """
+    text = normalize_text(query)
+    text = _HANGUL_LATIN.sub(" ", text)
+    for pattern, replacement in _UNIT_SYNONYMS:
+        text = pattern.sub(replacement, text)
+    text = _MONEY.sub(_money, text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def canonical_query(query: str) -> str:
+    """정규화한 검색어의 상품 별칭을 표준 이름으로 바꾼 형태 (그대로 다시 검색할 수 있음)"""
+    return taxonomy.canonicalize(normalize_query(query))
+
+
+def query_text(query: str) -> str:
+    """단어 단위 검색/표시용 정규화 텍스트 (표준 형태를 소문자로, 띄어쓰기는 유지)"""
+    return canonical_query(query).lower()
+
+
+def query_key(query: str) -> str:
+    """
+    캐시/중복 제거용 검색어 키
+
+    표준 형태를 소문자로 맞추고, 한글 합성어의 띄어쓰기 차이가 없도록 한글 단어 사이 공백을 없앤다
+    ("Galaxy S24 Ultra", "갤럭시S24 울트라", "ｇａｌａｘｙ ｓ２４ ｕｌｔｒａ"는 같은 키,
+    "무선 이어폰"/"무선이어폰", "에어팟프로2"/"airpods pro 2"도 같은 키).
+    """
+    return _HANGUL_SPACE.sub("", query_text(query))
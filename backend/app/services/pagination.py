@@ -0,0 +1,83 @@
+"""
+커서 기반 페이지네이션 유틸리티
+이미 정렬된 저장소에서 limit/cursor로 고정 크기의 페이지를 잘라낸다
+"""
+
+import base64
+import binascii
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# 페이지 크기 기본값 및 상한
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+_CURSOR_PREFIX = "p:"
+
+
+def encode_cursor(position: int) -> str:
+    """저장소 내 위치를 불투명한 커서 문자열로 인코딩"""
+    raw = f"{_CURSOR_PREFIX}{position}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    커서 문자열을 저장소 내 위치로 디코딩
+
+    Raises:
+        ValueError: 커서 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+    if not raw.startswith(_CURSOR_PREFIX):
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+    try:
+        position = int(raw[len(_CURSOR_PREFIX):])
+    except ValueError as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+    if position < 0:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+    return position
+
+
+def paginate(
+    items: Sequence[T],
+    limit: int,
+    cursor: Optional[str] = None,
+    newest_first: bool = False,
+) -> Tuple[List[T], Optional[str]]:
+    """
+    정렬된 시퀀스에서 한 페이지를 잘라 반환
+
+    Args:
+        items: 이미 원하는 순서(또는 추가 순서)로 정렬된 시퀀스
+        limit: 페이지 크기
+        cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+        newest_first: True면 시퀀스 끝(가장 최근 항목)부터 역순으로 페이지를 만든다.
+            이때 커서는 절대 위치를 가리키므로 중간에 항목이 추가되어도 페이지가 밀리지 않는다.
+
+    Returns:
+        (페이지 항목 리스트, 다음 페이지 커서 또는 None)
+    """
+    total = len(items)
+
+    if newest_first:
+        end = total if cursor is None else min(decode_cursor(cursor), total)
+        start = max(0, end - limit)
+        page = [items[i] for i in range(end - 1, start - 1, -1)]
+        next_cursor = encode_cursor(start) if start > 0 else None
+        return page, next_cursor
+
+    start = 0 if cursor is None else decode_cursor(cursor)
+    end = min(start + limit, total)
+    page = list(items[start:end])
+    next_cursor = encode_cursor(end) if end < total else None
+    return page, next_cursor
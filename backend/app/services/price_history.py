@@ -0,0 +1,410 @@
+"""
+상품 가격 이력 시계열 저장소
+검색할 때마다 관측한 상품 가격을 상품 키별 append 전용 배열(array('d'))에 시간순으로 쌓고,
+구간 조회 시 이진 탐색 + 버킷 다운샘플링으로 최저/평균/최고가 추이를 계산한다.
+경로를 지정하면 관측값을 고정 길이 레코드 로그 파일에 이어 쓰고, 시작 시 mmap으로 읽어 복원한다.
+상품 수는 최근 관측 순(LRU)으로 제한하며, 복원할 때 남은 시계열만 다시 써서 로그를 압축한다.
+여러 워커 프로세스가 같은 경로를 쓰는 경우를 위해 로그 쓰기/압축은 디렉터리 파일 잠금(fcntl.flock) 안에서 하고,
+상품 번호는 공유 키 파일의 줄 번호로 매긴다 (쓰기 전에 다른 워커가 추가한 키와 압축으로 교체된 파일을 반영).
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.normalization import query_text
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # fcntl이 없는 플랫폼(Windows)에서는 워커 간 잠금 없이 기록 (단일 워커로 실행)
+    fcntl = None
+
+# 상품별로 유지하는 최대 관측 수 (초과 시 오래된 관측부터 삭제)
+MAX_POINTS_PER_PRODUCT = 10000
+
+# 유지하는 최대 상품 수 (초과 시 가장 오래 관측되지 않은 상품부터 삭제)
+MAX_SERIES = 10000
+
+# 구간 조회 최대 버킷 수
+MAX_BUCKETS = 500
+
+# 로그 레코드: (상품 번호 uint32, 관측 시각 float64, 가격 float64)
+_RECORD = struct.Struct("<Idd")
+
+_LOG_FILE = "prices.bin"
+_KEYS_FILE = "keys.jsonl"
+_LOCK_FILE = "prices.lock"
+
+# 압축 중 쓰는 임시 파일 접미사
+_COMPACT_SUFFIX = ".compact"
+
+
+def product_key(name: str) -> str:
+    """상품 키 (검색어 정규화 후 공백을 '-'로 - URL 경로에 그대로 사용)"""
+    return "-".join(token for token in query_text(name).split() if token.strip("-"))
+
+
+class PriceSeries:
+    """한 상품의 시간순 가격 관측 (시각/가격 병렬 배열)"""
+
+    __slots__ = ("name", "timestamps", "prices")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.timestamps = array("d")
+        self.prices = array("d")
+
+    def append(self, timestamp: float, price: float, max_points: int):
+        # 시계가 뒤로 가도 시간순을 유지 (이진 탐색 전제)
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            timestamp = self.timestamps[-1]
+        self.timestamps.append(timestamp)
+        self.prices.append(price)
+        if len(self.prices) > max_points:
+            # 한 번에 10%씩 잘라 삭제 비용을 분할 상환
+            drop = max(1, max_points // 10)
+            del self.timestamps[:drop]
+            del self.prices[:drop]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class PriceHistoryStore:
+    """상품 키별 가격 시계열 저장소 (스레드 안전)"""
+
+    def __init__(
+        self,
+        max_points: int = MAX_POINTS_PER_PRODUCT,
+        clock: Callable[[], float] = time.time,
+        max_series: int = MAX_SERIES,
+    ):
+        self.max_points = max_points
+        self.max_series = max_series
+        self._clock = clock
+        # 최근 관측한 상품이 뒤쪽 (LRU 순서)
+        self._series: "OrderedDict[str, PriceSeries]" = OrderedDict()
+        # 로그 파일의 상품 번호 (키 -> 번호, 번호 -> 키) - 키 파일의 줄 번호이며 다른 워커가 추가한 키도 포함
+        self._key_ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        # 키 파일에서 읽은 바이트 수 (다른 워커가 이어 쓴 줄만 읽기 위함)
+        self._keys_offset = 0
+        self._directory: Optional[str] = None
+        self._log: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    def open(self, directory: str) -> int:
+        """
+        디스크 로그를 읽어 복원하고 이후 관측을 이어 쓰기 시작
+
+        복원 후 상품 수 제한을 적용하고, 남은 시계열만 새 로그로 다시 써서
+        삭제된 상품/잘려 나간 관측이 로그에 계속 쌓이지 않게 한다.
+        여러 워커 프로세스가 같은 디렉터리를 열어도 되도록 파일 작업은 디렉터리 잠금 안에서 한다.
+
+        Args:
+            directory: 로그 파일을 둘 디렉터리 (없으면 생성)
+
+        Returns:
+            복원한 관측 수
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._close_log()
+            self._directory = directory
+            with self._file_lock():
+                self._reload()
+            return sum(len(series) for series in self._series.values())
+
+    def _path(self, filename: str) -> str:
+        if self._directory is None:
+            raise RuntimeError("가격 이력 로그가 열려 있지 않습니다")
+        return os.path.join(self._directory, filename)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """로그 디렉터리 잠금 (같은 경로를 쓰는 워커 프로세스 간 배타 잠금 - 별도 .lock 파일 사용)"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._path(_LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _reload(self):
+        """디스크의 키/로그 전체를 다시 읽고 압축 (모든 워커의 관측을 합치므로 압축해도 유실 없음)"""
+        self._close_log()
+        self._series.clear()
+        self._key_ids.clear()
+        self._keys.clear()
+        self._keys_offset = 0
+        self._finish_compaction()
+        self._read_keys(create_series=True)
+        self._load_log(self._path(_LOG_FILE))
+        self._evict()
+        self._compact()
+        self._log = open(self._path(_LOG_FILE), "ab")
+
+    def _read_keys(self, create_series: bool = False):
+        """키 파일에서 아직 읽지 않은 줄의 상품 번호 등록 (다른 워커가 추가한 키 포함, 끝의 잘린 줄은 다음에 읽음)"""
+        keys_path = self._path(_KEYS_FILE)
+        if not os.path.exists(keys_path):
+            return
+        with open(keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        self._keys_offset += complete
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            key = entry["key"]
+            # 삭제 후 다시 관측된 상품은 새 번호로 한 번 더 기록되므로 같은 시계열에 연결
+            self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+            if create_series and key not in self._series:
+                self._series[key] = PriceSeries(entry["name"])
+
+    def _sync(self) -> BinaryIO:
+        """
+        다른 워커가 쓴 내용 반영 후 로그 파일 반환 (디렉터리 잠금 안에서 호출)
+
+        다른 워커가 로그를 압축/초기화해 파일이 교체되었으면 새 파일을 열고 상품 번호를 처음부터 다시 읽는다.
+        """
+        self._finish_compaction()
+        log_path = self._path(_LOG_FILE)
+        log = self._log
+        if log is None or os.fstat(log.fileno()).st_ino != os.stat(log_path).st_ino:
+            self._close_log()
+            log = self._log = open(log_path, "ab")
+            self._key_ids.clear()
+            self._keys.clear()
+            self._keys_offset = 0
+        self._read_keys()
+        return log
+
+    def _finish_compaction(self):
+        """중단된 압축 정리 - 키 파일 교체 전이면 임시 파일 삭제, 교체 후면 로그도 마저 교체"""
+        keys_tmp = self._path(_KEYS_FILE + _COMPACT_SUFFIX)
+        log_tmp = self._path(_LOG_FILE + _COMPACT_SUFFIX)
+        if os.path.exists(keys_tmp):
+            os.remove(keys_tmp)
+            if os.path.exists(log_tmp):
+                os.remove(log_tmp)
+        elif os.path.exists(log_tmp):
+            os.replace(log_tmp, self._path(_LOG_FILE))
+
+    def _compact(self):
+        """
+        남은 시계열만 새 상품 번호로 다시 써서 로그 교체 (디렉터리 잠금 안에서 호출)
+
+        키 임시 파일 -> 로그 임시 파일 순서로 쓰고 키 파일 -> 로그 파일 순서로 교체하므로
+        어느 단계에서 중단되어도 다음 open의 _finish_compaction이 일관된 상태로 맞춘다.
+        """
+        self._keys = list(self._series)
+        self._key_ids = {key: key_id for key_id, key in enumerate(self._keys)}
+        keys_tmp = self._path(_KEYS_FILE + _COMPACT_SUFFIX)
+        log_tmp = self._path(_LOG_FILE + _COMPACT_SUFFIX)
+        with open(keys_tmp, "w", encoding="utf-8") as f:
+            for key, series in self._series.items():
+                f.write(json.dumps({"key": key, "name": series.name}, ensure_ascii=False) + "\n")
+        with open(log_tmp, "wb") as f:
+            for key_id, series in enumerate(self._series.values()):
+                f.write(b"".join(
+                    _RECORD.pack(key_id, timestamp, price)
+                    for timestamp, price in zip(series.timestamps, series.prices)
+                ))
+        self._keys_offset = os.path.getsize(keys_tmp)
+        os.replace(keys_tmp, self._path(_KEYS_FILE))
+        os.replace(log_tmp, self._path(_LOG_FILE))
+
+    def _load_log(self, path: str):
+        if not os.path.exists(path) or os.path.getsize(path) < _RECORD.size:
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # 비정상 종료로 잘린 마지막 레코드는 무시
+            usable = len(mapped) - len(mapped) % _RECORD.size
+            for key_id, timestamp, price in _RECORD.iter_unpack(memoryview(mapped)[:usable]):
+                if key_id < len(self._keys):
+                    key = self._keys[key_id]
+                    self._series[key].append(timestamp, price, self.max_points)
+                    self._series.move_to_end(key)
+
+    def _write(self, observed: List[Tuple[str, float]], timestamp: float):
+        """관측을 로그에 이어 쓰기 (디렉터리 잠금 안에서 호출 - 상품 번호는 공유 키 파일의 줄 번호)"""
+        log = self._sync()
+        new_keys = []
+        for key, _ in observed:
+            if key not in self._key_ids:
+                self._key_ids[key] = len(self._keys)
+                self._keys.append(key)
+                new_keys.append(key)
+        # 키 목록을 먼저 써야 복원 시 로그 레코드의 상품 번호를 해석할 수 있다
+        if new_keys:
+            lines = "".join(
+                json.dumps({"key": key, "name": self._series[key].name}, ensure_ascii=False) + "\n"
+                for key in new_keys
+            ).encode("utf-8")
+            with open(self._path(_KEYS_FILE), "ab") as f:
+                f.write(lines)
+            self._keys_offset += len(lines)
+        log.write(b"".join(_RECORD.pack(self._key_ids[key], timestamp, price) for key, price in observed))
+        log.flush()
+
+    def _evict(self):
+        """상품 수 제한 초과 시 가장 오래 관측되지 않은 상품부터 삭제 (로그에서는 다음 압축 때 제거)"""
+        while len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+
+    def _maybe_compact(self):
+        """로그의 상품 번호 중 이 워커가 유지하지 않는 번호가 남은 상품 수보다 많아지면 다시 읽고 압축"""
+        if self._log is None or len(self._keys) - len(self._series) <= len(self._series):
+            return
+        with self._file_lock():
+            self._reload()
+
+    def record_many(self, observations: Iterable[Tuple[str, float]], timestamp: Optional[float] = None) -> int:
+        """
+        검색 결과의 (상품명, 가격) 관측을 한 번에 기록
+
+        Returns:
+            기록된 관측 수 (가격이 없거나 0 이하인 항목은 건너뜀)
+        """
+        timestamp = self._clock() if timestamp is None else timestamp
+        observed: List[Tuple[str, float]] = []
+        with self._lock:
+            for name, price in observations:
+                key = product_key(name)
+                if not key or price is None or price <= 0:
+                    continue
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = PriceSeries(name)
+                else:
+                    self._series.move_to_end(key)
+                series.append(timestamp, float(price), self.max_points)
+                observed.append((key, float(price)))
+
+            if self._log is not None and observed:
+                with self._file_lock():
+                    self._write(observed, timestamp)
+            self._evict()
+            self._maybe_compact()
+        return len(observed)
+
+    def record(self, name: str, price: float, timestamp: Optional[float] = None) -> bool:
+        return self.record_many([(name, price)], timestamp) == 1
+
+    def get(self, key: str) -> Optional[PriceSeries]:
+        """상품 키(또는 상품명)로 시계열 조회"""
+        return self._series.get(product_key(key))
+
+    def query(
+        self,
+        key: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        buckets: int = 50,
+    ) -> Optional[Dict]:
+        """
+        구간 가격 이력을 버킷 단위로 다운샘플링해 조회
+
+        Args:
+            key: 상품 키 또는 상품명
+            start, end: 조회 구간 (Unix 초, 없으면 처음/끝까지)
+            buckets: 최대 버킷 수 (구간을 같은 시간 폭으로 나눔, 빈 버킷은 생략)
+
+        Returns:
+            {"name", "points": [{"timestamp", "min", "max", "avg", "last", "count"}],
+             "min_price", "max_price", "avg_price", "latest_price", "count"} (상품이 없으면 None)
+        """
+        buckets = max(1, min(buckets, MAX_BUCKETS))
+        with self._lock:
+            series = self.get(key)
+            if series is None:
+                return None
+            timestamps, prices = series.timestamps, series.prices
+            lo = 0 if start is None else bisect_left(timestamps, start)
+            hi = len(timestamps) if end is None else bisect_right(timestamps, end)
+            # 잠금 밖에서 계산하도록 구간만 복사 (array 슬라이스는 연속 메모리 복사)
+            times = timestamps[lo:hi]
+            values = prices[lo:hi]
+            name = series.name
+
+        points: List[Dict[str, float]] = []
+        summary: Dict[str, Any] = {"name": name, "points": points, "min_price": None, "max_price": None,
+                                   "avg_price": None, "latest_price": None, "count": len(values)}
+        if not values:
+            return summary
+
+        summary.update(
+            min_price=min(values),
+            max_price=max(values),
+            avg_price=sum(values) / len(values),
+            latest_price=values[-1],
+        )
+        first = times[0]
+        width = (times[-1] - first) / buckets or 1.0
+
+        def bucket_of(timestamp: float) -> int:
+            return min(int((timestamp - first) / width), buckets - 1)
+
+        bucket_start = 0
+        for index in range(1, len(values) + 1):
+            # 다음 관측이 다른 버킷이면 현재 버킷을 마감
+            if index < len(values) and bucket_of(times[index]) == bucket_of(times[bucket_start]):
+                continue
+            chunk = values[bucket_start:index]
+            points.append({
+                "timestamp": times[bucket_start],
+                "min": min(chunk),
+                "max": max(chunk),
+                "avg": sum(chunk) / len(chunk),
+                "last": chunk[-1],
+                "count": len(chunk),
+            })
+            bucket_start = index
+        return summary
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def close(self):
+        """로그 파일 닫기 (메모리의 시계열은 유지)"""
+        with self._lock:
+            self._close_log()
+            self._directory = None
+
+    def clear(self):
+        """모든 이력 삭제 (디스크 로그를 쓰는 중이면 빈 로그 파일로 교체 - 다른 워커도 교체를 감지해 번호를 다시 읽음)"""
+        with self._lock:
+            self._series.clear()
+            self._key_ids.clear()
+            self._keys.clear()
+            if self._log is not None:
+                with self._file_lock():
+                    self._close_log()
+                    self._compact()
+                    self._log = open(self._path(_LOG_FILE), "ab")
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+# 전역 가격 이력 저장소 (상품 검색 API, Agent 검색이 공유 - 경로 설정 시 lifespan에서 open)
+price_history = PriceHistoryStore()
@@ -0,0 +1,140 @@
+"""
+저장용 압축 상품 레코드
+검색 결과 저장소에 쌓이는 상품을 Pydantic 모델 대신 __slots__ 레코드로 보관한다.
+- 상품 ID(UUID 문자열 36자)는 16바이트로 저장
+- 판매자/배송 정보처럼 반복되는 문자열은 intern해 한 객체를 공유
+- URL에 상품 ID가 들어 있으면 ID 자리를 비운 템플릿을 intern해 공유하고 조회 시 다시 채움
+API 응답으로 나갈 때만 ProductInfo로 변환한다 (app.api.search).
+"""
+
+import sys
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+# ProductInfo 필드 순서
+PRODUCT_FIELDS = (
+    "product_id", "name", "price", "original_price", "discount_rate", "rating",
+    "review_count", "seller", "url", "image_url", "shipping_info",
+)
+
+# URL 템플릿에서 상품 ID 자리 표시 (URL에 들어갈 수 없는 문자)
+_ID_SLOT = "\x00"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class ProductRecord:
+    """압축 상품 레코드 (속성 이름은 ProductInfo와 동일)"""
+
+    __slots__ = (
+        "_id", "name", "price", "original_price", "discount_rate", "rating",
+        "review_count", "seller", "_url", "_image_url", "shipping_info",
+    )
+
+    def __init__(
+        self,
+        product_id: str,
+        name: str,
+        price: float,
+        original_price: Optional[float] = None,
+        discount_rate: Optional[float] = None,
+        rating: Optional[float] = None,
+        review_count: Optional[int] = None,
+        seller: str = "",
+        url: str = "",
+        image_url: Optional[str] = None,
+        shipping_info: Optional[str] = None,
+    ):
+        self._id = self._pack_id(product_id)
+        self.name = name
+        self.price = price
+        self.original_price = original_price
+        self.discount_rate = discount_rate
+        self.rating = rating
+        self.review_count = review_count
+        self.seller = _intern(seller)
+        self._url = self._template(url, product_id)
+        self._image_url = self._template(image_url, product_id)
+        self.shipping_info = _intern(shipping_info)
+
+    @staticmethod
+    def _pack_id(product_id: str) -> Union[bytes, str]:
+        """표준 형식 UUID는 16바이트로, 그 외 ID는 문자열 그대로"""
+        try:
+            packed = uuid.UUID(product_id)
+        except (ValueError, TypeError, AttributeError):
+            return product_id
+        return packed.bytes if str(packed) == product_id else product_id
+
+    @staticmethod
+    def _template(url: Optional[str], product_id: str) -> Optional[str]:
+        if url is None:
+            return None
+        if product_id and product_id in url:
+            return sys.intern(url.replace(product_id, _ID_SLOT))
+        return url
+
+    @property
+    def product_id(self) -> str:
+        return str(uuid.UUID(bytes=self._id)) if isinstance(self._id, bytes) else self._id
+
+    def _fill(self, template: Optional[str]) -> Optional[str]:
+        if template is None or _ID_SLOT not in template:
+            return template
+        return template.replace(_ID_SLOT, self.product_id)
+
+    @property
+    def url(self) -> str:
+        return self._fill(self._url) or ""
+
+    @property
+    def image_url(self) -> Optional[str]:
+        return self._fill(self._image_url)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ProductInfo 필드 딕셔너리 (API 변환용)"""
+        return {field: getattr(self, field) for field in PRODUCT_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductRecord":
+        """필드 딕셔너리(스냅샷 행 등)에서 변환 (없는 필드는 기본값)"""
+        return cls(**{field: data[field] for field in PRODUCT_FIELDS if field in data})
+
+    @classmethod
+    def from_product(cls, product: Any) -> "ProductRecord":
+        """ProductInfo 등 같은 속성을 가진 객체에서 변환"""
+        if isinstance(product, cls):
+            return product
+        return cls(**{field: getattr(product, field) for field in PRODUCT_FIELDS})
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ProductRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"ProductRecord(product_id={self.product_id!r}, name={self.name!r}, price={self.price!r})"
+
+
+class StoredSearchResult:
+    """검색 결과 저장소 항목 (상품은 ProductRecord 목록)"""
+
+    __slots__ = ("search_id", "query", "products", "total_count", "search_time", "timestamp", "status")
+
+    def __init__(
+        self,
+        search_id: str,
+        query: str,
+        products: List[ProductRecord],
+        search_time: float,
+        timestamp: datetime,
+        status: str = "success",
+    ):
+        self.search_id = search_id
+        self.query = query
+        self.products = products
+        self.total_count = len(products)
+        self.search_time = search_time
+        self.timestamp = timestamp
+        self.status = status
@@ -0,0 +1,231 @@
+"""
+검색 결과 구조화 및 후속 질문 정제
+웹 검색 결과 텍스트를 상품 목록(이름/가격/쇼핑몰/평점)으로 변환하고,
+"그 중에서 50만원 이하인 것만" 같은 후속 질문의 가격/브랜드/정렬 조건을
+이전 결과 목록에 로컬로 적용해 다시 검색하지 않고 응답할 수 있게 한다
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from app.services.normalization import PRICE_NUMBER
+from app.services.taxonomy import taxonomy
+from app.utils import format_price_range, format_prices, parse_price, parse_price_range
+
+# 스레드별로 보관하는 구조화 결과 최대 개수
+MAX_RESULT_ITEMS = 50
+
+# 정제 응답에 보여주는 최대 상품 수
+MAX_REFINED_ITEMS = 5
+
+_UNITS = {"만": 10000, "천": 1000}
+
+# 결과 줄의 가격 / 평점 (금액 숫자 형식과 변환은 공용 가격 파서와 같음)
+_PRICE = re.compile(PRICE_NUMBER + r"\s*(만|천)?\s*원")
+_RATING = re.compile(r"평점\s*(\d(?:\.\d+)?)")
+
+# 가격 범위: "10만~20만원", "10~20만원", "10만원-20만원"
+_PRICE_RANGE = re.compile(
+    PRICE_NUMBER + r"\s*(?:만|천)?\s*원?\s*[~∼–-]\s*" + PRICE_NUMBER + r"\s*(?:(?:만|천)\s*원?|원)"
+)
+
+# 가격 조건: "50만원 이하", "50만 이하", "100만원 이상", "30만원대"
+_PRICE_CONDITION = re.compile(
+    PRICE_NUMBER + r"\s*(만|천)?\s*(원)?\s*(이하|미만|까지|아래|안쪽|이내|이상|초과|넘는|부터|대)"
+)
+_MAX_WORDS = ("이하", "미만", "까지", "아래", "안쪽", "이내")
+
+# 정렬 조건 ("최저가"는 새 검색 의도이므로 정렬로 보지 않음)
+_SORT_ASC = re.compile(r"(싼|저렴한|낮은)\s*(가격\s*)?순|가격\s*(낮은|오름차)\s*순|가격순")
+_SORT_DESC = re.compile(r"(비싼|높은)\s*가격\s*순|비싼\s*순|가격\s*(높은|내림차)\s*순")
+_SORT_RATING = re.compile(r"평점\s*(높은\s*)?순|별점\s*(높은\s*)?순|평점이?\s*높은")
+
+# 이전 결과를 가리키는 후속 질문 표현
+_FOLLOW_UP = re.compile(r"그\s?중|이\s?중|거기서|그 가운데|위에서|방금|그것들?|것만|거만|제품만|브랜드만")
+
+
+def _model_matches(model: str, wanted: str) -> bool:
+    """모델이 요청한 모델/제품 라인에 속하는지 ("아이폰" ⊃ "아이폰 15 프로", "아이폰 1" ⊅ "아이폰 15")"""
+    if not model.startswith(wanted):
+        return False
+    rest = model[len(wanted):]
+    return not rest or not (wanted[-1].isdigit() and rest[0].isdigit())
+
+
+def parse_search_results(text: str) -> List[Dict]:
+    """
+    웹 검색 결과 텍스트를 상품 목록으로 변환
+
+    가격이 있는 줄(또는 문장)만 상품으로 인식하며, 한 줄에 금액이 여러 개면
+    (검색어에 포함된 조건, 정가 → 할인가 등) 마지막 금액을 판매 가격으로 본다.
+    변환할 수 없는 금액은 건너뛴다.
+
+    Args:
+        text: 검색 도구가 반환한 결과 문자열
+
+    Returns:
+        [{"name", "price", "shop", "rating", "text"}, ...] (최대 MAX_RESULT_ITEMS개)
+    """
+    items = []
+    for segment in re.split(r"\n+|(?<=[.!?])\s+(?=\S)", text):
+        segment = segment.strip()
+        price = None
+        for match in reversed(list(_PRICE.finditer(segment))):
+            price = parse_price(match.group(0))
+            if price is not None:
+                break
+        if not price or price <= 0:
+            continue
+
+        name = segment.rsplit(" - ", 1)[0] if " - " in segment else segment[:match.start()]
+        rating = _RATING.search(segment)
+        shops = taxonomy.extract(segment).shops
+        items.append({
+            "name": " ".join(name.split()).strip(" -:|") or segment,
+            "price": price,
+            "shop": shops[0] if shops else None,
+            "rating": float(rating.group(1)) if rating else None,
+            "text": segment,
+        })
+        if len(items) >= MAX_RESULT_ITEMS:
+            break
+    return items
+
+
+class Refinement:
+    """후속 질문의 정제 조건 (가격 범위, 브랜드, 모델, 정렬)"""
+
+    def __init__(
+        self,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        inclusive_max: bool = True,
+        brands: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        models: Optional[List[str]] = None,
+    ):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.inclusive_max = inclusive_max
+        self.brands = brands or []
+        self.sort = sort
+        self.models = models or []
+
+    def matches(self, item: Dict) -> bool:
+        """상품이 조건을 만족하는지 확인"""
+        price = item["price"]
+        if self.min_price is not None and price < self.min_price:
+            return False
+        if self.max_price is not None:
+            if price > self.max_price or (not self.inclusive_max and price == self.max_price):
+                return False
+        if self.brands or self.models:
+            mentions = taxonomy.extract(item["text"])
+            if self.brands and not any(brand in mentions.brands for brand in self.brands):
+                return False
+            if self.models and not any(
+                _model_matches(model, wanted) for model in mentions.models for wanted in self.models
+            ):
+                return False
+        return True
+
+    def apply(self, items: List[Dict]) -> List[Dict]:
+        """조건에 맞는 상품만 남기고 정렬"""
+        refined = [item for item in items if self.matches(item)]
+        if self.sort == "price_asc":
+            refined.sort(key=lambda item: item["price"])
+        elif self.sort == "price_desc":
+            refined.sort(key=lambda item: item["price"], reverse=True)
+        elif self.sort == "rating":
+            refined.sort(key=lambda item: item["rating"] or 0, reverse=True)
+        return refined
+
+    def describe(self) -> str:
+        """조건 설명 (응답 및 재검색 검색어에 사용)"""
+        parts = []
+        if self.models or self.brands:
+            parts.append("/".join(self.models or self.brands))
+        if self.max_price is not None and self.min_price is None and not self.inclusive_max:
+            parts.append(f"{format_prices([self.max_price])[0]} 미만")
+        elif self.min_price is not None or self.max_price is not None:
+            parts.append(format_price_range(self.min_price, self.max_price))
+        if self.sort == "price_asc":
+            parts.append("낮은 가격순")
+        elif self.sort == "price_desc":
+            parts.append("높은 가격순")
+        elif self.sort == "rating":
+            parts.append("평점순")
+        return " ".join(parts)
+
+
+def parse_refinement(query: str) -> Optional[Refinement]:
+    """
+    이전 결과에 적용할 수 있는 후속 정제 질문인지 판단하고 조건 추출
+
+    가격/브랜드 조건은 "그 중", "것만" 같은 이전 결과를 가리키는 표현과 함께 쓰일 때만,
+    정렬 조건은 단독으로도 정제 질문으로 본다.
+
+    Args:
+        query: 사용자 질문
+
+    Returns:
+        정제 조건 (정제 질문이 아니면 None)
+    """
+    text = query.strip()
+    refinement = Refinement()
+
+    price_range = _PRICE_RANGE.search(text)
+    if price_range:
+        # "10만~20만원" -> 10만원 이상 20만원 이하
+        refinement.min_price, refinement.max_price = parse_price_range(price_range.group(0))
+
+    for number, unit, won, word in _PRICE_CONDITION.findall(_PRICE_RANGE.sub(" ", text)):
+        amount = parse_price(number + unit)
+        if not (unit or won) or amount is None:
+            # 단위 없는 숫자 ("2개 이상")는 가격 조건이 아님
+            continue
+        if word == "대":
+            # "30만원대" -> 30만원 이상 40만원 미만
+            step = 10 ** (len(number.split(".")[0].replace(",", "")) - 1) * _UNITS.get(unit, 1)
+            refinement.min_price, refinement.max_price = amount, amount + step
+            refinement.inclusive_max = False
+        elif word in _MAX_WORDS:
+            refinement.max_price = amount
+            refinement.inclusive_max = word != "미만"
+        else:
+            refinement.min_price = amount + (1 if word in ("초과", "넘는") else 0)
+
+    mentions = taxonomy.extract(text)
+    refinement.brands = mentions.brands
+    refinement.models = mentions.models
+
+    if _SORT_RATING.search(text):
+        refinement.sort = "rating"
+    elif _SORT_DESC.search(text):
+        refinement.sort = "price_desc"
+    elif _SORT_ASC.search(text):
+        refinement.sort = "price_asc"
+
+    has_filter = refinement.min_price is not None or refinement.max_price is not None or refinement.brands
+    if has_filter and _FOLLOW_UP.search(text):
+        return refinement
+    if refinement.sort and (not refinement.brands or _FOLLOW_UP.search(text)):
+        return refinement
+    return None
+
+
+def format_refined_answer(base_query: str, refinement: Refinement, items: List[Dict]) -> str:
+    """정제된 상품 목록 응답 생성"""
+    lines = [f"'{base_query}' 검색 결과 중 {refinement.describe()} 조건에 맞는 상품입니다:"]
+    shown = items[:MAX_REFINED_ITEMS]
+    for item, price in zip(shown, format_prices(item["price"] for item in shown)):
+        details = [price]
+        if item["shop"]:
+            details.append(item["shop"])
+        if item["rating"] is not None:
+            details.append(f"평점 {item['rating']:.1f}")
+        lines.append(f"- {item['name']} ({', '.join(details)})")
+    if len(items) > MAX_REFINED_ITEMS:
+        lines.append(f"외 {len(items) - MAX_REFINED_ITEMS}개 상품이 더 있습니다.")
+    lines.append("구체적인 가격과 재고는 각 쇼핑몰에서 확인해주세요.")
+    return "\n".join(lines)
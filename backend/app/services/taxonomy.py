@@ -0,0 +1,211 @@
+"""
+상품 분류 체계 (카테고리/브랜드/제품 라인/쇼핑몰)
+모든 별칭을 하나의 정규식으로 컴파일한 다중 패턴 매처로 텍스트를 한 번만 훑어
+언급된 카테고리, 브랜드, 모델을 추출한다. 메모리 태깅, 후속 질문 판별(라우팅),
+캐시 키 정규화에서 같은 분류 체계를 공유한다 (모듈 import 시 한 번만 컴파일).
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 카테고리 표준 이름 -> 별칭
+CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "스마트폰": ("스마트폰", "휴대폰", "핸드폰", "smartphone"),
+    "노트북": ("노트북", "랩탑", "laptop", "notebook"),
+    "태블릿": ("태블릿", "tablet"),
+    "이어폰": ("이어폰", "이어버드", "earphone", "earbuds"),
+    "헤드폰": ("헤드폰", "헤드셋", "headphone", "headset"),
+    "스마트워치": ("스마트워치", "smartwatch"),
+    "카메라": ("카메라", "미러리스", "dslr", "camera"),
+    "TV": ("tv", "티비", "텔레비전"),
+    "모니터": ("모니터", "monitor"),
+}
+
+# 브랜드 표준 이름 -> 별칭
+BRANDS: Dict[str, Tuple[str, ...]] = {
+    "삼성": ("삼성", "삼성전자", "samsung"),
+    "애플": ("애플", "apple"),
+    "LG": ("lg", "엘지", "lg전자"),
+    "소니": ("소니", "sony"),
+    "샤오미": ("샤오미", "xiaomi"),
+    "레노버": ("레노버", "lenovo"),
+    "에이수스": ("에이수스", "asus"),
+    "보스": ("bose",),
+    "캐논": ("캐논", "canon"),
+    "델": ("dell",),
+}
+
+# 제품 라인 표준 이름 -> (브랜드, 카테고리, 별칭) - 뒤에 붙은 모델 번호까지 모델로 인식
+MODEL_LINES: Dict[str, Tuple[str, Optional[str], Tuple[str, ...]]] = {
+    "갤럭시 S": ("삼성", "스마트폰", ("갤럭시 s", "galaxy s")),
+    "갤럭시 Z 플립": ("삼성", "스마트폰", ("갤럭시 z 플립", "갤럭시 플립", "z 플립", "galaxy z flip")),
+    "갤럭시 Z 폴드": ("삼성", "스마트폰", ("갤럭시 z 폴드", "갤럭시 폴드", "z 폴드", "galaxy z fold")),
+    "갤럭시 A": ("삼성", "스마트폰", ("갤럭시 a", "galaxy a")),
+    "갤럭시 탭": ("삼성", "태블릿", ("갤럭시 탭", "galaxy tab")),
+    "갤럭시 북": ("삼성", "노트북", ("갤럭시 북", "galaxy book")),
+    "갤럭시 버즈": ("삼성", "이어폰", ("갤럭시 버즈", "버즈", "galaxy buds")),
+    "갤럭시 워치": ("삼성", "스마트워치", ("갤럭시 워치", "galaxy watch")),
+    "갤럭시": ("삼성", None, ("갤럭시", "galaxy")),
+    "아이폰": ("애플", "스마트폰", ("아이폰", "iphone")),
+    "아이패드": ("애플", "태블릿", ("아이패드", "ipad")),
+    "맥북 에어": ("애플", "노트북", ("맥북 에어", "macbook air")),
+    "맥북 프로": ("애플", "노트북", ("맥북 프로", "macbook pro")),
+    "맥북": ("애플", "노트북", ("맥북", "macbook")),
+    "에어팟": ("애플", "이어폰", ("에어팟", "airpods")),
+    "애플워치": ("애플", "스마트워치", ("애플 워치", "apple watch")),
+    "LG 그램": ("LG", "노트북", ("lg 그램", "엘지 그램", "lg gram")),
+    "엑스페리아": ("소니", "스마트폰", ("엑스페리아", "xperia")),
+    "WH-1000XM": ("소니", "헤드폰", ("wh-1000xm",)),
+    "레드미": ("샤오미", "스마트폰", ("레드미", "redmi")),
+    "씽크패드": ("레노버", "노트북", ("씽크패드", "thinkpad")),
+    "젠북": ("에이수스", "노트북", ("젠북", "zenbook")),
+    "보스 QC": ("보스", "헤드폰", ("quietcomfort", "bose qc", "보스 qc")),
+}
+
+# 온라인 쇼핑몰
+SHOPS: Tuple[str, ...] = ("쿠팡", "11번가", "G마켓", "옥션", "네이버쇼핑", "SSG", "다나와", "롯데ON", "하이마트", "위메프", "티몬")
+
+# 모델 등급 ("프로", "max" - 여러 개 연속 가능: "프로맥스")
+_GRADE = r"(?:울트라|플러스|프로|맥스|ultra|plus|pro|max|fe|\+)(?![a-z])"
+
+# 제품 라인 뒤의 모델 번호/등급 ("S24 울트라", "15 프로 맥스", "XM5", 번호 없는 "에어팟 pro")
+_MODEL_SUFFIX = rf"(?:\s?(\d{{1,4}})(?!\d|번가))?((?:\s?{_GRADE})+)?"
+
+# 모델 등급 표준 표기
+_GRADES = {"ultra": "울트라", "plus": "플러스", "+": "플러스", "pro": "프로", "max": "맥스", "fe": "FE"}
+_GRADE_PATTERN = re.compile(_GRADE)
+
+
+def _alias_key(text: str) -> str:
+    """별칭 조회 키 (공백 제거, 소문자)"""
+    return re.sub(r"\s+", "", text.lower())
+
+
+def _alias_pattern(alias: str) -> str:
+    """별칭 정규식 - 공백은 선택, 영문/숫자 별칭과 짧은 한글 별칭은 단어 경계 확인 ("lg"가 "algorithm"에 걸리지 않도록)"""
+    body = r"\s*".join(re.escape(part) for part in alias.lower().split())
+    if alias[0].isascii() and alias[0].isalnum():
+        body = r"(?<![a-z0-9])" + body
+    elif len(_alias_key(alias)) <= 2:
+        # 짧은 한글 별칭은 다른 단어의 끝부분과 일치하지 않도록 ("티비"가 "스티비"에 걸리지 않도록)
+        body = r"(?<![가-힣0-9])" + body
+    if alias[-1].isascii() and alias[-1].isalpha():
+        body += r"(?![a-z])"
+    return body
+
+
+class ProductMentions:
+    """텍스트에서 추출한 상품 언급 (등장 순서, 중복 제거)"""
+
+    def __init__(self):
+        self.categories: List[str] = []
+        self.brands: List[str] = []
+        self.models: List[str] = []
+        self.shops: List[str] = []
+
+    @staticmethod
+    def _add(values: List[str], value: Optional[str]):
+        if value and value not in values:
+            values.append(value)
+
+    @property
+    def primary(self) -> Optional[str]:
+        """대표 분류 (카테고리 > 모델 > 브랜드 순)"""
+        for values in (self.categories, self.models, self.brands):
+            if values:
+                return values[0]
+        return None
+
+    def labels(self) -> List[str]:
+        """메모리 태그용 전체 분류 목록"""
+        return [*self.categories, *self.brands, *self.models]
+
+    def __bool__(self) -> bool:
+        return bool(self.categories or self.brands or self.models)
+
+
+class ProductTaxonomy:
+    """분류 체계 다중 패턴 매처"""
+
+    def __init__(
+        self,
+        categories: Dict[str, Tuple[str, ...]] = CATEGORIES,
+        brands: Dict[str, Tuple[str, ...]] = BRANDS,
+        model_lines: Dict[str, Tuple[str, Optional[str], Tuple[str, ...]]] = MODEL_LINES,
+        shops: Tuple[str, ...] = SHOPS,
+    ):
+        # 별칭 키 -> (종류, 표준 이름)
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        for name, aliases in categories.items():
+            for alias in aliases:
+                self._entries[_alias_key(alias)] = ("category", name)
+        for name, aliases in brands.items():
+            for alias in aliases:
+                self._entries[_alias_key(alias)] = ("brand", name)
+        for name, (_, _, aliases) in model_lines.items():
+            for alias in aliases:
+                self._entries[_alias_key(alias)] = ("model", name)
+        for shop in shops:
+            self._entries[_alias_key(shop)] = ("shop", shop)
+        self._model_lines = model_lines
+
+        # 긴 별칭을 먼저 시도해 "맥북 에어"가 "맥북"보다 우선 (가장 왼쪽 + 가장 긴 일치)
+        all_aliases = sorted(
+            {alias for aliases in categories.values() for alias in aliases}
+            | {alias for _, _, aliases in model_lines.values() for alias in aliases}
+            | {alias for aliases in brands.values() for alias in aliases}
+            | set(shops),
+            key=lambda alias: len(_alias_key(alias)),
+            reverse=True,
+        )
+        self._pattern = re.compile("(" + "|".join(_alias_pattern(alias) for alias in all_aliases) + ")" + _MODEL_SUFFIX)
+
+    def _matches(self, text: str):
+        """(시작, 끝, 종류, 표준 이름, 모델 번호를 붙인 이름)"""
+        for match in self._pattern.finditer(text.lower()):
+            kind, name = self._entries[_alias_key(match.group(1))]
+            full_name = name
+            end = match.end(1)
+            if kind == "model" and match.group(2):
+                full_name = f"{name}{'' if name[-1].isascii() else ' '}{match.group(2)}"
+                end = match.end(2)
+            if kind == "model" and match.group(3):
+                for grade in _GRADE_PATTERN.findall(match.group(3)):
+                    full_name += " " + _GRADES.get(grade, grade)
+                end = match.end(3)
+            yield match.start(1), end, kind, name, full_name
+
+    def extract(self, text: str) -> ProductMentions:
+        """텍스트에 언급된 카테고리/브랜드/모델/쇼핑몰을 한 번에 추출 (모델은 브랜드/카테고리도 포함)"""
+        mentions = ProductMentions()
+        for _, _, kind, name, full_name in self._matches(text):
+            if kind == "category":
+                mentions._add(mentions.categories, name)
+            elif kind == "brand":
+                mentions._add(mentions.brands, name)
+            elif kind == "shop":
+                mentions._add(mentions.shops, name)
+            else:
+                brand, category, _ = self._model_lines[name]
+                mentions._add(mentions.models, full_name)
+                mentions._add(mentions.brands, brand)
+                mentions._add(mentions.categories, category)
+        return mentions
+
+    def canonicalize(self, text: str) -> str:
+        """별칭을 표준 이름으로 바꾼 텍스트 ("galaxy s24 울트라" -> "갤럭시 S24 울트라") - 캐시 키용"""
+        if len(text.lower()) != len(text):
+            # 소문자 변환으로 길이가 바뀌는 문자가 있으면 위치를 맞출 수 없으므로 그대로 사용
+            return text
+        parts = []
+        position = 0
+        for start, end, _, _, full_name in self._matches(text):
+            parts.append(text[position:start])
+            parts.append(full_name)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
+
+# 전역 분류 체계 (import 시 한 번만 컴파일)
+taxonomy = ProductTaxonomy()
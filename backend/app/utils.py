@@ -3,22 +3,97 @@
 PR 테스트를 위해 추가된 파일입니다.
 """
 
-def format_price(price: float) -> str:
-    """가격을 포맷팅하여 반환합니다."""
-    # 버그: 0 가격일 때 0으로 나누기 오류 발생
-    if price == 0:
-        return f"￦{price / 0:,.0f}"  # 의도적 버그: ZeroDivisionError
+import math
+from typing import Callable, Iterable, List, Optional
+
+# 가격 파싱은 검색어 금액 정규화와 같은 파서를 공유 (utils에서도 그대로 제공)
+from app.services.normalization import normalize_text, parse_price, parse_price_range, parse_prices
+
+# 가격이 없거나 숫자가 아닐 때 표시
+UNKNOWN_PRICE = "가격 정보 없음"
+
+
+def _format_symbol(price: float) -> str:
     return f"￦{price:,.0f}"
 
 
+def _format_won(price: float) -> str:
+    return f"{price:,.0f}원"
+
+
+def _format_man(price: float) -> str:
+    """한국식 만/억 단위 ("1억 5,000만원", "125만 5,000원")"""
+    amount = int(round(price))
+    sign = "-" if amount < 0 else ""
+    eok, rest = divmod(abs(amount), 100000000)
+    man, won = divmod(rest, 10000)
+    parts = [f"{value:,}{unit}" for value, unit in ((eok, "억"), (man, "만"), (won, "")) if value]
+    if not parts:
+        return "0원"
+    return sign + " ".join(parts) + "원"
+
+
+_FORMATTERS = {"symbol": _format_symbol, "won": _format_won, "man": _format_man}
+
+
+def _formatter(style: str) -> Callable[[float], str]:
+    try:
+        return _FORMATTERS[style]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 가격 표시 형식입니다: {style}") from None
+
+
+def format_price(price: Optional[float]) -> str:
+    """가격을 포맷팅하여 반환합니다."""
+    if price is None or math.isnan(price):
+        return UNKNOWN_PRICE
+    return _format_symbol(price)
+
+
+def format_prices(prices: Iterable[Optional[float]], style: str = "won") -> List[str]:
+    """
+    가격 목록을 한 번에 포맷팅합니다.
+
+    형식 함수를 한 번만 골라 가격이 있는 항목에 적용하고 가격 없는 자리만 다시 채우므로,
+    상품 수천 개를 렌더링할 때 가격마다 형식을 확인하지 않습니다.
+
+    Args:
+        prices: 가격 목록 (None/NaN은 UNKNOWN_PRICE로 표시)
+        style: "won" (1,250,000원), "man" (125만원), "symbol" (￦1,250,000)
+
+    Returns:
+        포맷팅된 문자열 목록 (입력 순서 유지)
+    """
+    formatter = _formatter(style)
+    values = list(prices)
+    # NaN은 자기 자신과 같지 않음
+    present = [price for price in values if price is not None and price == price]
+    formatted = [formatter(price) for price in present]
+    if len(present) == len(values):
+        return formatted
+    texts = iter(formatted)
+    return [UNKNOWN_PRICE if price is None or price != price else next(texts) for price in values]
+
+
+def format_price_range(low: Optional[float], high: Optional[float], style: str = "won") -> str:
+    """가격 범위를 포맷팅합니다. ("10,000원~20,000원", "10,000원 이상", "20,000원 이하")"""
+    low_text, high_text = format_prices([low, high], style)
+    if low_text == UNKNOWN_PRICE and high_text == UNKNOWN_PRICE:
+        return UNKNOWN_PRICE
+    if high_text == UNKNOWN_PRICE:
+        return f"{low_text} 이상"
+    if low_text == UNKNOWN_PRICE:
+        return f"{high_text} 이하"
+    return f"{low_text}~{high_text}"
+
+
 def validate_search_query(query: str) -> bool:
     """검색 쿼리의 유효성을 검사합니다."""
-    if not query or len(query.strip()) < 2:
+    if not query or len(normalize_text(query)) < 2:
         return False
     return True
 
 
 def clean_product_name(name: str) -> str:
-    """상품명을 정리합니다."""
-    import re
-    return re.sub(r'\s+', ' ', name.strip()) 
\ No newline at end of file
+    """상품명을 정리합니다. (전각 문자/폭 없는 문자/연속 공백 정리)"""
+    return normalize_text(name)
@@ -0,0 +1,74 @@
+"""
+Agent/메모리 시스템 벤치마크
+search_products_with_memory 처리 시간과 대화 길이(10/100/1000턴)에 따른
+get_conversation_history, build_memory_context 비용을 측정한다
+
+실행: cd backend && pytest benchmarks/bench_agent.py
+"""
+
+import uuid
+
+import pytest
+
+from conftest import TURN_COUNTS
+
+
+def _fill_history(agent, thread_id: str, turns: int):
+    """대화 히스토리에 turns개의 턴 추가"""
+    for i in range(turns):
+        agent.add_to_conversation_history(
+            thread_id, f"갤럭시 스마트폰 {i}번째 질문", f"갤럭시 S24 추천 {i}번째 답변 - 쿠팡 999,000원"
+        )
+
+
+class BenchSearchWithMemory:
+    """메모리 기반 검색 전체 경로 (가짜 LLM/검색, 지연 0)"""
+
+    def bench_first_turn(self, benchmark, fake_agent):
+        """새 스레드의 첫 질문"""
+        user_id = str(uuid.uuid4())
+
+        def run():
+            return fake_agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", str(uuid.uuid4()), user_id)
+
+        response = benchmark(run)
+        assert "추천" in response
+
+    @pytest.mark.parametrize("turns", [10, 100])
+    def bench_follow_up_turn(self, benchmark, fake_agent, turns):
+        """이전 대화가 쌓인 스레드의 후속 질문 (히스토리 증가분 제외를 위해 매 라운드 새 스레드)"""
+        user_id = str(uuid.uuid4())
+
+        def setup():
+            thread_id = str(uuid.uuid4())
+            _fill_history(fake_agent, thread_id, turns)
+            return (thread_id,), {}
+
+        def run(thread_id):
+            return fake_agent.search_products_with_memory("그 중에서 50만원 이하", thread_id, user_id)
+
+        response = benchmark.pedantic(run, setup=setup, rounds=50)
+        assert "갤럭시 스마트폰 0번째 질문" in response
+
+
+class BenchConversationHistory:
+    """대화 길이별 히스토리 문자열 생성 비용"""
+
+    @pytest.mark.parametrize("turns", TURN_COUNTS)
+    def bench_get_conversation_history(self, benchmark, fake_agent, turns):
+        thread_id = str(uuid.uuid4())
+        _fill_history(fake_agent, thread_id, turns)
+
+        history = benchmark(fake_agent.get_conversation_history, thread_id)
+        assert f"{turns}. 사용자:" in history
+
+
+class BenchMemoryContext:
+    """메모리 개수별 컨텍스트 문자열 생성 비용"""
+
+    @pytest.mark.parametrize("turns", TURN_COUNTS)
+    def bench_build_memory_context(self, benchmark, fake_agent, turns):
+        memories = [{"data": f"사용자가 갤럭시 스마트폰 {i}번을 문의함", "type": "product_interest"} for i in range(turns)]
+
+        context = benchmark(fake_agent.build_memory_context, memories)
+        assert context.count("\n") == turns
@@ -0,0 +1,82 @@
+"""
+API 라우터 벤치마크
+검색 결과 10,000건이 저장된 상태의 /api/history 조회/기록 검색과
+httpx ASGI 트랜스포트를 통한 /api/chat 동시 요청 처리량을 측정한다
+
+실행: cd backend && pytest benchmarks/bench_api.py
+"""
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import chat as chat_api
+from app.main import app
+from conftest import make_fake_agent
+
+# /api/chat 동시 요청 수
+CONCURRENCY_LEVELS = [1, 10, 50]
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class BenchSearchHistory:
+    """검색 결과 10,000건 저장 상태의 히스토리 조회"""
+
+    def bench_history_first_page(self, benchmark, client, search_store_10k):
+        response = benchmark(client.get, "/api/history", params={"limit": 20})
+        assert response.status_code == 200
+        assert response.json()["total_count"] == 10_000
+
+    def bench_history_max_page(self, benchmark, client, search_store_10k):
+        response = benchmark(client.get, "/api/history", params={"limit": 100})
+        assert len(response.json()["history"]) == 100
+
+    def bench_history_not_modified(self, benchmark, client, search_store_10k):
+        """ETag 재검증 (304) 경로"""
+        etag = client.get("/api/history").headers["etag"]
+
+        response = benchmark(client.get, "/api/history", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def bench_history_full_text_search(self, benchmark, client, search_store_10k):
+        """상품명 기록 검색 (역색인 조회)"""
+        response = benchmark(client.get, "/api/history/search", params={"q": "상품 4321"})
+        assert response.json()["results"][0]["query"] == "벤치마크 상품 4321"
+
+
+@pytest.fixture
+def fake_chat_agent():
+    """/api/chat이 사용하는 Agent를 가짜 제공자 Agent로 교체 (검색/LLM 각 5ms 고정 지연)"""
+    saved_agent = chat_api._agent_instance
+    chat_api._agent_instance = make_fake_agent(fake_llm_first_token_ms=5, fake_search_latency_ms=5)
+    yield chat_api._agent_instance
+    chat_api._agent_instance = saved_agent
+
+
+async def _send_concurrent_chats(concurrency: int):
+    """동시에 concurrency개의 /api/chat 요청 전송"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        requests = [
+            http.post("/api/chat", json={"query": f"갤럭시 스마트폰 {i}", "thread_id": str(uuid.uuid4())})
+            for i in range(concurrency)
+        ]
+        return await asyncio.gather(*requests)
+
+
+class BenchConcurrentChat:
+    """httpx ASGI 트랜스포트를 통한 /api/chat 동시 요청"""
+
+    @pytest.mark.parametrize("concurrency", CONCURRENCY_LEVELS)
+    def bench_concurrent_chat(self, benchmark, fake_chat_agent, concurrency):
+        responses = benchmark.pedantic(
+            lambda: asyncio.run(_send_concurrent_chats(concurrency)), rounds=5
+        )
+        assert all(r.status_code == 200 for r in responses)
@@ -0,0 +1,83 @@
+"""
+저장 상품 메모리 벤치마크
+검색 결과 저장소에 상품을 Pydantic ProductInfo로 보관할 때와 압축 ProductRecord로 보관할 때의
+상품당 바이트 수(tracemalloc 기준)와 응답 변환 비용을 비교한다
+
+실행: cd backend && pytest benchmarks/bench_memory.py
+      cd backend && python benchmarks/bench_memory.py [검색수] [검색당 상품수]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.api.search import generate_dummy_products, to_product_infos  # noqa: E402
+
+# 판매자/배송 정보가 반복되는 실제 저장소처럼 검색 여러 건을 쌓아서 측정
+SEARCH_COUNT = 200
+PRODUCTS_PER_SEARCH = 50
+
+
+def build_records(search_count: int, per_search: int):
+    return [generate_dummy_products(f"벤치마크 상품 {i}", per_search) for i in range(search_count)]
+
+
+def build_models(search_count: int, per_search: int):
+    return [to_product_infos(records) for records in build_records(search_count, per_search)]
+
+
+def bytes_per_product(build, search_count: int = SEARCH_COUNT, per_search: int = PRODUCTS_PER_SEARCH) -> float:
+    """build로 만든 저장소가 유지하는 메모리를 상품 수로 나눈 값"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = build(search_count, per_search)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del store
+    return (after - before) / (search_count * per_search)
+
+
+class BenchStoredProductMemory:
+    """저장 상품 1개당 메모리 (extra_info에 bytes_per_product 기록)"""
+
+    def bench_product_info_store(self, benchmark):
+        result = benchmark.pedantic(bytes_per_product, args=(build_models,), rounds=3)
+        benchmark.extra_info["bytes_per_product"] = round(result)
+
+    def bench_product_record_store(self, benchmark):
+        result = benchmark.pedantic(bytes_per_product, args=(build_records,), rounds=3)
+        benchmark.extra_info["bytes_per_product"] = round(result)
+        assert result < bytes_per_product(build_models)
+
+
+class BenchRecordConversion:
+    """응답 경계에서의 레코드 -> ProductInfo 변환 (한 페이지 분량)"""
+
+    def bench_page_conversion(self, benchmark):
+        records = generate_dummy_products("갤럭시 S24 울트라", 100)
+        products = benchmark(to_product_infos, records)
+        assert len(products) == 100
+
+
+def main():
+    search_count = int(sys.argv[1]) if len(sys.argv) > 1 else SEARCH_COUNT
+    per_search = int(sys.argv[2]) if len(sys.argv) > 2 else PRODUCTS_PER_SEARCH
+
+    model_bytes = bytes_per_product(build_models, search_count, per_search)
+    record_bytes = bytes_per_product(build_records, search_count, per_search)
+
+    print(f"📦 검색 {search_count}건 x 상품 {per_search}개")
+    print(f"  ProductInfo   : {model_bytes:8.0f} bytes/product")
+    print(f"  ProductRecord : {record_bytes:8.0f} bytes/product")
+    print(f"  절감          : {1 - record_bytes / model_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+응답 직렬화 처리량 벤치마크
+대량 상품 목록을 가진 SearchResult를 FastAPI 기본 경로와 FastJSONResponse 경로로 직렬화해 비교
+
+실행: cd backend && python benchmarks/bench_serialization.py [상품수] [반복횟수]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.api.responses import dumps  # noqa: E402
+from app.api.search import SearchResult, generate_dummy_products, to_product_infos  # noqa: E402
+
+
+def build_result(product_count: int) -> SearchResult:
+    """벤치마크용 검색 결과 생성"""
+    products = to_product_infos(generate_dummy_products("갤럭시 S24 울트라", product_count))
+    return SearchResult.model_construct(
+        search_id="bench",
+        query="갤럭시 S24 울트라",
+        products=products,
+        total_count=len(products),
+        search_time=0.01,
+        timestamp=datetime.now(),
+        status="success",
+        next_cursor=None,
+    )
+
+
+def default_path(result: SearchResult) -> bytes:
+    """FastAPI 기본 경로: response_model 재검증 + jsonable_encoder + json.dumps"""
+    validated = SearchResult.model_validate(result.model_dump())
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode("utf-8")
+
+
+def fast_path(result: SearchResult) -> bytes:
+    """FastJSONResponse 경로: 재검증 없이 orjson 직렬화"""
+    return dumps(result)
+
+
+def measure(func, result: SearchResult, iterations: int) -> float:
+    """초당 처리 응답 수 측정"""
+    func(result)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(result)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    result = build_result(product_count)
+    default_rps = measure(default_path, result, iterations)
+    fast_rps = measure(fast_path, result, iterations)
+
+    print(f"📦 상품 {product_count}개, 반복 {iterations}회")
+    print(f"  FastAPI 기본 경로 : {default_rps:10.1f} responses/s")
+    print(f"  FastJSONResponse  : {fast_rps:10.1f} responses/s")
+    print(f"  속도 향상         : {fast_rps / default_rps:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
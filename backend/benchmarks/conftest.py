@@ -0,0 +1,76 @@
+"""
+벤치마크 공통 픽스처
+외부 API 없이 가짜 제공자(app.agents.fake_providers)를 사용해 항상 같은 조건으로 측정한다
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import Settings  # noqa: E402
+
+# 벤치마크에 사용하는 대화 턴 수
+TURN_COUNTS = [10, 100, 1000]
+
+
+def fake_settings(**overrides) -> Settings:
+    """지연 없는 결정적 가짜 제공자 설정 (측정 대상은 앱 코드 자체)"""
+    values = dict(
+        llm_provider="fake",
+        search_provider="fake",
+        fake_latency_distribution="fixed",
+        fake_llm_first_token_ms=0,
+        fake_llm_tokens_per_second=0,
+        fake_search_latency_ms=0,
+        fake_seed=0,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def make_fake_agent(**overrides):
+    """가짜 제공자를 사용하는 ProductSearchAgent 생성"""
+    from app.agents.product_search_agent import ProductSearchAgent
+
+    with patch("app.agents.product_search_agent.get_settings", return_value=fake_settings(**overrides)):
+        return ProductSearchAgent()
+
+
+@pytest.fixture
+def fake_agent():
+    """지연 없는 가짜 제공자 Agent"""
+    return make_fake_agent()
+
+
+@pytest.fixture
+def search_store_10k():
+    """검색 결과 10,000건이 저장된 상태의 검색 저장소"""
+    from app.api import search
+
+    def clear():
+        search.search_results_store.clear()
+        search.search_results_order.clear()
+        search.history_index.clear("search")
+
+    saved_results = list(search.search_results_order)
+    clear()
+    for i in range(10_000):
+        query = f"벤치마크 상품 {i}"
+        search.save_search_result(search.StoredSearchResult(
+            search_id=f"bench-{i}",
+            query=query,
+            products=search.generate_dummy_products(query, 10),
+            search_time=0.01,
+            timestamp=datetime.now(),
+        ))
+
+    yield search.search_results_store
+
+    clear()
+    for result in saved_results:
+        search.save_search_result(result)
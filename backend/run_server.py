@@ -2,20 +2,32 @@
 """
 FastAPI 서버 실행 스크립트
 Shopping Chat Agent 백엔드 서버
+
+ENVIRONMENT=production 이면 멀티 워커 운영 모드로, 그 외에는 reload 개발 모드로 실행된다
 """
 
 import uvicorn
 from app.config import settings
+from app.server import build_server_options
 
-if __name__ == "__main__":
-    print("🚀 Shopping Chat Agent API Server 시작...")
+
+def main():
+    options = build_server_options(settings)
+    
+    mode = "운영" if settings.is_production() else "개발"
+    print(f"🚀 Shopping Chat Agent API Server 시작... ({mode} 모드, 워커 {options['workers']}개)")
     print(f"📖 API 문서: http://{settings.fastapi_host}:{settings.fastapi_port}/docs")
     print(f"🔍 ReDoc: http://{settings.fastapi_host}:{settings.fastapi_port}/redoc")
+    if "loop" in options:
+        print(f"⚙️ 이벤트 루프: {options['loop']}, HTTP 구현: {options['http']}")
+        if options["loop"] != "uvloop" or options["http"] != "httptools":
+            print("⚠️ uvloop/httptools가 설치되지 않아 표준 구현으로 실행합니다. (pip install 'uvicorn[standard]')")
+    if options["workers"] > 1:
+        # 대화 히스토리/검색 결과/LangGraph 메모리는 프로세스 메모리에 저장되므로 워커끼리 공유되지 않음
+        print("⚠️ 인메모리 저장소는 워커별로 분리됩니다. 멀티턴 대화는 세션 고정(sticky) 라우팅이 필요합니다.")
     
-    uvicorn.run(
-        "app.main:app",
-        host=settings.fastapi_host,
-        port=settings.fastapi_port,
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    uvicorn.run(**options)
+
+
+if __name__ == "__main__":
+    main()
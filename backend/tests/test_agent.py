@@ -13,8 +13,7 @@ class TestProductSearchAgent:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_agent_initialization(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_agent_initialization(self, mock_ddg_search, mock_gemini):
         """Test agent can be initialized properly"""
         # Mock return values
         mock_llm = Mock()
@@ -24,7 +23,6 @@ class TestProductSearchAgent:
         mock_ddg_search.return_value = mock_search_tool
         
         mock_agent = Mock()
-        mock_create_react_agent.return_value = mock_agent
         
         from app.agents.product_search_agent import ProductSearchAgent
         agent = ProductSearchAgent()
@@ -36,7 +34,6 @@ class TestProductSearchAgent:
         # Verify mocks were called
         mock_gemini.assert_called_once()
         mock_ddg_search.assert_called_once()
-        mock_create_react_agent.assert_called_once()
         
     @patch.dict(os.environ, {
         'GOOGLE_API_KEY': 'test_api_key',
@@ -45,8 +42,7 @@ class TestProductSearchAgent:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_products_with_valid_query(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_products_with_valid_query(self, mock_ddg_search, mock_gemini):
         """Test agent can search products with valid query"""
         # Mock agent response
         mock_agent = Mock()
@@ -56,7 +52,6 @@ class TestProductSearchAgent:
             ]
         }
         mock_agent.invoke.return_value = mock_response
-        mock_create_react_agent.return_value = mock_agent
         
         from app.agents.product_search_agent import ProductSearchAgent
         agent = ProductSearchAgent()
@@ -74,11 +69,9 @@ class TestProductSearchAgent:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_products_with_empty_query(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_products_with_empty_query(self, mock_ddg_search, mock_gemini):
         """Test agent handles empty query appropriately"""
         mock_agent = Mock()
-        mock_create_react_agent.return_value = mock_agent
         
         from app.agents.product_search_agent import ProductSearchAgent
         agent = ProductSearchAgent()
@@ -95,13 +88,11 @@ class TestProductSearchAgent:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_products_with_agent_error(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_products_with_agent_error(self, mock_ddg_search, mock_gemini):
         """Test agent handles errors gracefully"""
         # Mock agent to raise exception
         mock_agent = Mock()
         mock_agent.invoke.side_effect = Exception("Test error")
-        mock_create_react_agent.return_value = mock_agent
         
         from app.agents.product_search_agent import ProductSearchAgent
         agent = ProductSearchAgent()
@@ -156,4 +156,121 @@ class TestProductSearchAgentMemory:
         context = agent.build_memory_context(memories)
         assert context is not None
         assert isinstance(context, str)
-        assert len(context) > 0 
\ No newline at end of file
+        assert len(context) > 0         
+    def test_agent_streams_llm_chunks_and_remembers_turn(self):
+        """스트리밍 검색이 LLM 조각을 그대로 내보내고 완료 후 히스토리에 저장하는지 테스트"""
+        from app.agents.product_search_agent import ProductSearchAgent
+        
+        agent = ProductSearchAgent()
+        agent.search_tool = Mock()
+        agent.search_tool.run.return_value = "검색 결과"
+        agent.llm = Mock()
+        agent.llm.stream.return_value = iter([Mock(content="갤럭시 "), Mock(content="S24\n"), Mock(content="추천")])
+        agent.use_agent = True
+        
+        thread_id = str(uuid.uuid4())
+        chunks = list(agent.stream_products_with_memory("갤럭시 추천", thread_id=thread_id, user_id="u1"))
+        
+        assert chunks == ["갤럭시 ", "S24\n", "추천"]
+        assert agent.get_turns(thread_id)[0]["ai"] == "갤럭시 S24\n추천"
+
+
+class TestToolCallingGraph:
+    """LLM이 검색 여부를 결정하는 도구 호출 그래프 테스트"""
+
+    def _agent(self):
+        from app.agents.product_search_agent import ProductSearchAgent
+        from app.config import Settings
+
+        settings = Settings(
+            llm_provider="fake",
+            search_provider="fake",
+            fake_llm_first_token_ms=0,
+            fake_search_latency_ms=0,
+            fake_seed=1,
+        )
+        with patch("app.agents.product_search_agent.get_settings", return_value=settings):
+            agent = ProductSearchAgent()
+        agent.search_tool.run = Mock(wraps=agent.search_tool.run)
+        return agent
+
+    def test_follow_up_reuses_cached_search(self):
+        """후속 질문은 웹 검색 없이 스레드에 캐시된 검색 결과로 응답"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+        response = agent.search_products_with_memory("그 중에서 배터리가 오래가는 건?", thread_id, "u1")
+
+        assert agent.search_tool.run.call_count == 1
+        assert "갤럭시 스마트폰 추천해줘" in response
+        assert "갤럭시 스마트폰 추천해줘 상품 가격 리뷰 구매 모델 1" in response
+
+        state = agent.graph.get_state(agent._thread_config(thread_id)).values
+        # 캐시 키는 검색어 키 (한글 단어 사이 공백 제거)
+        assert list(state["search_results"]) == ["갤럭시스마트폰추천해줘"]
+        # 도구 호출/결과 메시지는 체크포인트에 남지 않음
+        assert [m.type for m in state["messages"]] == ["human", "ai", "human", "ai"]
+        assert len(agent.get_turns(thread_id)) == 2
+
+    def test_new_product_triggers_search(self):
+        """새 상품 질문은 다시 검색"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+        agent.search_products_with_memory("맥북 에어 가격 알려줘", thread_id, "u1")
+
+        assert agent.search_tool.run.call_count == 2
+
+    def test_streaming_tool_call_turn(self):
+        """스트리밍 시 도구 호출 단계는 내보내지 않고 최종 응답만 전송"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+
+        chunks = list(agent.stream_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1"))
+
+        assert agent.search_tool.run.call_count == 1
+        assert "".join(chunks) == agent.get_turns(thread_id)[0]["ai"]
+        assert "모델 1 - " in "".join(chunks)
+
+    def test_llm_without_tools_searches_every_turn(self):
+        """도구 호출을 지원하지 않는 LLM은 기존처럼 검색 결과를 프롬프트에 포함"""
+        agent = self._agent()
+        agent.llm = Mock()
+        agent.llm.invoke.return_value = Mock(content="응답")
+        thread_id = str(uuid.uuid4())
+
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+        agent.search_products_with_memory("맥북 에어 가격 알려줘", thread_id, "u1")
+
+        assert agent.search_tool.run.call_count == 2
+        assert agent.get_turns(thread_id)[1]["ai"] == "응답"
+
+    def test_refinement_applied_to_previous_results(self):
+        """가격/정렬 후속 질문은 LLM/검색 없이 이전 구조화 결과에 로컬 적용"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+        items = agent.graph.get_state(agent._thread_config(thread_id)).values["product_results"]["items"]
+        cap = sorted(item["price"] for item in items)[1]
+
+        agent.llm = Mock(wraps=agent.llm)
+        response = agent.search_products_with_memory(f"그 중에서 {cap}원 이하인 것만", thread_id, "u1")
+
+        assert agent.search_tool.run.call_count == 1
+        agent.llm.invoke.assert_not_called()
+        assert "'갤럭시 스마트폰 추천해줘' 검색 결과 중" in response
+        assert response.count("\n- ") == 2
+        assert agent.get_turns(thread_id)[1]["ai"] == response
+
+    def test_unsatisfiable_refinement_searches_again(self):
+        """이전 결과로 만족할 수 없으면 조건을 붙여 다시 검색"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+        agent.search_products_with_memory("그 중에서 1000원 이하인 것만", thread_id, "u1")
+
+        assert agent.search_tool.run.call_count == 2
+        assert "1,000원 이하" in agent.search_tool.run.call_args[0][0]
+
@@ -14,8 +14,7 @@ class TestSearchAPI:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_endpoint_exists(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_endpoint_exists(self, mock_ddg_search, mock_gemini):
         """Test search endpoint exists and returns proper response"""
         # Mock agent response
         mock_agent = Mock()
@@ -25,7 +24,6 @@ class TestSearchAPI:
             ]
         }
         mock_agent.invoke.return_value = mock_response
-        mock_create_react_agent.return_value = mock_agent
         
         from app.main import app
         client = TestClient(app)
@@ -40,8 +38,7 @@ class TestSearchAPI:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_with_valid_query(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_with_valid_query(self, mock_ddg_search, mock_gemini):
         """Test search with valid product query"""
         mock_agent = Mock()
         mock_response = {
@@ -50,7 +47,6 @@ class TestSearchAPI:
             ]
         }
         mock_agent.invoke.return_value = mock_response
-        mock_create_react_agent.return_value = mock_agent
         
         from app.main import app
         client = TestClient(app)
@@ -68,11 +64,9 @@ class TestSearchAPI:
     })
     @patch('app.agents.product_search_agent.ChatGoogleGenerativeAI')
     @patch('app.agents.product_search_agent.DuckDuckGoSearchRun')
-    @patch('app.agents.product_search_agent.create_react_agent')
-    def test_search_with_empty_query(self, mock_create_react_agent, mock_ddg_search, mock_gemini):
+    def test_search_with_empty_query(self, mock_ddg_search, mock_gemini):
         """Test search with empty query"""
         mock_agent = Mock()
-        mock_create_react_agent.return_value = mock_agent
         
         from app.main import app
         client = TestClient(app)
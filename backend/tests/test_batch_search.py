@@ -0,0 +1,144 @@
+"""
+배치 검색 API 테스트
+"""
+
+import json
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+
+
+def search_module():
+    from app.api import search
+    return search
+
+
+class TestBatchSearchAPI:
+    """POST /api/search/batch 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        """테스트 클라이언트 생성"""
+        from app.main import app
+        return TestClient(app)
+
+    def test_batch_search_dedupes_and_keeps_order(self, client):
+        """중복 쿼리는 한 번만 검색하고 결과는 입력 순서대로 반환"""
+        with patch('app.api.search.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products.side_effect = lambda q: f"{q} 결과"
+            mock_get_agent.return_value = mock_agent
+
+            response = client.post("/api/search/batch", json={
+                "queries": ["아이폰 15", "갤럭시 S24", "아이폰  15"]
+            })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 3
+        assert data["unique_count"] == 2
+        assert [r["index"] for r in data["results"]] == [0, 1, 2]
+        assert data["results"][0]["result"] == "아이폰 15 결과"
+        assert data["results"][2]["result"] == "아이폰 15 결과"
+        assert data["results"][2]["query"] == "아이폰  15"
+        assert mock_agent.search_products.call_count == 2
+
+    def test_batch_search_dedupes_query_variants(self, client):
+        """띄어쓰기/전각/별칭/단위 변형은 같은 쿼리로 보고 한 번만 검색"""
+        with patch('app.api.search.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products.side_effect = lambda q: f"{q} 결과"
+            mock_get_agent.return_value = mock_agent
+
+            response = client.post("/api/search/batch", json={
+                "queries": ["갤럭시S24 50만원 이하", "Galaxy S24 500,000원 이하", "ｇａｌａｘｙ ｓ２４ 50만 이하"]
+            })
+
+        data = response.json()
+        assert data["unique_count"] == 1
+        mock_agent.search_products.assert_called_once_with("갤럭시 S24 500000원 이하")
+
+    def test_batch_search_reports_per_query_errors(self, client):
+        """개별 쿼리 실패는 해당 항목에만 기록"""
+        def search(query):
+            if query == "실패":
+                raise RuntimeError("검색 실패")
+            return "성공"
+
+        with patch('app.api.search.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products.side_effect = search
+            mock_get_agent.return_value = mock_agent
+
+            data = client.post("/api/search/batch", json={"queries": ["정상", "실패"]}).json()
+
+        assert data["results"][0]["status"] == "success"
+        assert data["results"][1]["status"] == "error"
+        assert "검색 실패" in data["results"][1]["error"]
+
+    def test_batch_search_bounded_concurrency(self, client):
+        """동시 실행 수가 max_concurrency를 넘지 않음"""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def search(query):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            return query
+
+        with patch('app.api.search.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products.side_effect = search
+            mock_get_agent.return_value = mock_agent
+
+            response = client.post("/api/search/batch", json={
+                "queries": [f"상품 {i}" for i in range(8)],
+                "max_concurrency": 2
+            })
+
+        assert response.status_code == 200
+        assert 1 <= state["peak"] <= 2
+
+    def test_batch_search_limits_from_settings(self, client):
+        """설정의 최대 쿼리 수/동시 실행 수 적용"""
+        from app.config import Settings
+
+        limited = Settings(batch_max_queries=3, batch_max_concurrency=1)
+        with patch('app.api.search.get_settings', return_value=limited), \
+             patch('app.api.search._run_batch_search', wraps=search_module()._run_batch_search) as mock_run, \
+             patch('app.api.search.get_agent') as mock_get_agent:
+            mock_get_agent.return_value = Mock(search_products=lambda q: q)
+
+            too_many = client.post("/api/search/batch", json={"queries": ["a", "b", "c", "d"]})
+            response = client.post("/api/search/batch", json={"queries": ["a", "b"], "max_concurrency": 8})
+
+        assert too_many.status_code == 400
+        assert response.status_code == 200
+        assert mock_run.call_args[0][1] == 1
+
+    def test_batch_search_ndjson_stream(self, client):
+        """stream=True면 NDJSON으로 결과 전송"""
+        with patch('app.api.search.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products.side_effect = lambda q: f"{q} 결과"
+            mock_get_agent.return_value = mock_agent
+
+            response = client.post("/api/search/batch", json={
+                "queries": ["노트북", "태블릿"],
+                "stream": True
+            })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        assert sorted(line["index"] for line in lines) == [0, 1]
+
+    def test_batch_search_validation(self, client):
+        """빈 쿼리 목록은 422"""
+        assert client.post("/api/search/batch", json={"queries": []}).status_code == 422
@@ -0,0 +1,150 @@
+import asyncio
+import struct
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.search import generate_dummy_products
+from app.config import Settings
+from app.services.catalog import (
+    CatalogSnapshot,
+    CatalogSnapshotter,
+    merge_catalog_snapshot,
+    write_catalog_snapshot,
+)
+
+
+class TestCatalogSnapshot:
+    """카탈로그 스냅샷 파일 테스트"""
+
+    def test_round_trip(self, tmp_path):
+        """저장한 상품을 매핑해서 그대로 복원 (검색어는 정규화 키로 조회)"""
+        path = str(tmp_path / "catalog.bin")
+        products = generate_dummy_products("갤럭시 S24", 15)
+        products[0].rating = None
+        assert write_catalog_snapshot(path, [("갤럭시S24", time.time(), products)]) == 15
+
+        snapshot = CatalogSnapshot()
+        assert snapshot.load(path) == 15
+        rows = snapshot.lookup("galaxy s24")
+        assert rows == [product.to_dict() for product in products]
+        assert rows[0]["rating"] is None
+        assert "갤럭시 S24" in snapshot and "아이폰" not in snapshot
+        snapshot.close()
+
+    def test_strings_interned(self, tmp_path):
+        """반복되는 문자열(판매자/배송 정보)은 한 번만 저장"""
+        path = tmp_path / "catalog.bin"
+        products = generate_dummy_products("아이폰 15", 10)
+        write_catalog_snapshot(str(path), [("아이폰 15", time.time(), products)])
+        size_one = path.stat().st_size
+        write_catalog_snapshot(str(path), [("아이폰 15", time.time(), products + products)])
+        # 두 번째 복사본은 숫자 컬럼 + 문자열 번호만 추가됨
+        assert path.stat().st_size - size_one < sum(len(p.url) + len(p.image_url) for p in products)
+
+    def test_max_age(self, tmp_path):
+        path = str(tmp_path / "catalog.bin")
+        write_catalog_snapshot(path, [("아이폰 15", time.time() - 100, generate_dummy_products("아이폰 15", 2))])
+        snapshot = CatalogSnapshot()
+        snapshot.load(path)
+        assert snapshot.lookup("아이폰 15", max_age=10) is None
+        assert len(snapshot.lookup("아이폰 15", max_age=1000)) == 2
+        snapshot.close()
+
+    def test_missing_and_corrupt_files(self, tmp_path):
+        snapshot = CatalogSnapshot()
+        assert snapshot.load(str(tmp_path / "none.bin")) == 0
+        assert snapshot.lookup("아이폰 15") is None
+
+        corrupt = tmp_path / "corrupt.bin"
+        corrupt.write_bytes(b"XXXX" + b"\0" * 64)
+        with pytest.raises(ValueError):
+            snapshot.load(str(corrupt))
+
+        path = str(tmp_path / "catalog.bin")
+        write_catalog_snapshot(path, [("아이폰 15", time.time(), generate_dummy_products("아이폰 15", 5))])
+        truncated = tmp_path / "truncated.bin"
+        truncated.write_bytes(open(path, "rb").read()[:100])
+        with pytest.raises(ValueError):
+            snapshot.load(str(truncated))
+
+    def test_corrupt_query_offsets(self, tmp_path):
+        """검색어 항목의 문자열 번호/행 범위가 손상되면 IndexError 대신 ValueError"""
+        path = tmp_path / "catalog.bin"
+        write_catalog_snapshot(str(path), [("아이폰 15", time.time(), generate_dummy_products("아이폰 15", 5))])
+        data = bytearray(path.read_bytes())
+        # 검색어 항목은 문자열 열 바로 뒤 (5행 x 4바이트 x 문자열 필드 수, 8바이트 정렬)
+        query_offset = 24 + 5 * 8 * 5 + ((5 * 4 * 6 + 7) & ~7)
+        for corrupted in (struct.pack("<I", 10 ** 6), struct.pack("<III", 0, 4, 10)):
+            broken = bytearray(data)
+            broken[query_offset:query_offset + len(corrupted)] = corrupted
+            path.write_bytes(bytes(broken))
+            with pytest.raises(ValueError):
+                CatalogSnapshot().load(str(path))
+
+
+class TestCatalogMerge:
+    """여러 워커의 스냅샷 병합 테스트"""
+
+    def test_workers_keep_each_others_products(self, tmp_path):
+        """다른 워커가 저장한 검색어는 유지하고, 같은 검색어는 더 최근 결과를 남김"""
+        path = str(tmp_path / "catalog.bin")
+        now = time.time()
+        merge_catalog_snapshot(path, [("아이폰 15", now - 10, generate_dummy_products("아이폰 15", 2))])
+        merge_catalog_snapshot(path, [
+            ("갤럭시 S24", now, generate_dummy_products("갤럭시 S24", 3)),
+            ("아이폰 15", now - 20, generate_dummy_products("아이폰 15", 4)),
+        ])
+        merge_catalog_snapshot(path, [("맥북", now - 1000, generate_dummy_products("맥북", 1))], max_age=100)
+
+        snapshot = CatalogSnapshot()
+        snapshot.load(path)
+        assert len(snapshot.lookup("갤럭시 S24")) == 3
+        assert len(snapshot.lookup("아이폰 15")) == 2
+        assert "맥북" not in snapshot
+        snapshot.close()
+
+    def test_corrupt_existing_snapshot_replaced(self, tmp_path):
+        path = tmp_path / "catalog.bin"
+        path.write_bytes(b"XXXX" + b"\0" * 64)
+        assert merge_catalog_snapshot(str(path), [("아이폰 15", time.time(), generate_dummy_products("아이폰 15", 2))]) == 2
+
+    def test_collect_runs_on_event_loop(self, tmp_path):
+        """수집 함수(검색 결과 복사)는 이벤트 루프 스레드에서, 저장은 작업 스레드에서 실행"""
+        threads = []
+
+        def collect():
+            threads.append(threading.current_thread())
+            return [("아이폰 15", time.time(), generate_dummy_products("아이폰 15", 2))]
+
+        snapshotter = CatalogSnapshotter(str(tmp_path / "catalog.bin"), collect)
+        asyncio.run(snapshotter.stop())
+
+        assert threads == [threading.main_thread()]
+        assert (tmp_path / "catalog.bin").exists()
+
+
+class TestCatalogColdStart:
+    """재시작 후 스냅샷으로 바로 응답"""
+
+    def test_restart_serves_known_products(self, tmp_path):
+        from app.api import search
+        from app.main import app
+
+        settings = Settings(catalog_snapshot_path=str(tmp_path / "catalog.bin"), hot_query_enabled=False)
+        search.catalog_updates.clear()
+        with patch("app.main.get_settings", return_value=settings):
+            with TestClient(app) as client:
+                first = client.post("/api/products", json={"query": "카탈로그 테스트"}).json()
+            # 재시작 전 프로세스 상태 제거
+            search.catalog_updates.clear()
+
+            with TestClient(app) as client, \
+                 patch("app.api.search.generate_dummy_products") as generate:
+                second = client.post("/api/products", json={"query": "카탈로그  테스트"}).json()
+                generate.assert_not_called()
+
+        assert [p["product_id"] for p in second["products"]] == [p["product_id"] for p in first["products"]]
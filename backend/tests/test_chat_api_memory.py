@@ -170,4 +170,28 @@ class TestChatAPIMemory:
             
             # 스트리밍 응답인지 확인
             assert response.status_code == 200
-            assert response.headers.get("content-type") == "text/plain; charset=utf-8" 
\ No newline at end of file
+            assert response.headers.get("content-type") == "text/plain; charset=utf-8" 
+    
+    def test_chat_api_streams_agent_chunks(self, client):
+        """스트리밍 API가 Agent 조각을 그대로 전달하고 히스토리에 저장하는지 테스트"""
+        thread_id = str(uuid.uuid4())
+        request_data = {
+            "query": "갤럭시 추천해줘",
+            "thread_id": thread_id,
+            "user_id": str(uuid.uuid4())
+        }
+        
+        with patch('app.api.chat.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.stream_products_with_memory.return_value = iter(["갤럭시 ", "S24를\n", "추천합니다"])
+            mock_get_agent.return_value = mock_agent
+            
+            response = client.post("/api/chat/stream", json=request_data)
+        
+        assert response.status_code == 200
+        assert response.text == "갤럭시 S24를\n추천합니다"
+        assert response.headers["x-thread-id"] == thread_id
+        
+        history = client.get("/api/chat/history", params={"thread_id": thread_id}).json()
+        assert history["history"][0]["bot_response"] == "갤럭시 S24를\n추천합니다"
+        assert history["history"][0]["message_id"] == response.headers["x-message-id"]
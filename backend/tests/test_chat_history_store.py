@@ -0,0 +1,214 @@
+"""
+채팅 히스토리 링 버퍼 저장소 테스트
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+from app.services.chat_history import ChatHistoryStore
+
+
+class TestChatHistoryStore:
+    """ChatHistoryStore 테스트"""
+
+    def test_recent_is_newest_first(self):
+        """최신순 조회 테스트"""
+        store = ChatHistoryStore(capacity=10)
+        for i in range(5):
+            store.append(i)
+
+        items, cursor = store.recent(3)
+        assert items == [4, 3, 2]
+        items, cursor = store.recent(3, cursor)
+        assert items == [1, 0]
+        assert cursor is None
+
+    def test_ring_buffer_evicts_oldest(self):
+        """용량 초과 시 가장 오래된 항목 제거"""
+        store = ChatHistoryStore(capacity=3)
+        for i in range(5):
+            store.append(i, thread_id="t1" if i % 2 == 0 else "t2")
+
+        assert len(store) == 3
+        items, _ = store.recent(10)
+        assert items == [4, 3, 2]
+        # 제거된 항목은 인덱스에서도 빠져야 함
+        assert store.count(thread_id="t1") == 2
+        assert store.count(thread_id="t2") == 1
+        assert store.last() == 4
+
+    def test_get_by_seq(self):
+        """시퀀스 번호 조회 (밀려나거나 삭제된 항목은 None)"""
+        store = ChatHistoryStore(capacity=3)
+        seqs = [store.append(i) for i in range(5)]
+        assert store.oldest_seq == 2
+        assert [store.get(seq) for seq in seqs] == [None, None, 2, 3, 4]
+        assert store.get(5) is None
+
+        store.clear()
+        assert store.get(4) is None
+        assert store.oldest_seq == 5
+
+    def test_thread_and_user_index(self):
+        """스레드/사용자별 인덱스 조회"""
+        store = ChatHistoryStore(capacity=100)
+        for i in range(10):
+            store.append(i, thread_id=f"thread-{i % 2}", user_id=f"user-{i % 3}")
+
+        items, cursor = store.recent(3, thread_id="thread-0")
+        assert items == [8, 6, 4]
+        items, cursor = store.recent(3, cursor, thread_id="thread-0")
+        assert items == [2, 0]
+        assert cursor is None
+
+        items, _ = store.recent(10, user_id="user-1")
+        assert items == [7, 4, 1]
+        assert store.recent(10, thread_id="unknown")[0] == []
+
+    def test_clear(self):
+        """전체 삭제 테스트"""
+        store = ChatHistoryStore(capacity=5)
+        store.append("a", thread_id="t")
+        assert store.clear() == 1
+        assert len(store) == 0
+        assert store.last() is None
+        assert store.count(thread_id="t") == 0
+
+    def test_since_cursor_sync(self):
+        """since 커서로 새 항목만 조회"""
+        store = ChatHistoryStore(capacity=100)
+        store.append("a", thread_id="t")
+        store.append("x", thread_id="other")
+        store.append("b", thread_id="t")
+
+        items, cursor, has_more = store.since(thread_id="t")
+        assert items == ["a", "b"]
+        assert not has_more
+
+        items, cursor, _ = store.since(cursor, thread_id="t")
+        assert items == []
+
+        store.append("c", thread_id="t")
+        items, cursor, _ = store.since(cursor, thread_id="t")
+        assert items == ["c"]
+
+    def test_since_limit(self):
+        """since 조회 개수 제한"""
+        store = ChatHistoryStore(capacity=100)
+        for i in range(5):
+            store.append(i)
+
+        items, cursor, has_more = store.since(limit=3)
+        assert items == [0, 1, 2]
+        assert has_more
+        items, cursor, has_more = store.since(cursor, limit=3)
+        assert items == [3, 4]
+        assert not has_more
+
+    def test_forget_thread_hides_items_everywhere(self):
+        """삭제한 스레드 항목은 전체/사용자 조회, 동기화, 개수에서 모두 제외"""
+        store = ChatHistoryStore(capacity=4)
+        for i in range(4):
+            store.append(i, thread_id="gone" if i % 2 else "kept", user_id="u1")
+
+        assert store.forget_thread("gone") == 2
+        assert len(store) == store.count() == 2
+        assert store.count(user_id="u1") == 2
+        assert store.recent(10)[0] == [2, 0]
+        assert store.recent(10, user_id="u1")[0] == [2, 0]
+        assert store.since()[0] == [0, 2]
+        assert store.get(1) is None and store.get(2) == 2
+        assert store.last() == 2
+
+        items, cursor = store.recent(1)
+        assert items == [2] and cursor is not None
+        assert store.recent(1, cursor) == ([0], None)
+
+        # 삭제 표시 자리도 용량 초과 시 정상적으로 밀려남
+        for i in range(4, 7):
+            store.append(i, user_id="u1")
+        assert store.recent(10)[0] == [6, 5, 4]
+        assert len(store) == 3
+        assert store.clear() == 3
+
+
+class TestChatHistoryStoreResize:
+    """ChatHistoryStore 용량 변경 테스트"""
+
+    def test_shrink_keeps_newest(self):
+        """용량을 줄이면 가장 오래된 항목부터 제거"""
+        store = ChatHistoryStore(capacity=5)
+        for i in range(5):
+            store.append(i, thread_id="t1")
+
+        store.resize(2)
+
+        assert store.capacity == 2
+        assert store.recent(10)[0] == [4, 3]
+        assert store.count(thread_id="t1") == 2
+        store.append(5, thread_id="t1")
+        assert store.recent(10)[0] == [5, 4]
+
+    def test_grow_keeps_cursor(self):
+        """용량을 늘려도 기존 커서로 이어서 동기화 가능"""
+        store = ChatHistoryStore(capacity=3)
+        for i in range(4):
+            store.append(i)
+        _, cursor, _ = store.since()
+
+        store.resize(10)
+        for i in range(4, 8):
+            store.append(i)
+
+        items, _, _ = store.since(cursor)
+        assert items == [4, 5, 6, 7]
+        assert store.recent(10)[0] == [7, 6, 5, 4, 3, 2, 1]
+
+    def test_invalid_capacity(self):
+        """용량은 1 이상"""
+        with pytest.raises(ValueError):
+            ChatHistoryStore(capacity=3).resize(0)
+
+
+class TestChatHistoryEndpoint:
+    """스레드별 채팅 히스토리 조회 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        """테스트 클라이언트 생성"""
+        from app.main import app
+        return TestClient(app)
+
+    def test_history_filtered_by_thread(self, client):
+        """thread_id로 히스토리 필터링"""
+        client.delete("/api/chat/history")
+
+        with patch('app.api.chat.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products_with_memory.return_value = "응답"
+            mock_get_agent.return_value = mock_agent
+            client.post("/api/chat", json={"query": "질문 A", "thread_id": "thread-a"})
+            client.post("/api/chat", json={"query": "질문 B", "thread_id": "thread-b"})
+            client.post("/api/chat", json={"query": "질문 A2", "thread_id": "thread-a"})
+
+        data = client.get("/api/chat/history", params={"thread_id": "thread-a"}).json()
+        assert [h["user_message"] for h in data["history"]] == ["질문 A2", "질문 A"]
+        assert data["total_count"] == 2
+        assert all(h["thread_id"] == "thread-a" for h in data["history"])
+
+
+    def test_sync_endpoint_returns_only_new_turns(self, client):
+        """증분 동기화 엔드포인트는 커서 이후 턴만 반환"""
+        with patch('app.api.chat.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products_with_memory.return_value = "응답"
+            mock_get_agent.return_value = mock_agent
+
+            client.post("/api/chat", json={"query": "첫 질문", "thread_id": "sync-thread"})
+            first = client.get("/api/chat/sync/sync-thread").json()
+            client.post("/api/chat", json={"query": "두 번째 질문", "thread_id": "sync-thread"})
+            second = client.get("/api/chat/sync/sync-thread", params={"since": first["cursor"]}).json()
+
+        assert [h["user_message"] for h in first["history"]][-1] == "첫 질문"
+        assert [h["user_message"] for h in second["history"]] == ["두 번째 질문"]
+        assert client.get("/api/chat/sync/sync-thread", params={"since": "bad"}).status_code == 400
@@ -0,0 +1,146 @@
+"""
+대화 상태 체크포인터 테스트
+"""
+
+import uuid
+import pytest
+from unittest.mock import patch
+
+from app.agents.checkpointer import ConversationCheckpointer
+from app.config import Settings
+
+
+class FakeClock:
+    """테스트용 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_agent(**overrides):
+    """지연 없는 가짜 제공자를 사용하는 Agent"""
+    from app.agents.product_search_agent import ProductSearchAgent
+
+    values = dict(
+        llm_provider="fake",
+        search_provider="fake",
+        fake_latency_distribution="fixed",
+        fake_llm_first_token_ms=0,
+        fake_llm_tokens_per_second=0,
+        fake_search_latency_ms=0,
+    )
+    values.update(overrides)
+    with patch("app.agents.product_search_agent.get_settings", return_value=Settings(**values)):
+        return ProductSearchAgent()
+
+
+class TestConversationCheckpointer:
+    """ConversationCheckpointer 정리/만료 테스트"""
+
+    def _run_turns(self, agent, thread_id, count):
+        for i in range(count):
+            agent.search_products_with_memory(f"갤럭시 스마트폰 {i}", thread_id, "u1")
+
+    def test_prune_keeps_latest_checkpoint(self):
+        """턴이 끝나면 최신 체크포인트만 남고 이전 채널 값은 삭제"""
+        agent = fake_agent()
+        self._run_turns(agent, "t1", 5)
+
+        checkpointer = agent.checkpointer
+        assert len(checkpointer.storage["t1"][""]) == 1
+        # 최신 체크포인트가 가리키는 채널 값만 남음
+        latest = checkpointer.get_tuple({"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}).checkpoint
+        assert len(checkpointer.blobs) <= len(latest["channel_versions"])
+        assert len(agent.get_turns("t1")) == 5
+
+    def test_state_survives_pruning(self):
+        """정리 후에도 다음 턴이 이전 대화를 그대로 이어감"""
+        agent = fake_agent()
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", "t1", "u1")
+        self._run_turns(agent, "t1", 3)
+
+        history = agent.get_conversation_history("t1")
+        assert history.startswith("\n## 이전 대화 내용:\n1. 사용자: 갤럭시 스마트폰 추천해줘\n")
+        assert "4. 사용자: 갤럭시 스마트폰 2" in history
+
+    def test_delete_thread_only_removes_that_thread(self):
+        """스레드 삭제 시 다른 스레드 상태는 유지"""
+        agent = fake_agent()
+        self._run_turns(agent, "t1", 2)
+        self._run_turns(agent, "t2", 2)
+
+        assert agent.forget_thread("t1") == 2
+        assert agent.get_turns("t1") == []
+        assert len(agent.get_turns("t2")) == 2
+        assert all(key[0] == "t2" for key in agent.checkpointer.blobs)
+
+    def test_expire_idle_threads_by_ttl(self):
+        """TTL이 지난 유휴 스레드 삭제"""
+        clock = FakeClock()
+        checkpointer = ConversationCheckpointer(ttl_seconds=60, clock=clock)
+        agent = fake_agent()
+        agent.checkpointer = checkpointer
+        agent._create_memory_agent()
+
+        self._run_turns(agent, "old", 1)
+        clock.now = 30
+        self._run_turns(agent, "recent", 1)
+        clock.now = 70
+
+        assert checkpointer.expire_idle() == ["old"]
+        assert checkpointer.thread_ids() == ["recent"]
+
+    def test_expire_over_max_threads(self):
+        """최대 스레드 수를 넘으면 가장 오래 사용하지 않은 스레드부터 삭제"""
+        agent = fake_agent(max_conversation_threads=2)
+        for thread_id in ["a", "b", "c"]:
+            self._run_turns(agent, thread_id, 1)
+        # a를 다시 사용하기 전에 이미 b, c만 남음
+        assert agent.checkpointer.thread_ids() == ["b", "c"]
+
+        self._run_turns(agent, "b", 1)
+        self._run_turns(agent, "d", 1)
+        assert agent.checkpointer.thread_ids() == ["b", "d"]
+
+    def test_unknown_prune_strategy(self):
+        """지원하지 않는 정리 전략은 ValueError"""
+        with pytest.raises(ValueError):
+            ConversationCheckpointer().prune(["t1"], strategy="keep_first")
+
+
+class TestSingleConversationState:
+    """체크포인터 단일 상태 경로 테스트"""
+
+    def test_ephemeral_search_leaves_no_thread(self):
+        """단발성 검색과 thread_id 없는 대화는 체크포인트를 남기지 않음"""
+        agent = fake_agent()
+
+        agent.search_products("아이폰 15")
+        agent.search_products_with_memory("갤럭시 S24")
+        list(agent.stream_products_with_memory("갤럭시 탭"))
+
+        assert agent.thread_count() == 0
+
+    def test_stream_and_invoke_share_thread_state(self):
+        """스트리밍/일반 응답이 같은 스레드 상태를 공유"""
+        agent = fake_agent()
+        thread_id = str(uuid.uuid4())
+
+        streamed = "".join(agent.stream_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1"))
+        response = agent.search_products_with_memory("그 중에서 50만원 이하", thread_id, "u1")
+
+        turns = agent.get_turns(thread_id)
+        assert [turn["user"] for turn in turns] == ["갤럭시 스마트폰 추천해줘", "그 중에서 50만원 이하"]
+        assert turns[0]["ai"] == streamed
+        assert "갤럭시 스마트폰 추천해줘" in response
+
+    def test_add_to_conversation_history(self):
+        """직접 추가한 턴도 체크포인트에 저장"""
+        agent = fake_agent()
+        agent.add_to_conversation_history("t1", "질문", "답변")
+
+        assert agent.get_turns("t1") == [{"user": "질문", "ai": "답변"}]
+        assert "1. 사용자: 질문\n1. AI: 답변" in agent.get_conversation_history("t1")
@@ -4,6 +4,15 @@ from unittest.mock import patch
 from app.config import Config
 
 
+@pytest.fixture
+def keep_reload_callbacks():
+    """모듈 재로드로 초기화되는 설정 재로드 콜백 목록을 테스트 후 복원"""
+    from app import config
+    callbacks = list(config._reload_callbacks)
+    yield
+    config._reload_callbacks[:] = callbacks
+
+
 class TestConfiguration:
     """설정 및 환경 관리 테스트"""
     
@@ -36,6 +45,7 @@ class TestConfiguration:
         assert settings.fastapi_port == 8000
         assert settings.environment == "development"
         
+    @pytest.mark.usefixtures("keep_reload_callbacks")
     @patch.dict(os.environ, {
         "FASTAPI_HOST": "0.0.0.0",
         "FASTAPI_PORT": "9000",
@@ -91,6 +101,9 @@ class TestConfiguration:
         os.environ['LANGSMITH_API_KEY'] = 'test_langsmith_key'
         os.environ['LANGSMITH_PROJECT'] = 'test_project'
         
+        # 설정은 캐시되므로 환경 변수 변경은 재로드로 반영
+        from app.config import reload_settings
+        reload_settings()
         config = Config()
         
         assert config.GOOGLE_API_KEY == 'test_google_key'
@@ -101,6 +114,58 @@ class TestConfiguration:
         del os.environ['GOOGLE_API_KEY']
         del os.environ['LANGSMITH_API_KEY'] 
         del os.environ['LANGSMITH_PROJECT']
+        reload_settings()
+
+
+
+class TestSettingsCache:
+    """설정 캐시 및 재로드 테스트"""
+    
+    def test_get_settings_is_cached(self):
+        """get_settings는 프로세스당 한 번만 파싱"""
+        from app.config import get_settings
+        assert get_settings() is get_settings()
+        
+    def test_reload_settings_applies_new_values(self):
+        """재로드 시 새 환경 변수 반영 및 콜백 호출"""
+        from app import config as app_config
+        
+        received = []
+        app_config.on_settings_reload(received.append)
+        try:
+            with patch.dict(os.environ, {"CHAT_HISTORY_CAPACITY": "123", "GOOGLE_API_KEY": "reloaded_key"}):
+                new_settings = app_config.reload_settings()
+            
+            assert new_settings.chat_history_capacity == 123
+            assert app_config.get_settings() is new_settings
+            assert app_config.config.GOOGLE_API_KEY == "reloaded_key"
+            assert received == [new_settings]
+        finally:
+            app_config._reload_callbacks.remove(received.append)
+            app_config.reload_settings()
+            
+    def test_reload_settings_rejects_invalid_values(self):
+        """잘못된 값이면 예외를 내고 기존 설정 유지"""
+        from pydantic import ValidationError
+        from app import config as app_config
+        
+        before = app_config.get_settings()
+        with patch.dict(os.environ, {"CHAT_HISTORY_CAPACITY": "0"}):
+            with pytest.raises(ValidationError):
+                app_config.reload_settings()
+        
+        assert app_config.get_settings() is before
+
+    def test_reload_settings_parses_once(self):
+        """재로드는 설정을 한 번만 파싱하고 검증한 인스턴스를 그대로 사용"""
+        from app import config as app_config
+        
+        with patch.object(app_config, "Settings", wraps=app_config.Settings) as settings_class:
+            new_settings = app_config.reload_settings()
+        
+        assert settings_class.call_count == 1
+        assert app_config.get_settings() is new_settings
+        assert app_config.Config().GOOGLE_API_KEY == (new_settings.google_api_key or "")
 
 
 if __name__ == "__main__":
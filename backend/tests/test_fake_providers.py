@@ -0,0 +1,205 @@
+import pytest
+import random
+import uuid
+from unittest.mock import patch
+
+from app.agents.fake_providers import (
+    FakeChatModel,
+    FakeProviderError,
+    FakeSearchTool,
+    LatencyModel,
+)
+from app.config import Settings
+
+
+class TestLatencyModel:
+    """지연 시간 분포 모델 테스트"""
+
+    def test_fixed_distribution(self):
+        """fixed 분포는 항상 평균값"""
+        latency = LatencyModel(250, 100, "fixed")
+        assert all(latency.sample() == 0.25 for _ in range(10))
+
+    @pytest.mark.parametrize("distribution", ["uniform", "normal", "lognormal"])
+    def test_distribution_mean(self, distribution):
+        """분포별 샘플 평균이 설정한 평균에 근접"""
+        latency = LatencyModel(200, 50, distribution, random.Random(1))
+        samples = [latency.sample() for _ in range(5000)]
+
+        assert all(sample >= 0 for sample in samples)
+        assert sum(samples) / len(samples) == pytest.approx(0.2, rel=0.05)
+
+    def test_uniform_bounds(self):
+        """uniform 분포는 평균 ± 편차 범위 안"""
+        latency = LatencyModel(100, 20, "uniform", random.Random(1))
+        assert all(0.08 <= latency.sample() <= 0.12 for _ in range(1000))
+
+    def test_seeded_samples_are_reproducible(self):
+        """같은 시드면 같은 지연 시퀀스"""
+        first = LatencyModel(300, 100, "lognormal", random.Random(42))
+        second = LatencyModel(300, 100, "lognormal", random.Random(42))
+        assert [first.sample() for _ in range(20)] == [second.sample() for _ in range(20)]
+
+    def test_unknown_distribution(self):
+        """지원하지 않는 분포는 ValueError"""
+        with pytest.raises(ValueError):
+            LatencyModel(100, 10, "pareto")
+
+
+class TestFakeSearchTool:
+    """가짜 검색 도구 테스트"""
+
+    def test_results_are_deterministic(self):
+        """같은 쿼리는 인스턴스와 관계없이 항상 같은 결과"""
+        query = "갤럭시 스마트폰"
+        assert FakeSearchTool().run(query) == FakeSearchTool().run(query)
+        assert FakeSearchTool().run(query) != FakeSearchTool().run("아이폰")
+
+    def test_result_format(self):
+        """쿼리, 쇼핑몰, 가격을 포함한 결과 라인"""
+        lines = FakeSearchTool(result_count=3).run("무선 이어폰").splitlines()
+
+        assert len(lines) == 3
+        assert all(line.startswith("무선 이어폰") and line.endswith(")") and "원" in line for line in lines)
+
+    def test_error_injection(self):
+        """에러 주입 확률 1이면 항상 실패, 0이면 항상 성공"""
+        with pytest.raises(FakeProviderError):
+            FakeSearchTool(error_rate=1.0).run("노트북")
+        assert FakeSearchTool(error_rate=0.0).run("노트북")
+
+    def test_partial_error_rate(self):
+        """에러율에 비례해 실패"""
+        tool = FakeSearchTool(error_rate=0.3, rng=random.Random(7))
+        failures = 0
+        for _ in range(2000):
+            try:
+                tool.run("노트북")
+            except FakeProviderError:
+                failures += 1
+        assert failures / 2000 == pytest.approx(0.3, abs=0.04)
+
+
+class TestFakeChatModel:
+    """가짜 LLM 테스트"""
+
+    def _messages(self, history: str = ""):
+        return [
+            {"role": "system", "content": f"이전 대화:\n{history}\n웹 검색 결과:\n{FakeSearchTool().run('갤럭시')}"},
+            {"role": "user", "content": "그 중에서 50만원 이하인 것만"},
+        ]
+
+    def test_invoke_mentions_previous_query(self):
+        """프롬프트의 첫 사용자 질문을 응답에 언급"""
+        history = "1. 사용자: 갤럭시 스마트폰 추천해줘\n   AI: 추천 목록입니다"
+        response = FakeChatModel().invoke(self._messages(history))
+
+        assert "갤럭시 스마트폰 추천해줘" in response.content
+        assert "갤럭시 모델 1" in response.content
+
+    def test_invoke_without_history(self):
+        """이전 대화가 없으면 맥락 문구 없음"""
+        response = FakeChatModel().invoke(self._messages())
+        assert "이전에 문의하신" not in response.content
+
+    def test_stream_matches_invoke(self):
+        """스트리밍 토큰을 이으면 invoke 결과와 동일"""
+        model = FakeChatModel()
+        chunks = list(model.stream(self._messages()))
+
+        assert len(chunks) > 1
+        assert "".join(chunk.content for chunk in chunks) == model.invoke(self._messages()).content
+
+    def test_token_rate(self):
+        """초당 토큰 수에 맞춰 토큰 사이 대기"""
+        model = FakeChatModel(tokens_per_second=100)
+        with patch("app.agents.fake_providers.time.sleep") as mock_sleep:
+            chunks = list(model.stream(self._messages()))
+
+        assert mock_sleep.call_count == len(chunks) - 1
+        mock_sleep.assert_called_with(0.01)
+
+    def test_error_injection(self):
+        """에러 주입 시 invoke/stream 모두 실패"""
+        model = FakeChatModel(error_rate=1.0)
+        with pytest.raises(FakeProviderError):
+            model.invoke(self._messages())
+        with pytest.raises(FakeProviderError):
+            list(model.stream(self._messages()))
+
+    def test_bound_tools_request_search_for_new_query(self):
+        """도구를 연결하면 이전 검색 결과가 없는 질문에 검색 도구 호출"""
+        model = FakeChatModel().bind_tools(["web_search"])
+        response = model.invoke([{"role": "user", "content": "갤럭시 스마트폰 추천해줘"}])
+
+        assert response.tool_calls[0]["name"] == "web_search"
+        assert response.tool_calls[0]["args"] == {"query": "갤럭시 스마트폰 추천해줘"}
+
+        chunks = list(model.stream([{"role": "user", "content": "갤럭시 스마트폰 추천해줘"}]))
+        assert chunks[0].tool_calls[0]["args"] == {"query": "갤럭시 스마트폰 추천해줘"}
+
+    def test_bound_tools_skip_search_for_follow_up(self):
+        """이전 검색 결과가 있는 후속 질문이나 검색을 마친 턴은 바로 응답"""
+        model = FakeChatModel().bind_tools(["web_search"])
+        follow_up = [
+            {"role": "system", "content": f"## 이전 검색 결과:\n{FakeSearchTool().run('갤럭시')}"},
+            {"role": "user", "content": "그 중에서 50만원 이하인 것만"},
+        ]
+        searched = [
+            {"role": "user", "content": "갤럭시 스마트폰 추천해줘"},
+            {"role": "tool", "content": FakeSearchTool().run("갤럭시")},
+        ]
+
+        assert model.invoke(follow_up).tool_calls == []
+        assert "갤럭시 모델 1" in model.invoke(searched).content
+        # 원본 모델은 도구가 연결되지 않은 상태 유지
+        assert FakeChatModel().invoke(searched[:1]).tool_calls == []
+
+
+class TestFakeProviderSelection:
+    """Settings 기반 제공자 선택 테스트"""
+
+    def _fake_settings(self, **overrides):
+        values = dict(
+            llm_provider="fake",
+            search_provider="fake",
+            fake_llm_first_token_ms=0,
+            fake_search_latency_ms=0,
+            fake_seed=1,
+        )
+        values.update(overrides)
+        return Settings(**values)
+
+    def test_agent_uses_fake_providers(self):
+        """fake 설정이면 API 키 없이도 메모리 Agent 사용"""
+        with patch("app.agents.product_search_agent.get_settings", return_value=self._fake_settings()), \
+             patch("app.agents.product_search_agent.config.GOOGLE_API_KEY", None):
+            from app.agents.product_search_agent import ProductSearchAgent
+            agent = ProductSearchAgent()
+
+        assert isinstance(agent.search_tool, FakeSearchTool)
+        assert isinstance(agent.llm, FakeChatModel)
+        assert agent.use_agent is True
+
+    def test_fake_multiturn_memory(self):
+        """가짜 제공자로 전체 멀티턴 메모리 경로가 결정적으로 동작"""
+        with patch("app.agents.product_search_agent.get_settings", return_value=self._fake_settings()):
+            from app.agents.product_search_agent import ProductSearchAgent
+            agent = ProductSearchAgent()
+
+        thread_id, user_id = str(uuid.uuid4()), str(uuid.uuid4())
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, user_id)
+        response = agent.search_products_with_memory("그 중에서 50만원 이하", thread_id, user_id)
+
+        assert "갤럭시 스마트폰 추천해줘" in response
+
+    def test_search_only_fake(self):
+        """검색만 fake로 지정하면 LLM은 기존 설정을 따름"""
+        with patch("app.agents.product_search_agent.get_settings", return_value=self._fake_settings(llm_provider="gemini")), \
+             patch("app.agents.product_search_agent.config.GOOGLE_API_KEY", None):
+            from app.agents.product_search_agent import ProductSearchAgent
+            agent = ProductSearchAgent()
+
+        assert isinstance(agent.search_tool, FakeSearchTool)
+        assert agent.llm is None
+        assert agent.use_agent is False
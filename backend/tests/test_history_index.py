@@ -0,0 +1,184 @@
+"""
+검색/대화 기록 전문 검색 인덱스 테스트
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.history_index import HistoryIndex, history_index, tokenize
+
+
+def _refs(hits):
+    """(문서 번호, kind, ref) 검색 결과에서 (kind, ref)만"""
+    return [(kind, ref) for _, kind, ref in hits]
+
+
+class TestHistoryIndex:
+    """n-gram 역색인 테스트"""
+
+    def test_tokenize_korean_bigrams(self):
+        assert tokenize("갤럭시폰") == {"갤럭", "럭시", "시폰"}
+        # 정규화 후 색인하므로 영문 표기도 같은 단위
+        assert tokenize("Galaxy") == tokenize("갤럭시")
+
+    def test_partial_word_and_spacing(self):
+        """띄어쓰기/부분 단어가 달라도 찾고, 모든 단어를 포함해야 일치"""
+        index = HistoryIndex()
+        index.add("search", "a", ["갤럭시 S24 울트라", "갤럭시S24 케이스"])
+        index.add("search", "b", ["아이폰 15 프로"])
+        index.add("chat", 0, ["노트북 추천해줘", "맥북 에어를 추천합니다"])
+
+        assert _refs(index.search("갤럭시")) == [("search", "a")]
+        assert _refs(index.search("galaxy s24")) == [("search", "a")]
+        assert _refs(index.search("케이스 갤럭시")) == [("search", "a")]
+        assert _refs(index.search("추천")) == [("chat", 0)]
+        assert _refs(index.search("추천", kind="search")) == []
+        assert _refs(index.search("갤럭시 아이폰")) == []
+
+    def test_single_character_and_ngram_order(self):
+        index = HistoryIndex()
+        index.add("search", "a", ["아이폰"])
+        index.add("search", "b", ["폰아이"])
+        assert _refs(index.search("폰")) == [("search", "b"), ("search", "a")]
+        assert index._char_terms["폰"] == {"이폰", "폰아"}
+        # n-gram은 모두 있지만 원문에 없는 단어는 제외
+        index.add("search", "c", ["시갤 럭시"])
+        assert _refs(index.search("갤럭시")) == []
+
+    def test_replace_remove_prune_clear(self):
+        index = HistoryIndex()
+        for seq in range(5):
+            index.add("chat", seq, [f"질문 {seq} 노트북"])
+        index.add("search", "x", ["노트북"])
+
+        assert index.prune("chat", 3) == 3
+        assert [ref for _, _, ref in index.search("노트북")] == ["x", 4, 3]
+
+        index.add("chat", 4, ["태블릿"])
+        assert _refs(index.search("태블릿")) == [("chat", 4)]
+        assert index.remove("chat", 4) and not index.remove("chat", 4)
+
+        assert index.clear("chat") == 1
+        assert _refs(index.search("노트북")) == [("search", "x")]
+        assert index.clear() == 1 and len(index) == 0
+        assert index._postings == {} and index._char_terms == {}
+
+    def test_repeated_character_terms(self):
+        """같은 글자가 반복된 색인 단위("11", "ㅋㅋ")도 삭제/초기화 가능"""
+        index = HistoryIndex()
+        index.add("search", "a", ["아이폰 11"])
+        index.add("chat", 1, ["ㅋㅋ 좋아요"])
+        assert _refs(index.search("1")) == [("search", "a")]
+
+        assert index.remove("search", "a")
+        assert index.clear("chat") == 1
+        assert len(index) == 0
+        assert index._postings == {} and index._char_terms == {}
+
+    def test_limit_and_before(self):
+        """최신순으로 limit개까지, before 이전 문서만"""
+        index = HistoryIndex()
+        for seq in range(5):
+            index.add("chat", seq, ["노트북"])
+        index.add("search", "x", ["노트북 가방"])
+
+        hits = index.search("노트북", limit=2)
+        assert [ref for _, _, ref in hits] == ["x", 4]
+        hits = index.search("노트북", limit=2, before=hits[-1][0])
+        assert [ref for _, _, ref in hits] == [3, 2]
+        assert [ref for _, _, ref in index.search("노트북", kind="chat", limit=1)] == [4]
+
+    def test_char_map_follows_removal(self):
+        """한 글자 검색용 글자 맵은 색인 단위가 사라지면 함께 정리"""
+        index = HistoryIndex()
+        index.add("search", "a", ["폰"])
+        index.add("search", "b", ["폰케이스"])
+        assert _refs(index.search("폰")) == [("search", "b"), ("search", "a")]
+
+        index.remove("search", "b")
+        assert "케" not in index._char_terms
+        assert _refs(index.search("폰")) == [("search", "a")]
+
+
+class TestHistorySearchApi:
+    """/api/history/search 엔드포인트 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        from app.main import app
+        client = TestClient(app)
+        client.delete("/api/history")
+        client.delete("/api/chat/history")
+        yield client
+        client.delete("/api/history")
+        client.delete("/api/chat/history")
+
+    def test_search_results_and_chat(self, client):
+        first = client.post("/api/products", json={"query": "무선 이어폰"}).json()
+        client.post("/api/products", json={"query": "기계식 키보드"})
+        with patch("app.api.chat.get_agent") as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products_with_memory.return_value = "에어팟 프로를 추천합니다"
+            mock_get_agent.return_value = mock_agent
+            client.post("/api/chat", json={"query": "이어폰 추천해줘", "thread_id": "t1"})
+
+        data = client.get("/api/history/search", params={"q": "이어폰"}).json()
+        assert len(data["results"]) == 2 and data["next_cursor"] is None
+        chat_hit, search_hit = data["results"]
+        assert chat_hit["kind"] == "chat" and chat_hit["thread_id"] == "t1"
+        assert chat_hit["snippet"] == "에어팟 프로를 추천합니다"
+        assert search_hit["id"] == first["search_id"]
+        assert search_hit["snippet"].startswith("무선 이어폰 - 상품")
+
+        # 상품명으로도 검색
+        data = client.get("/api/history/search", params={"q": "키보드 상품 3번", "kind": "search"}).json()
+        assert [hit["query"] for hit in data["results"]] == ["기계식 키보드"]
+
+    def test_pagination_and_clear(self, client):
+        for i in range(3):
+            client.post("/api/products", json={"query": f"모니터 {i}"})
+
+        first = client.get("/api/history/search", params={"q": "모니터", "limit": 2}).json()
+        assert [hit["query"] for hit in first["results"]] == ["모니터 2", "모니터 1"]
+        second = client.get(
+            "/api/history/search", params={"q": "모니터", "limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert [hit["query"] for hit in second["results"]] == ["모니터 0"]
+        assert second["next_cursor"] is None
+
+        client.delete("/api/history")
+        assert client.get("/api/history/search", params={"q": "모니터"}).json()["results"] == []
+
+    def test_deleted_thread_not_searchable(self, client):
+        """삭제한 스레드의 대화는 기록 검색에서도 빠짐"""
+        with patch("app.api.chat.get_agent") as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products_with_memory.return_value = "태블릿을 추천합니다"
+            mock_agent.forget_thread.return_value = 1
+            mock_get_agent.return_value = mock_agent
+            client.post("/api/chat", json={"query": "태블릿 추천", "thread_id": "gone"})
+            client.post("/api/chat", json={"query": "태블릿 가격", "thread_id": "kept"})
+            assert client.delete("/api/chat/history/gone").status_code == 200
+
+        data = client.get("/api/history/search", params={"q": "태블릿"}).json()
+        assert [hit["thread_id"] for hit in data["results"]] == ["kept"]
+
+    def test_evicted_hits_are_skipped(self, client):
+        """원본이 밀려난 기록은 건너뛰고 페이지를 채움"""
+        from app.api.search import search_results_store
+
+        ids = [client.post("/api/products", json={"query": f"스피커 {i}"}).json()["search_id"] for i in range(4)]
+        del search_results_store[ids[2]]
+        data = client.get("/api/history/search", params={"q": "스피커", "limit": 2}).json()
+        assert [hit["query"] for hit in data["results"]] == ["스피커 3", "스피커 1"]
+        assert data["next_cursor"] is not None
+        # 밀려난 기록은 인덱스에서도 정리됨
+        assert ("search", ids[2]) not in _refs(history_index.search("스피커"))
+
+    def test_invalid_parameters(self, client):
+        assert client.get("/api/history/search", params={"q": ""}).status_code == 422
+        assert client.get("/api/history/search", params={"q": "   "}).status_code == 400
+        assert client.get("/api/history/search", params={"q": "a", "kind": "other"}).status_code == 422
+        assert client.get("/api/history/search", params={"q": "a", "cursor": "bogus"}).status_code == 400
@@ -0,0 +1,183 @@
+import asyncio
+import uuid
+from unittest.mock import Mock, patch
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.services.hot_queries import HotQueryIndex, HotQueryScheduler, QueryFrequencyTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryFrequencyTracker:
+    """검색어 빈도 집계 테스트"""
+
+    def test_top_queries(self):
+        """요청 수가 많은 순서로 상위 k개 (공백 정규화)"""
+        tracker = QueryFrequencyTracker(clock=FakeClock())
+        for query in ["갤럭시 S24", "갤럭시  S24 ", "아이폰 15", "갤럭시 S24", "맥북"]:
+            tracker.record(query)
+
+        top = tracker.top(2)
+        assert [key for key, _ in top] == ["갤럭시 S24", "아이폰 15"]
+        assert top[0][1] == 3
+
+    def test_scores_decay(self):
+        """반감기가 지나면 점수가 절반"""
+        clock = FakeClock()
+        tracker = QueryFrequencyTracker(half_life=60, clock=clock)
+        for _ in range(4):
+            tracker.record("갤럭시 S24")
+        clock.now += 60
+        tracker.record("아이폰 15")
+        tracker.record("아이폰 15")
+        tracker.record("아이폰 15")
+
+        assert tracker.top(2) == [("아이폰 15", 3), ("갤럭시 S24", 2)]
+
+    def test_bounded_size(self):
+        """추적 검색어 수 상한을 넘으면 점수가 낮은 항목부터 삭제"""
+        tracker = QueryFrequencyTracker(max_queries=10, clock=FakeClock())
+        tracker.record("인기 검색어", weight=100)
+        for i in range(20):
+            tracker.record(f"검색어 {i}")
+
+        assert len(tracker) <= 10
+        assert tracker.top(1)[0][0] == "인기 검색어"
+
+
+class TestHotQueryIndex:
+    """사전 계산 인덱스 테스트"""
+
+    def test_expiry_and_refresh_ahead(self):
+        clock = FakeClock()
+        index = HotQueryIndex(clock=clock)
+        index.put("갤럭시 S24", "결과", ttl=100)
+
+        assert index.get(" 갤럭시 S24") == "결과"
+        assert not index.needs_refresh("갤럭시 S24", refresh_ahead=50)
+        clock.now += 60
+        assert index.needs_refresh("갤럭시 S24", refresh_ahead=50)
+        clock.now += 40
+        assert index.get("갤럭시 S24") is None
+
+    def test_retain(self):
+        index = HotQueryIndex()
+        index.put("a", "1", ttl=100)
+        index.put("b", "2", ttl=100)
+
+        assert index.retain(["a"]) == 1
+        assert index.get("b") is None
+        assert len(index) == 1
+
+
+class TestHotQueryScheduler:
+    """주기적 갱신 스케줄러 테스트"""
+
+    def _scheduler(self, fetch, **options):
+        clock = FakeClock()
+        tracker = QueryFrequencyTracker(clock=clock)
+        index = HotQueryIndex(clock=clock)
+        scheduler = HotQueryScheduler(tracker, index, fetch, interval=10, ttl=100, min_hits=2, **options)
+        return scheduler, tracker, index, clock
+
+    def test_refresh_only_hot_and_due_queries(self):
+        """최소 요청 수 이상인 검색어만, 만료가 가까운 항목만 갱신"""
+        fetch = Mock(side_effect=lambda query: f"{query} 결과")
+        scheduler, tracker, index, clock = self._scheduler(fetch, top_k=1)
+        for query in ["갤럭시 S24", "갤럭시 S24", "갤럭시 S24", "아이폰 15", "아이폰 15", "맥북"]:
+            tracker.record(query)
+
+        assert asyncio.run(scheduler.refresh_once()) == 1
+        assert index.get("갤럭시 S24") == "갤럭시 S24 결과"
+        assert index.get("아이폰 15") is None
+
+        # 아직 충분히 남아 있으면 다시 검색하지 않음
+        assert asyncio.run(scheduler.refresh_once()) == 0
+        # 다음 두 주기 안에 만료되면 미리 갱신
+        clock.now += 85
+        assert asyncio.run(scheduler.refresh_once()) == 1
+        assert fetch.call_count == 2
+
+    def test_failed_refresh_keeps_running(self):
+        """갱신 실패는 다른 검색어 갱신을 막지 않음"""
+        def fetch(query):
+            if query == "실패":
+                raise RuntimeError("upstream")
+            return "결과"
+
+        scheduler, tracker, index, _ = self._scheduler(fetch)
+        for query in ["실패", "실패", "성공", "성공"]:
+            tracker.record(query)
+
+        assert asyncio.run(scheduler.refresh_once()) == 1
+        assert index.get("성공") == "결과"
+
+    def test_start_and_stop(self):
+        """시작한 주기 작업을 취소하고 종료"""
+        scheduler, _, _, _ = self._scheduler(Mock())
+
+        async def run():
+            scheduler.start()
+            assert scheduler._task is not None
+            await scheduler.stop()
+            assert scheduler._task is None
+
+        asyncio.run(run())
+
+
+class TestHotQueryServing:
+    """요청 경로에서 사전 계산 결과 사용 테스트"""
+
+    def test_agent_search_served_from_index(self):
+        """인덱스에 있는 검색어는 검색 제공자를 호출하지 않음"""
+        from app.agents.product_search_agent import ProductSearchAgent
+
+        settings = Settings(llm_provider="fake", search_provider="fake", fake_llm_first_token_ms=0,
+                            fake_search_latency_ms=0, fake_seed=1)
+        tracker, index = QueryFrequencyTracker(clock=FakeClock()), HotQueryIndex()
+        index.put("갤럭시 스마트폰 추천해줘", "갤럭시 S24 - 쿠팡 1,150,000원", ttl=100)
+        with patch("app.agents.product_search_agent.get_settings", return_value=settings), \
+             patch("app.agents.product_search_agent.hot_query_tracker", tracker), \
+             patch("app.agents.product_search_agent.hot_query_index", index):
+            agent = ProductSearchAgent()
+            agent.search_tool.run = Mock(return_value="검색 결과")
+            response = agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", str(uuid.uuid4()), "u1")
+
+        agent.search_tool.run.assert_not_called()
+        assert "갤럭시 S24 - 쿠팡 1,150,000원" in response
+        assert tracker.top(1) == [("갤럭시 스마트폰 추천해줘", 1)]
+
+    def test_lifespan_starts_and_stops_scheduler(self):
+        """애플리케이션 시작 시 스케줄러 시작, 종료 시 중지"""
+        from app.main import app
+
+        with patch("app.main.get_settings", return_value=Settings(hot_query_enabled=True)), \
+             patch("app.main.HotQueryScheduler.start") as start, \
+             patch("app.main.HotQueryScheduler.stop") as stop:
+            with TestClient(app):
+                start.assert_called_once()
+            stop.assert_awaited_once()
+
+    def test_scheduler_disabled_by_default(self):
+        """기본 설정에서는 핫 쿼리 스케줄러를 만들지 않음"""
+        from app.main import _create_hot_query_scheduler
+
+        assert _create_hot_query_scheduler(Settings()) is None
+
+    def test_products_search_not_recorded(self):
+        """에이전트가 검색하지 않는 더미 상품 검색은 검색어 빈도에 반영하지 않음"""
+        from app.main import app
+
+        tracker = QueryFrequencyTracker(clock=FakeClock())
+        with patch("app.agents.product_search_agent.hot_query_tracker", tracker):
+            TestClient(app).post("/api/products", json={"query": "갤럭시 S24"})
+
+        assert tracker.top(1) == []
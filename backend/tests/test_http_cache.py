@@ -0,0 +1,93 @@
+"""
+응답 압축 및 ETag 조건부 요청 테스트
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.api.http_cache import etag_matches, make_etag
+
+
+class TestETagHelpers:
+    """ETag 유틸리티 테스트"""
+
+    def test_make_etag_is_deterministic(self):
+        """같은 입력이면 같은 강한 ETag"""
+        assert make_etag("result", "abc", 20, None) == make_etag("result", "abc", 20, None)
+        assert make_etag("result", "abc", 20, None) != make_etag("result", "abc", 10, None)
+        assert make_etag("x").startswith('"')
+
+    def test_etag_matches(self):
+        """If-None-Match 비교 테스트"""
+        etag = make_etag("x")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
+
+
+class TestConditionalGet:
+    """조건부 GET 엔드포인트 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        """테스트 클라이언트 생성"""
+        from app.main import app
+        return TestClient(app)
+
+    def test_result_not_modified(self, client):
+        """저장된 검색 결과는 ETag 재검증 시 304"""
+        search_id = client.post("/api/products", json={"query": "모니터"}).json()["search_id"]
+
+        first = client.get(f"/api/results/{search_id}")
+        etag = first.headers["etag"]
+        second = client.get(f"/api/results/{search_id}", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_history_etag_changes_after_new_search(self, client):
+        """새 검색이 추가되면 히스토리 ETag가 바뀜"""
+        etag = client.get("/api/history").headers["etag"]
+        assert client.get("/api/history", headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/products", json={"query": "키보드"})
+        response = client.get("/api/history", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_history_etag_depends_on_content(self, client):
+        """재시작/다른 워커처럼 개수가 같아도 내용이 다르면 다른 ETag"""
+        client.delete("/api/history")
+        client.post("/api/products", json={"query": "키보드"})
+        etag = client.get("/api/history").headers["etag"]
+
+        client.delete("/api/history")
+        client.post("/api/products", json={"query": "마우스"})
+        response = client.get("/api/history", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["history"][0]["query"] == "마우스"
+
+    def test_categories_not_modified(self, client):
+        """카테고리 목록 조건부 요청"""
+        etag = client.get("/api/categories").headers["etag"]
+        response = client.get("/api/categories", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_large_response_is_compressed(self, client):
+        """임계값 이상 응답은 압축"""
+        response = client.post(
+            "/api/products",
+            json={"query": "노트북"},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.json()["query"] == "노트북"
+
+    def test_small_response_is_not_compressed(self, client):
+        """임계값 미만 응답은 압축하지 않음"""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
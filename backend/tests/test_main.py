@@ -70,5 +70,55 @@ class TestMainApplication:
         assert "openapi" in response.json()
 
 
+
+class TestSettingsReloadEndpoint:
+    """POST /admin/reload-settings 테스트"""
+    
+    def setup_method(self):
+        from app.main import app
+        self.client = TestClient(app)
+    
+    def test_reload_applies_hot_settings(self):
+        """재로드 시 채팅 히스토리 용량이 재시작 없이 바뀜"""
+        import os
+        from unittest.mock import patch
+        from app.api.chat import chat_history_store
+        from app.main import reload_settings
+        
+        try:
+            with patch.dict(os.environ, {"CHAT_HISTORY_CAPACITY": "500", "ENVIRONMENT": "development"}):
+                response = self.client.post("/admin/reload-settings")
+            
+            assert response.status_code == 200
+            assert response.json()["settings"]["chat_history_capacity"] == 500
+            assert chat_history_store.capacity == 500
+        finally:
+            reload_settings()
+        
+    def test_reload_requires_admin_token(self):
+        """ADMIN_TOKEN 설정 시 토큰이 일치해야 함"""
+        from unittest.mock import patch
+        from app.config import Settings
+        
+        with patch("app.main.get_settings", return_value=Settings(admin_token="secret")), \
+             patch("app.main.reload_settings") as mock_reload:
+            mock_reload.return_value = Settings()
+            denied = self.client.post("/admin/reload-settings", headers={"X-Admin-Token": "wrong"})
+            allowed = self.client.post("/admin/reload-settings", headers={"X-Admin-Token": "secret"})
+        
+        assert denied.status_code == 403
+        assert allowed.status_code == 200
+        assert mock_reload.call_count == 1
+        
+    def test_reload_disabled_in_production_without_token(self):
+        """운영 환경에서 토큰이 없으면 거부"""
+        from unittest.mock import patch
+        from app.config import Settings
+        
+        with patch("app.main.get_settings", return_value=Settings(environment="production")):
+            response = self.client.post("/admin/reload-settings")
+        assert response.status_code == 403
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
@@ -208,7 +208,7 @@ class TestMultiturnIntegration:
         
         with patch('app.api.chat.get_agent') as mock_get_agent:
             mock_agent = Mock()
-            mock_agent.search_products_with_memory.return_value = "iPhone 15는 애플의 최신 스마트폰입니다"
+            mock_agent.stream_products_with_memory.return_value = iter(["iPhone 15는 ", "애플의 최신 스마트폰입니다"])
             mock_get_agent.return_value = mock_agent
             
             response = client.post("/api/chat/stream", json=request_data)
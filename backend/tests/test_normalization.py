@@ -0,0 +1,75 @@
+import pytest
+
+from app.services.normalization import canonical_query, normalize_query, normalize_text, query_key, query_text
+
+
+class TestNormalizeText:
+    """기본 텍스트 정규화 테스트"""
+
+    def test_full_width_and_zero_width(self):
+        assert normalize_text("ＳＡＭＳＵＮＧ​　갤럭시") == "SAMSUNG 갤럭시"
+
+    def test_empty(self):
+        assert normalize_text("") == ""
+        assert normalize_text(None) == ""
+
+
+class TestNormalizeQuery:
+    """검색어 정규화 테스트"""
+
+    @pytest.mark.parametrize("query, expected", [
+        ("갤럭시S24", "갤럭시 S24"),
+        ("아이폰15 프로", "아이폰 15 프로"),
+        ("Z플립6", "Z 플립 6"),
+        ("50만원 이하", "500000원 이하"),
+        ("50 만 원", "500000원"),
+        ("500,000원", "500000원"),
+        ("₩1,200,000", "1200000원"),
+        ("1.5억원", "150000000원"),
+        ("30만원대", "300000원대"),
+        ("256기가", "256GB"),
+        ("1 테라", "1TB"),
+        ("65인치 TV", "65인치 TV"),
+    ])
+    def test_variants(self, query, expected):
+        assert normalize_query(query) == expected
+
+    @pytest.mark.parametrize("query", ["아이폰 15 만족도", "2개 이상", "S24 리뷰", "1.250.000원", "v1.2.3원", "₩1.250.000"])
+    def test_numbers_without_money_unit_unchanged(self, query):
+        """금액 단위가 아닌 숫자는 그대로"""
+        assert normalize_query(query) == query
+
+
+class TestQueryKey:
+    """캐시/중복 제거 키 테스트"""
+
+    def test_variants_share_key(self):
+        variants = ["Galaxy S24 Ultra", "갤럭시S24 울트라", "ｇａｌａｘｙ　ｓ２４ ｕｌｔｒａ", "  갤럭시 s24   ultra "]
+        assert len({query_key(query) for query in variants}) == 1
+
+    @pytest.mark.parametrize("variants", [
+        ["에어팟프로2", "에어팟 프로 2", "airpods pro 2", "AirPods Pro 2"],
+        ["무선이어폰", "무선 이어폰", "무선  이어폰"],
+        ["아이폰15프로맥스", "아이폰 15 프로 맥스", "iphone 15 pro max"],
+    ])
+    def test_spacing_and_alias_variants_share_key(self, variants):
+        """한글 합성어 띄어쓰기와 영문 별칭/등급 표기 차이는 같은 키"""
+        assert len({query_key(query) for query in variants}) == 1
+
+    def test_query_text_keeps_words(self):
+        """단어 단위 검색용 텍스트는 띄어쓰기 유지"""
+        assert query_text("airpods pro 2") == "에어팟 프로 2"
+        assert query_key("airpods pro 2") == "에어팟프로 2"
+
+    def test_canonical_query_keeps_case(self):
+        """표준 형태는 다시 검색할 수 있도록 대소문자 유지"""
+        assert canonical_query("galaxy s24") == "갤럭시 S24"
+        assert query_key("galaxy s24") == "갤럭시 s24"
+
+    def test_products_api_accepts_dotted_amounts(self):
+        """점으로 구분한 숫자가 있는 검색어도 500 없이 처리"""
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        response = TestClient(app).post("/api/products", json={"query": "1.250.000원 노트북"})
+        assert response.status_code == 200
@@ -0,0 +1,132 @@
+"""
+커서 기반 페이지네이션 테스트
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+from app.services.pagination import encode_cursor, decode_cursor, paginate
+
+
+class TestPaginationHelper:
+    """pagination 유틸리티 테스트"""
+
+    def test_cursor_roundtrip(self):
+        """커서 인코딩/디코딩 왕복 테스트"""
+        assert decode_cursor(encode_cursor(0)) == 0
+        assert decode_cursor(encode_cursor(12345)) == 12345
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+        with pytest.raises(ValueError):
+            decode_cursor("!!!")
+
+    def test_forward_pages(self):
+        """정방향 페이지네이션 테스트"""
+        items = list(range(7))
+        page1, cursor = paginate(items, 3)
+        page2, cursor = paginate(items, 3, cursor)
+        page3, cursor = paginate(items, 3, cursor)
+
+        assert page1 == [0, 1, 2]
+        assert page2 == [3, 4, 5]
+        assert page3 == [6]
+        assert cursor is None
+
+    def test_newest_first_pages_are_stable_on_append(self):
+        """역순 페이지네이션은 중간에 항목이 추가되어도 밀리지 않음"""
+        items = list(range(5))
+        page1, cursor = paginate(items, 2, newest_first=True)
+        assert page1 == [4, 3]
+
+        items.append(5)
+        page2, cursor = paginate(items, 2, cursor, newest_first=True)
+        page3, cursor = paginate(items, 2, cursor, newest_first=True)
+        assert page2 == [2, 1]
+        assert page3 == [0]
+        assert cursor is None
+
+
+class TestPaginatedEndpoints:
+    """페이지네이션이 적용된 엔드포인트 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        """테스트 클라이언트 생성"""
+        from app.main import app
+        return TestClient(app)
+
+    def test_product_result_pages(self, client):
+        """검색 결과 상품 페이지 조회 테스트"""
+        response = client.post("/api/products", json={"query": "노트북", "limit": 10})
+        assert response.status_code == 200
+        first = response.json()
+        assert len(first["products"]) == 10
+        assert first["total_count"] == 15
+        assert first["next_cursor"] is not None
+
+        response = client.get(
+            f"/api/results/{first['search_id']}",
+            params={"limit": 10, "cursor": first["next_cursor"]}
+        )
+        assert response.status_code == 200
+        second = response.json()
+        assert len(second["products"]) == 5
+        assert second["next_cursor"] is None
+
+        first_ids = {p["product_id"] for p in first["products"]}
+        assert not first_ids & {p["product_id"] for p in second["products"]}
+
+    def test_product_search_without_limit_returns_all(self, client):
+        """limit을 지정하지 않으면 기존처럼 전체 상품 반환"""
+        first = client.post("/api/products", json={"query": "노트북"}).json()
+        assert len(first["products"]) == first["total_count"] == 15
+        assert first["next_cursor"] is None
+
+        result = client.get(f"/api/results/{first['search_id']}").json()
+        assert [p["product_id"] for p in result["products"]] == [p["product_id"] for p in first["products"]]
+
+    def test_search_history_pages_newest_first(self, client):
+        """검색 히스토리 최신순 페이지 조회"""
+        client.delete("/api/history")
+        for i in range(3):
+            client.post("/api/products", json={"query": f"히스토리 {i}"})
+
+        first = client.get("/api/history", params={"limit": 2}).json()
+        assert [h["query"] for h in first["history"]] == ["히스토리 2", "히스토리 1"]
+        assert first["total_count"] == 3
+        second = client.get("/api/history", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert [h["query"] for h in second["history"]] == ["히스토리 0"]
+        assert second["next_cursor"] is None
+
+    def test_invalid_cursor_returns_400(self, client):
+        """잘못된 커서는 400 응답"""
+        search_id = client.post("/api/products", json={"query": "노트북"}).json()["search_id"]
+        response = client.get(f"/api/results/{search_id}", params={"cursor": "bogus"})
+        assert response.status_code == 400
+
+    def test_limit_bounds(self, client):
+        """limit 범위를 벗어나면 422 응답"""
+        response = client.get("/api/history", params={"limit": 0})
+        assert response.status_code == 422
+
+    def test_chat_history_pages_newest_first(self, client):
+        """채팅 히스토리를 최신순으로 페이지 조회"""
+        client.delete("/api/chat/history")
+
+        with patch('app.api.chat.get_agent') as mock_get_agent:
+            mock_agent = Mock()
+            mock_agent.search_products_with_memory.side_effect = [f"응답 {i}" for i in range(3)]
+            mock_get_agent.return_value = mock_agent
+            for i in range(3):
+                client.post("/api/chat", json={"query": f"질문 {i}"})
+
+        first = client.get("/api/chat/history", params={"limit": 2}).json()
+        assert [h["user_message"] for h in first["history"]] == ["질문 2", "질문 1"]
+        assert first["total_count"] == 3
+
+        second = client.get("/api/chat/history", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert [h["user_message"] for h in second["history"]] == ["질문 0"]
+        assert second["next_cursor"] is None
@@ -0,0 +1,193 @@
+import threading
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+from app.agents.prefetch import SearchPrefetcher
+from app.config import Settings
+
+
+def wait_idle(prefetcher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while prefetcher.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert prefetcher.pending_count() == 0
+
+
+class TestSearchPrefetcher:
+    """선행 검색 실행기 테스트"""
+
+    def test_schedule_and_lookup_mentioned_product(self):
+        """선행 검색한 상품을 언급하는 검색어는 결과 재사용"""
+        search = Mock(side_effect=lambda query: f"{query} 결과")
+        prefetcher = SearchPrefetcher(search)
+        try:
+            assert prefetcher.schedule("t1", ["갤럭시 S24", "갤럭시 A55"]) == 2
+            wait_idle(prefetcher)
+
+            assert prefetcher.lookup("t1", "갤럭시 s24 카메라 성능") == ("갤럭시 s24", "갤럭시 S24 결과")
+            assert prefetcher.lookup("t1", "아이폰 15") is None
+            assert prefetcher.lookup("t2", "갤럭시 S24") is None
+            # 이미 결과가 있으면 다시 예약하지 않음
+            assert prefetcher.schedule("t1", ["갤럭시 S24"]) == 0
+            assert search.call_count == 2
+        finally:
+            prefetcher.shutdown()
+
+    def test_pending_is_bounded(self):
+        """대기 작업 수 상한을 넘는 예약은 버림"""
+        release = threading.Event()
+        prefetcher = SearchPrefetcher(lambda query: release.wait(5) and query, max_workers=1, max_pending=2)
+        try:
+            assert prefetcher.schedule("t1", ["a1", "a2", "a3", "a4"]) == 2
+        finally:
+            release.set()
+            prefetcher.shutdown()
+
+    def test_waits_for_foreground_search(self):
+        """사용자 요청 검색이 진행 중이면 선행 검색은 시작하지 않음"""
+        search = Mock(return_value="결과")
+        prefetcher = SearchPrefetcher(search)
+        try:
+            with prefetcher.foreground():
+                prefetcher.schedule("t1", ["갤럭시 S24"])
+                time.sleep(0.1)
+                search.assert_not_called()
+            wait_idle(prefetcher)
+            search.assert_called_once_with("갤럭시 S24")
+        finally:
+            prefetcher.shutdown()
+
+    def test_lookup_skips_prefetch_waiting_for_foreground(self):
+        """사용자 요청 검색을 기다리느라 시작하지 않은 선행 검색은 기다리지 않고 미적중"""
+        search = Mock(return_value="결과")
+        prefetcher = SearchPrefetcher(search)
+        try:
+            with prefetcher.foreground():
+                prefetcher.schedule("t1", ["갤럭시 S24"])
+                time.sleep(0.05)
+                begin = time.monotonic()
+                assert prefetcher.lookup("t1", "갤럭시 S24 가격") is None
+                assert time.monotonic() - begin < 1.0
+            wait_idle(prefetcher)
+            assert prefetcher.lookup("t1", "갤럭시 S24 가격") == ("갤럭시 s24", "결과")
+        finally:
+            prefetcher.shutdown()
+
+    def test_lookup_waits_for_started_search(self):
+        """이미 검색을 시작한 같은 상품은 중복 검색하지 않고 결과를 기다림"""
+        started, release = threading.Event(), threading.Event()
+
+        def search(query):
+            started.set()
+            release.wait(5)
+            return "결과"
+
+        prefetcher = SearchPrefetcher(search)
+        try:
+            prefetcher.schedule("t1", ["갤럭시 S24"])
+            assert started.wait(5)
+            threading.Timer(0.05, release.set).start()
+            assert prefetcher.lookup("t1", "갤럭시 S24") == ("갤럭시 s24", "결과")
+        finally:
+            release.set()
+            prefetcher.shutdown()
+
+    def test_cancel_pending(self):
+        """새 턴이 시작되면 아직 시작하지 않은 작업 취소"""
+        release = threading.Event()
+        search = Mock(side_effect=lambda query: release.wait(5) and query)
+        prefetcher = SearchPrefetcher(search, max_workers=1)
+        try:
+            prefetcher.schedule("t1", ["a1", "a2", "a3"])
+            time.sleep(0.05)
+            assert prefetcher.cancel_pending("t1") == 2
+            release.set()
+            wait_idle(prefetcher)
+            assert search.call_count == 1
+        finally:
+            prefetcher.shutdown()
+
+    def test_forget_discards_running_result(self):
+        """스레드를 삭제하면 진행 중이던 선행 검색 결과도 버림"""
+        started, release = threading.Event(), threading.Event()
+
+        def search(query):
+            started.set()
+            release.wait(5)
+            return "결과"
+
+        prefetcher = SearchPrefetcher(search)
+        try:
+            prefetcher.schedule("t1", ["갤럭시 S24"])
+            assert started.wait(5)
+            prefetcher.forget("t1")
+            release.set()
+            wait_idle(prefetcher)
+            assert prefetcher.lookup("t1", "갤럭시 S24") is None
+        finally:
+            prefetcher.shutdown()
+
+
+class TestAgentPrefetch:
+    """ProductSearchAgent 선행 검색 통합 테스트"""
+
+    def _agent(self, **overrides):
+        from app.agents.product_search_agent import ProductSearchAgent
+
+        values = dict(
+            llm_provider="fake",
+            search_provider="fake",
+            fake_llm_first_token_ms=0,
+            fake_search_latency_ms=0,
+            fake_seed=1,
+            prefetch_enabled=True,
+            prefetch_top_n=2,
+        )
+        values.update(overrides)
+        with patch("app.agents.product_search_agent.get_settings", return_value=Settings(**values)):
+            agent = ProductSearchAgent()
+        agent.search_tool.run = Mock(side_effect=lambda query: (
+            f"갤럭시 S24 - 쿠팡 1,150,000원 ({query})\n"
+            f"갤럭시 A55 - SSG 450,000원 ({query})\n"
+            f"갤럭시 Z 플립6 - G마켓 1,390,000원 ({query})"
+        ))
+        return agent
+
+    def test_follow_up_search_hits_prefetched_result(self):
+        """응답에 등장한 상위 상품을 미리 검색해 다음 턴 검색이 캐시 적중"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+        try:
+            agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+            wait_idle(agent.prefetcher)
+
+            searched = [call.args[0] for call in agent.search_tool.run.call_args_list]
+            assert searched[1:] == ["갤럭시 S24 상품 가격 리뷰 구매", "갤럭시 A55 상품 가격 리뷰 구매"]
+
+            response = agent.search_products_with_memory("갤럭시 S24 카메라 성능 알려줘", thread_id, "u1")
+            assert agent.search_tool.run.call_count == 3
+            assert "(갤럭시 S24 상품 가격 리뷰 구매)" in response
+        finally:
+            agent.close()
+
+    def test_forget_thread_drops_prefetched_results(self):
+        """스레드 삭제 시 선행 검색 결과도 삭제"""
+        agent = self._agent()
+        thread_id = str(uuid.uuid4())
+        try:
+            agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", thread_id, "u1")
+            wait_idle(agent.prefetcher)
+            agent.forget_thread(thread_id)
+
+            assert agent.prefetcher.lookup(thread_id, "갤럭시 S24") is None
+        finally:
+            agent.close()
+
+    def test_disabled_by_default(self):
+        """기본 설정에서는 선행 검색 없음"""
+        agent = self._agent(prefetch_enabled=False)
+        agent.search_products_with_memory("갤럭시 스마트폰 추천해줘", str(uuid.uuid4()), "u1")
+
+        assert agent.prefetcher is None
+        assert agent.search_tool.run.call_count == 1
@@ -0,0 +1,198 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.price_history import PriceHistoryStore, price_history, product_key
+
+
+class TestPriceHistoryStore:
+    """가격 시계열 저장소 테스트"""
+
+    def test_product_key(self):
+        """상품명 변형은 같은 키"""
+        assert product_key("Galaxy S24 Ultra - 쿠팡") == product_key("갤럭시S24 울트라 쿠팡") == "갤럭시-s24-울트라-쿠팡"
+
+    def test_range_query_and_aggregates(self):
+        store = PriceHistoryStore()
+        for i, price in enumerate([1000, 900, 1100, 800]):
+            store.record("갤럭시 S24", price, timestamp=100.0 + i)
+
+        history = store.query("갤럭시 S24")
+        assert history["count"] == 4
+        assert (history["min_price"], history["max_price"], history["latest_price"]) == (800, 1100, 800)
+        assert history["avg_price"] == 950
+
+        ranged = store.query("갤럭시-s24", start=101, end=102)
+        assert [point["last"] for point in ranged["points"]] == [900, 1100]
+
+    def test_downsampling(self):
+        """버킷 수 이하로 다운샘플링하고 버킷별 최저/최고 유지"""
+        store = PriceHistoryStore()
+        store.record_many([("아이폰 15", 0)], timestamp=0)  # 0원은 기록하지 않음
+        for i in range(1000):
+            store.record("아이폰 15", 1000 + i % 10, timestamp=float(i))
+
+        history = store.query("아이폰 15", buckets=10)
+        assert len(history["points"]) == 10
+        assert sum(point["count"] for point in history["points"]) == 1000
+        assert all(point["min"] == 1000 and point["max"] == 1009 for point in history["points"])
+
+    def test_unknown_and_empty_range(self):
+        store = PriceHistoryStore()
+        store.record("아이폰 15", 1000, timestamp=10)
+        assert store.query("없는 상품") is None
+        assert store.query("아이폰 15", start=20)["points"] == []
+
+    def test_bounded_points(self):
+        store = PriceHistoryStore(max_points=100)
+        for i in range(250):
+            store.record("아이폰 15", 1000 + i, timestamp=float(i))
+        series = store.get("아이폰 15")
+        assert len(series) <= 100
+        assert series.prices[-1] == 1249
+
+    def test_persisted_log_restored(self, tmp_path):
+        """로그 파일에 이어 쓰고 다시 열면 복원 (잘린 마지막 레코드는 무시)"""
+        store = PriceHistoryStore()
+        store.open(str(tmp_path))
+        store.record_many([("갤럭시 S24", 1000), ("아이폰 15", 2000)], timestamp=1.0)
+        store.record("갤럭시 S24", 900, timestamp=2.0)
+        store.close()
+        with open(tmp_path / "prices.bin", "ab") as f:
+            f.write(b"\x00\x01")
+
+        restored = PriceHistoryStore()
+        assert restored.open(str(tmp_path)) == 3
+        assert list(restored.get("갤럭시 S24").prices) == [1000, 900]
+        assert restored.query("아이폰 15")["name"] == "아이폰 15"
+        restored.close()
+
+    def test_series_limit_evicts_least_recent(self):
+        """상품 수 제한 초과 시 가장 오래 관측되지 않은 상품부터 삭제"""
+        store = PriceHistoryStore(max_series=2)
+        store.record("갤럭시 S24", 1000, timestamp=1.0)
+        store.record("아이폰 15", 2000, timestamp=2.0)
+        store.record("갤럭시 S24", 900, timestamp=3.0)
+        store.record("맥북 에어", 3000, timestamp=4.0)
+
+        assert len(store) == 2
+        assert store.get("아이폰 15") is None
+        assert list(store.get("갤럭시 S24").prices) == [1000, 900]
+
+        # 삭제된 상품 번호가 쌓여도 번호를 다시 매겨 계속 기록
+        for i in range(10):
+            store.record(f"상품 {i}", 100, timestamp=5.0 + i)
+        assert len(store) == 2 and len(store._keys) <= 2 * len(store) + 1
+
+    def test_log_compacted_on_open(self, tmp_path):
+        """다시 열면 제한을 넘는 상품과 잘려 나간 관측을 로그에서 제거"""
+        store = PriceHistoryStore(max_points=10)
+        store.open(str(tmp_path))
+        for i in range(50):
+            store.record("갤럭시 S24", 1000 + i, timestamp=float(i))
+        store.record("아이폰 15", 2000, timestamp=100.0)
+        store.close()
+        size = (tmp_path / "prices.bin").stat().st_size
+
+        restored = PriceHistoryStore(max_points=10, max_series=1)
+        assert restored.open(str(tmp_path)) == 1
+        restored.close()
+        assert (tmp_path / "prices.bin").stat().st_size < size
+        assert (tmp_path / "keys.jsonl").read_text(encoding="utf-8").count("\n") == 1
+
+        reopened = PriceHistoryStore(max_points=10)
+        assert reopened.open(str(tmp_path)) == 1
+        assert list(reopened.get("아이폰 15").prices) == [2000]
+        assert reopened.get("갤럭시 S24") is None
+        reopened.record("갤럭시 S24", 900, timestamp=200.0)
+        reopened.close()
+        assert PriceHistoryStore().open(str(tmp_path)) == 2
+
+    def test_workers_share_log_directory(self, tmp_path):
+        """같은 경로를 연 여러 워커(저장소)의 상품 번호가 섞이지 않고, 다른 워커의 압축 후에도 유실 없음"""
+        first, second = PriceHistoryStore(), PriceHistoryStore()
+        first.open(str(tmp_path))
+        second.open(str(tmp_path))
+        first.record("갤럭시 S24", 1000, timestamp=1.0)
+        second.record("아이폰 15", 2000, timestamp=2.0)
+        first.record_many([("아이폰 15", 1900), ("맥북 에어", 3000)], timestamp=3.0)
+
+        # 세 번째 워커가 시작하면서 로그를 압축/교체해도 기존 워커는 새 파일에 이어 씀
+        third = PriceHistoryStore()
+        assert third.open(str(tmp_path)) == 4
+        second.record_many([("맥북 에어", 2900), ("에어팟 프로", 300)], timestamp=4.0)
+        first.record("갤럭시 S24", 950, timestamp=5.0)
+        for store in (first, second, third):
+            store.close()
+
+        restored = PriceHistoryStore()
+        assert restored.open(str(tmp_path)) == 7
+        assert list(restored.get("갤럭시 S24").prices) == [1000, 950]
+        assert list(restored.get("아이폰 15").prices) == [2000, 1900]
+        assert list(restored.get("맥북 에어").prices) == [3000, 2900]
+        assert list(restored.get("에어팟 프로").prices) == [300]
+        restored.close()
+
+    def test_clear_replaces_shared_log(self, tmp_path):
+        """다른 워커가 로그를 비운 뒤 기록해도 이전 상품 번호를 쓰지 않음"""
+        first, second = PriceHistoryStore(), PriceHistoryStore()
+        first.open(str(tmp_path))
+        second.open(str(tmp_path))
+        first.record_many([("갤럭시 S24", 1000), ("아이폰 15", 2000)], timestamp=1.0)
+        second.clear()
+        second.record("맥북 에어", 3000, timestamp=2.0)
+        first.record("아이폰 15", 1900, timestamp=3.0)
+        first.close()
+        second.close()
+
+        restored = PriceHistoryStore()
+        assert restored.open(str(tmp_path)) == 2
+        assert list(restored.get("맥북 에어").prices) == [3000]
+        assert list(restored.get("아이폰 15").prices) == [1900]
+        restored.close()
+
+    def test_interrupted_compaction_recovered(self, tmp_path):
+        """키 파일만 교체된 뒤 중단된 압축은 다음 open에서 마저 교체"""
+        store = PriceHistoryStore()
+        store.open(str(tmp_path))
+        store.record_many([("갤럭시 S24", 1000), ("아이폰 15", 2000)], timestamp=1.0)
+        store.close()
+        (tmp_path / "prices.bin").rename(tmp_path / "prices.bin.compact")
+        (tmp_path / "prices.bin").write_bytes(b"\x00" * 40)
+
+        restored = PriceHistoryStore()
+        assert restored.open(str(tmp_path)) == 2
+        assert restored.query("아이폰 15")["latest_price"] == 2000
+        restored.close()
+        assert not (tmp_path / "prices.bin.compact").exists()
+
+
+class TestPriceHistoryAPI:
+    """GET /api/products/{key}/price-history 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        from app.main import app
+        return TestClient(app)
+
+    def test_search_records_prices(self, client):
+        price_history.clear()
+        for _ in range(3):
+            assert client.post("/api/products", json={"query": "가격이력 테스트"}).status_code == 200
+
+        response = client.get(f"/api/products/{product_key('가격이력 테스트 - 상품 1번')}/price-history")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["observation_count"] == 3
+        assert data["min_price"] == data["max_price"] == data["latest_price"]
+        assert datetime.fromisoformat(data["points"][0]["timestamp"])
+
+    def test_unknown_product(self, client):
+        response = client.get("/api/products/없는-상품/price-history")
+        assert response.status_code == 404
+
+    def test_bucket_limit_validated(self, client):
+        response = client.get("/api/products/아무거나/price-history", params={"buckets": 0})
+        assert response.status_code == 422
@@ -0,0 +1,87 @@
+"""
+압축 상품 레코드 테스트
+"""
+
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.api.search import ProductInfo, SearchResult, generate_dummy_products, to_product_infos
+from app.services.product_records import ProductRecord
+
+
+def _product(product_id="123e4567-e89b-12d3-a456-426614174000", **overrides):
+    fields = dict(
+        product_id=product_id,
+        name="갤럭시 S24",
+        price=1000000.0,
+        original_price=1100000.0,
+        discount_rate=10.0,
+        rating=4.5,
+        review_count=120,
+        seller="판매자1",
+        url=f"https://shop.example.com/product/{product_id}",
+        image_url=f"https://example.com/images/{product_id}.jpg",
+        shipping_info="무료배송",
+    )
+    fields.update(overrides)
+    return fields
+
+
+class TestProductRecord:
+    """ProductRecord 변환 테스트"""
+
+    def test_round_trip(self):
+        """UUID/URL을 압축해서 저장해도 원래 값 그대로 복원"""
+        data = _product()
+        record = ProductRecord.from_dict(data)
+        assert record.to_dict() == data
+        assert isinstance(record._id, bytes) and len(record._id) == 16
+
+    def test_non_uuid_ids_and_missing_values(self):
+        data = _product(product_id="SKU-0001", image_url=None, rating=None, shipping_info=None)
+        record = ProductRecord.from_dict(data)
+        assert record.to_dict() == data
+        # 대문자 UUID는 표기가 바뀌지 않도록 문자열 그대로 보관
+        upper = "123E4567-E89B-12D3-A456-426614174000"
+        assert ProductRecord.from_dict(_product(product_id=upper)).product_id == upper
+
+    def test_repeated_strings_shared(self):
+        """판매자/배송 정보/URL 템플릿은 레코드끼리 같은 객체를 공유"""
+        first = ProductRecord.from_dict(_product(seller="".join(["판매", "자1"])))
+        second = ProductRecord.from_dict(_product(
+            product_id="223e4567-e89b-12d3-a456-426614174000", seller="".join(["판매자", "1"])
+        ))
+        assert first.seller is second.seller
+        assert first.shipping_info is second.shipping_info
+        assert first._url is second._url
+        assert first.url != second.url
+
+    def test_smaller_than_pydantic_model(self):
+        record = generate_dummy_products("아이폰 15", 1)[0]
+        model = to_product_infos([record])[0]
+        assert not hasattr(record, "__dict__")
+        assert sys.getsizeof(record) < sys.getsizeof(model) + sys.getsizeof(model.__dict__)
+
+    def test_pydantic_conversion(self):
+        """응답 경계에서 ProductInfo로 변환 (검증 경로도 지원)"""
+        records = generate_dummy_products("아이폰 15", 3)
+        assert [p.model_dump() for p in to_product_infos(records)] == [r.to_dict() for r in records]
+        assert ProductInfo.model_validate(records[0]).model_dump() == records[0].to_dict()
+        assert ProductRecord.from_product(to_product_infos(records)[0]) == records[0]
+
+
+class TestStoredResultsApi:
+    """저장된 레코드가 API 응답에서는 기존 형식 그대로"""
+
+    def test_results_pages_match_search_response(self):
+        from app.main import app
+
+        client = TestClient(app)
+        created = client.post("/api/products", json={"query": "레코드 테스트", "limit": 5}).json()
+        page = client.get(f"/api/results/{created['search_id']}", params={"limit": 5}).json()
+
+        SearchResult.model_validate(page)
+        assert page["products"] == created["products"]
+        assert page["total_count"] == 15
+        assert page["products"][0]["url"].endswith(page["products"][0]["product_id"])
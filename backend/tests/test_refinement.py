@@ -0,0 +1,102 @@
+import pytest
+
+from app.agents.fake_providers import FakeSearchTool
+from app.services.refinement import format_refined_answer, parse_refinement, parse_search_results
+
+
+class TestParseSearchResults:
+    """검색 결과 구조화 테스트"""
+
+    def test_fake_search_lines(self):
+        """상품명/쇼핑몰/가격/평점 추출"""
+        items = parse_search_results(FakeSearchTool().run("갤럭시"))
+
+        assert len(items) == 5
+        assert items[0]["name"] == "갤럭시 모델 1"
+        assert items[0]["shop"] in FakeSearchTool.SHOPS
+        assert items[0]["price"] > 0
+        assert items[0]["rating"] is not None
+
+    def test_last_amount_is_price(self):
+        """한 줄에 금액이 여러 개면 마지막 금액이 판매 가격"""
+        items = parse_search_results("갤럭시 50만원 이하 모델 - 쿠팡 정가 600,000원 할인가 450,000원")
+        assert items[0]["price"] == 450000
+        assert items[0]["shop"] == "쿠팡"
+
+    def test_prose_snippets(self):
+        """문장 단위 스니펫과 만원 단위 가격"""
+        items = parse_search_results("갤럭시 S24 최저가 115만원입니다. 배송은 무료입니다. 아이폰 15는 1,250,000원.")
+        assert [item["price"] for item in items] == [1150000, 1250000]
+
+    def test_unparsable_amounts_skipped(self):
+        """점으로 묶은 숫자/버전 문자열은 가격으로 보지 않고 다음 금액 또는 줄로 넘어감"""
+        text = "노트북 A - 쿠팡 1.250.000원\n드라이버 v1.2.3원\n노트북 B - 11번가 990,000원 v1.2.3원"
+        items = parse_search_results(text)
+        assert [(item["name"], item["price"]) for item in items] == [("노트북 B", 990000)]
+
+    def test_no_prices(self):
+        """가격이 없으면 빈 목록"""
+        assert parse_search_results("검색 결과가 없습니다.") == []
+
+
+class TestParseRefinement:
+    """후속 정제 질문 인식 테스트"""
+
+    @pytest.mark.parametrize("query, min_price, max_price", [
+        ("그 중에서 50만원 이하인 것만 추천해줘", None, 500000),
+        ("그중 50만 이하", None, 500000),
+        ("이 중 100만원 이상인 것만", 1000000, None),
+        ("그 중에 30만원대 제품만", 300000, 400000),
+        ("그 중 10만~20만원인 것만", 100000, 200000),
+        ("그중 10~20만원 제품만", 100000, 200000),
+        ("그 중 1.5만원 이하", None, 15000),
+    ])
+    def test_price_conditions(self, query, min_price, max_price):
+        refinement = parse_refinement(query)
+        assert (refinement.min_price, refinement.max_price) == (min_price, max_price)
+
+    def test_price_range_upper_bound_exclusive(self):
+        """"30만원대"는 40만원 미포함"""
+        refinement = parse_refinement("그 중에 30만원대 제품만")
+        assert refinement.matches({"price": 399000, "text": ""})
+        assert not refinement.matches({"price": 400000, "text": ""})
+
+    def test_brand_and_sort(self):
+        """브랜드 필터와 정렬"""
+        refinement = parse_refinement("그 중 삼성 것만 싼 순으로")
+        items = [
+            {"price": 900000, "text": "갤럭시 S24", "rating": None},
+            {"price": 800000, "text": "아이폰 15", "rating": None},
+            {"price": 500000, "text": "Galaxy A55", "rating": None},
+        ]
+
+        assert refinement.brands == ["삼성"]
+        assert [item["text"] for item in refinement.apply(items)] == ["Galaxy A55", "갤럭시 S24"]
+
+    def test_sort_only(self):
+        """정렬 요청은 지시어 없이도 정제 질문"""
+        assert parse_refinement("가격 높은 순으로 보여줘").sort == "price_desc"
+        assert parse_refinement("평점 높은 순").sort == "rating"
+
+    @pytest.mark.parametrize("query", [
+        "갤럭시 스마트폰 추천해줘",
+        "50만원 이하 노트북 추천",
+        "노이즈캔슬링 무선 이어폰 최저가",
+        "그거랑 LG 그램이랑 비교해줘",
+        "그중 2개 이상",
+    ])
+    def test_not_refinement(self, query):
+        """새 검색이 필요한 질문은 정제 질문이 아님"""
+        assert parse_refinement(query) is None
+
+    def test_format_answer_mentions_base_query(self):
+        """응답에 원래 검색어와 조건 포함"""
+        refinement = parse_refinement("그 중에서 50만원 이하")
+        answer = format_refined_answer(
+            "갤럭시 스마트폰", refinement,
+            [{"name": "갤럭시 A55", "price": 450000, "shop": "쿠팡", "rating": 4.5, "text": ""}]
+        )
+
+        assert "'갤럭시 스마트폰'" in answer
+        assert "500,000원 이하" in answer
+        assert "- 갤럭시 A55 (450,000원, 쿠팡, 평점 4.5)" in answer
@@ -0,0 +1,56 @@
+"""
+FastJSONResponse 직렬화 테스트
+"""
+
+import json
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.api.responses import FastJSONResponse, dumps
+from app.api.search import SearchResult, SearchSummary, generate_dummy_products
+
+
+class TestFastJSONResponse:
+    """고속 응답 직렬화 테스트"""
+
+    def test_model_serialization_matches_pydantic(self):
+        """Pydantic 직렬화 결과와 동일한 JSON 생성"""
+        products = generate_dummy_products("아이폰", 5)
+        result = SearchResult(
+            search_id="abc",
+            query="아이폰",
+            products=products,
+            total_count=5,
+            search_time=0.1,
+            timestamp=datetime(2024, 1, 1, 12, 0, 0)
+        )
+
+        assert json.loads(dumps(result)) == json.loads(result.model_dump_json())
+
+    def test_nested_models_in_dict(self):
+        """딕셔너리 안의 모델도 직렬화"""
+        summary = SearchSummary(
+            search_id="abc",
+            query="아이폰",
+            product_count=0,
+            timestamp=datetime(2024, 1, 1)
+        )
+        data = json.loads(dumps({"history": [summary], "status": "success"}))
+        assert data["history"][0]["search_id"] == "abc"
+        assert data["history"][0]["timestamp"] == "2024-01-01T00:00:00"
+
+    def test_response_media_type(self):
+        """응답 미디어 타입 확인"""
+        response = FastJSONResponse({"한글": "값"})
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"한글": "값"}
+
+    def test_products_endpoint_uses_fast_path(self):
+        """상품 검색 엔드포인트 응답 형식 확인"""
+        from app.main import app
+        client = TestClient(app)
+
+        response = client.post("/api/products", json={"query": "노트북"})
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data["products"][0]["price"], float)
+        assert data["status"] == "success"
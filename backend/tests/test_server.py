@@ -5,6 +5,7 @@ import time
 import subprocess
 import signal
 import os
+from unittest.mock import patch
 
 
 class TestServerExecution:
@@ -136,5 +137,77 @@ class TestServerExecution:
         assert len(results) == 10
 
 
+
+class TestServerOptions:
+    """실행 환경별 uvicorn 옵션 테스트"""
+    
+    def test_development_options(self):
+        """개발 환경은 reload 단일 프로세스"""
+        from app.config import Settings
+        from app.server import build_server_options
+        
+        options = build_server_options(Settings(environment="development"))
+        
+        assert options["app"] == "app.main:app"
+        assert options["reload"] is True
+        assert options["workers"] == 1
+        
+    def test_production_options(self):
+        """운영 환경은 reload 없이 코어 수만큼 워커 실행"""
+        from app.config import Settings
+        from app.server import build_server_options, default_worker_count
+        
+        options = build_server_options(Settings(
+            environment="production",
+            server_backlog=4096,
+            server_keep_alive_timeout=90,
+            server_graceful_timeout=15
+        ))
+        
+        assert options["reload"] is False
+        assert options["workers"] == default_worker_count()
+        assert options["backlog"] == 4096
+        assert options["timeout_keep_alive"] == 90
+        assert options["timeout_graceful_shutdown"] == 15
+        
+    def test_production_worker_override(self):
+        """server_workers 지정 시 코어 수 대신 사용"""
+        from app.config import Settings
+        from app.server import build_server_options
+        
+        options = build_server_options(Settings(environment="production", server_workers=3))
+        assert options["workers"] == 3
+        
+    def test_production_event_loop_fallback(self):
+        """uvloop/httptools 미설치 시 표준 구현 사용"""
+        from app.config import Settings
+        from app.server import build_server_options
+        
+        with patch("app.server._installed", return_value=False):
+            options = build_server_options(Settings(environment="PRODUCTION"))
+        assert options["loop"] == "asyncio"
+        assert options["http"] == "h11"
+        
+        with patch("app.server._installed", return_value=True):
+            options = build_server_options(Settings(environment="production"))
+        assert options["loop"] == "uvloop"
+        assert options["http"] == "httptools"
+        
+    def test_production_options_accepted_by_uvicorn(self):
+        """생성한 옵션이 uvicorn.Config에서 유효한지 확인"""
+        import uvicorn
+        from app.config import Settings
+        from app.server import build_server_options
+        
+        options = build_server_options(Settings(environment="production", server_workers=2))
+        options.pop("app")
+        with patch("app.server._installed", return_value=False):
+            options.update(loop="asyncio", http="h11")
+        
+        config = uvicorn.Config("app.main:app", **options)
+        assert config.workers == 2
+        assert config.backlog == options["backlog"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
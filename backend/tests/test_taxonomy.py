@@ -0,0 +1,104 @@
+import pytest
+
+from app.services.refinement import parse_refinement
+from app.services.taxonomy import ProductTaxonomy, taxonomy
+
+
+class TestExtract:
+    """상품 분류 추출 테스트"""
+
+    def test_single_pass_extracts_all(self):
+        """카테고리/브랜드/모델/쇼핑몰을 한 번에 추출"""
+        mentions = taxonomy.extract("삼성 갤럭시 S24 울트라랑 맥북 에어 중 쿠팡에서 싼 노트북")
+
+        assert mentions.models == ["갤럭시 S24 울트라", "맥북 에어"]
+        assert mentions.brands == ["삼성", "애플"]
+        assert mentions.categories == ["스마트폰", "노트북"]
+        assert mentions.shops == ["쿠팡"]
+
+    def test_model_implies_brand_and_category(self):
+        mentions = taxonomy.extract("에어팟 프로 어때?")
+        assert mentions.brands == ["애플"]
+        assert mentions.categories == ["이어폰"]
+        assert mentions.primary == "이어폰"
+
+    def test_longest_alias_wins(self):
+        """"맥북 에어"는 "맥북"이 아닌 "맥북 에어"로 인식"""
+        assert taxonomy.extract("맥북에어 13").models == ["맥북 에어 13"]
+
+    @pytest.mark.parametrize("text", ["algorithm 책 추천", "gradle 설정", "오늘 날씨"])
+    def test_ascii_word_boundary(self, text):
+        """영문 별칭은 다른 단어의 일부와 일치하지 않음"""
+        assert not taxonomy.extract(text)
+
+    @pytest.mark.parametrize("text", ["프로그램 추천", "500그램 노트북 파우치", "보스턴백", "qc 검사 기준", "스티비 원더"])
+    def test_korean_and_ambiguous_aliases(self, text):
+        """짧은 한글 별칭은 다른 단어의 일부와 일치하지 않고, 모호한 별칭은 브랜드와 함께 써야 인식"""
+        mentions = taxonomy.extract(text)
+        assert not mentions.brands and not mentions.models
+
+    def test_shop_number_not_model_suffix(self):
+        """"11번가"의 숫자는 모델 번호로 보지 않음"""
+        mentions = taxonomy.extract("LG 그램 11번가")
+        assert mentions.models == ["LG 그램"]
+        assert mentions.shops == ["11번가"]
+
+    def test_custom_taxonomy(self):
+        custom = ProductTaxonomy(categories={"키보드": ("키보드", "keyboard")}, brands={}, model_lines={}, shops=())
+        assert custom.extract("기계식 Keyboard").categories == ["키보드"]
+        assert not custom.extract("스마트폰")
+
+
+class TestCanonicalize:
+    """별칭 표준화 테스트"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("galaxy s24 ultra", "갤럭시 S24 울트라"),
+        ("갤럭시s24 울트라", "갤럭시 S24 울트라"),
+        ("iphone15 pro 가격", "아이폰 15 프로 가격"),
+        ("아이폰15프로맥스", "아이폰 15 프로 맥스"),
+        ("iphone 15 pro max", "아이폰 15 프로 맥스"),
+        ("airpods pro 2", "에어팟 프로 2"),
+        ("에어팟프로 케이스", "에어팟 프로 케이스"),
+        ("bose qc45", "보스 QC45"),
+        ("samsung 노트북", "삼성 노트북"),
+        ("노트북 추천", "노트북 추천"),
+    ])
+    def test_canonical_form(self, text, expected):
+        assert taxonomy.canonicalize(text) == expected
+
+
+class TestRouting:
+    """정제 질문 판별에 분류 체계 사용"""
+
+    def test_model_filter(self):
+        """"그 중 아이폰만"은 아이폰 모델만 남김 (같은 브랜드의 다른 제품 제외)"""
+        refinement = parse_refinement("그 중 아이폰만")
+        items = [
+            {"price": 1250000, "text": "아이폰 15 - 쿠팡", "rating": None},
+            {"price": 1590000, "text": "맥북 에어 13 - 쿠팡", "rating": None},
+            {"price": 1150000, "text": "갤럭시 S24 - 11번가", "rating": None},
+        ]
+        assert [item["text"] for item in refinement.apply(items)] == ["아이폰 15 - 쿠팡"]
+
+    def test_brand_alias_in_results(self):
+        """결과 줄의 영문 별칭/제품 라인도 브랜드로 인식"""
+        refinement = parse_refinement("그 중 삼성 것만")
+        assert refinement.matches({"price": 1, "text": "Galaxy Tab S9"})
+        assert not refinement.matches({"price": 1, "text": "iPad Air"})
+
+
+class TestMemoryTagging:
+    """사용자 메모리 상품 태깅"""
+
+    def test_all_mentions_tagged(self):
+        from app.agents.product_search_agent import ProductSearchAgent
+
+        agent = ProductSearchAgent()
+        agent._remember_user_memory("아이폰 15랑 갤럭시 S24 비교해줘", "thread-tax", "user-tax")
+
+        tagged = [memory for memory in agent.get_user_memories("user-tax") if "product_type" in memory]
+        assert len(tagged) == 1
+        assert tagged[0]["product_type"] == "스마트폰"
+        assert tagged[0]["brands"] == ["애플", "삼성"]
+        assert tagged[0]["models"] == ["아이폰 15", "갤럭시 S24"]
@@ -3,7 +3,17 @@ utils.py 모듈에 대한 테스트
 """
 
 import pytest
-from app.utils import format_price, validate_search_query, clean_product_name
+from app.utils import (
+    UNKNOWN_PRICE,
+    clean_product_name,
+    format_price,
+    format_price_range,
+    format_prices,
+    parse_price,
+    parse_price_range,
+    parse_prices,
+    validate_search_query,
+)
 
 
 class TestFormatPrice:
@@ -25,6 +35,62 @@ class TestFormatPrice:
         assert format_price(9999.5) == "￦10,000"
 
 
+    def test_format_price_missing(self):
+        """가격 없음 포맷팅 테스트"""
+        assert format_price(None) == UNKNOWN_PRICE
+
+
+class TestBulkPrices:
+    """가격 목록 포맷팅/파싱 함수 테스트"""
+
+    def test_format_prices_styles(self):
+        """표시 형식별 포맷팅 (0과 None 포함)"""
+        prices = [1255000, 0, None, float("nan")]
+        assert format_prices(prices) == ["1,255,000원", "0원", UNKNOWN_PRICE, UNKNOWN_PRICE]
+        assert format_prices(prices, "symbol")[:2] == ["￦1,255,000", "￦0"]
+        assert format_prices([1255000, 150000000, 0], "man") == ["125만 5,000원", "1억 5,000만원", "0원"]
+
+    def test_format_prices_matches_single_formatting(self):
+        """목록 포맷팅 결과는 가격별 포맷팅과 같음 (가격 없는 자리 포함)"""
+        prices = [None, *range(0, 3000000, 12345), float("nan"), 999.5]
+        assert format_prices(prices, "symbol") == [format_price(price) for price in prices]
+        assert format_prices([None, 1255000], "man") == [UNKNOWN_PRICE, "125만 5,000원"]
+        assert format_prices([]) == []
+
+    def test_format_prices_unknown_style(self):
+        with pytest.raises(ValueError):
+            format_prices([1000], "usd")
+
+    def test_format_price_range(self):
+        """가격 범위 포맷팅 테스트"""
+        assert format_price_range(100000, 200000) == "100,000원~200,000원"
+        assert format_price_range(100000, None) == "100,000원 이상"
+        assert format_price_range(None, 500000, "man") == "50만원 이하"
+        assert format_price_range(None, None) == UNKNOWN_PRICE
+
+    def test_parse_prices(self):
+        """원/만원/억 단위와 통화 기호 파싱"""
+        texts = ["1,250,000원", "₩1,250,000", "125만원", "125만 5천원", "1.5억", "5천만원", "０원", "가격 문의", None]
+        assert parse_prices(texts) == [1250000, 1250000, 1250000, 1255000, 150000000, 50000000, 0, None, None]
+
+    def test_parse_price_rejects_dotted_groups(self):
+        """쉼표가 아닌 점으로 묶은 숫자는 금액으로 보지 않음"""
+        assert parse_prices(["1.250.000원", "v1.2.3원"]) == [None, None]
+
+    def test_parse_price_round_trip(self):
+        """포맷팅한 문자열을 다시 파싱하면 같은 가격"""
+        prices = [0, 9900, 1255000, 150000000]
+        for style in ("won", "man", "symbol"):
+            assert [parse_price(text) for text in format_prices(prices, style)] == prices
+
+    def test_parse_price_range(self):
+        """가격 범위 파싱 (앞쪽 단위 생략 포함)"""
+        assert parse_price_range("10만~20만원") == (100000, 200000)
+        assert parse_price_range("10~20만원") == (100000, 200000)
+        assert parse_price_range("10만원부터 20만원까지") == (100000, 200000)
+        assert parse_price_range("50만원") == (500000, 500000)
+
+
 class TestValidateSearchQuery:
     """검색 쿼리 유효성 검사 함수 테스트"""
     
@@ -2,23 +2,68 @@
 FastAPI 백엔드와 통신하는 API 클라이언트
 """
 import requests
+import httpx
 import streamlit as st
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterator, Optional
 import uuid
 
 
+# 연결/읽기 타임아웃 (초) - 연결은 빨리 실패하고, 응답 생성은 충분히 기다린다
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30
+HEALTH_READ_TIMEOUT = 5
+
+# 커넥션 풀 크기 및 재시도 정책
+POOL_MAXSIZE = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE, max_retries: int = MAX_RETRIES) -> requests.Session:
+    """
+    keep-alive 커넥션 풀과 재시도 정책을 가진 requests 세션 생성
+    
+    연결 실패는 모든 메서드에 대해 재시도하고, 게이트웨이 오류(502/503/504)는
+    멱등 메서드(GET/DELETE 등)만 지수 백오프로 재시도한다.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class APIClient:
-    """FastAPI 백엔드 API 클라이언트"""
+    """FastAPI 백엔드 API 클라이언트 (세션 재사용으로 요청마다 TCP 핸드셰이크를 하지 않음)"""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", session: Optional[requests.Session] = None):
         """
         API 클라이언트 초기화
         
         Args:
             base_url: 백엔드 서버 URL
+            session: 재사용할 requests 세션 (없으면 커넥션 풀 세션 생성)
         """
         self.base_url = base_url
-        self.timeout = 30  # 30초 타임아웃
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.session = session or create_session()
+    
+    def close(self):
+        """커넥션 풀 정리"""
+        self.session.close()
     
     def search_products(self, query: str) -> str:
         """
@@ -35,7 +80,7 @@ class APIClient:
             data = {"query": query}
             
             # POST 요청 보내기
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/search",
                 json=data,
                 timeout=self.timeout
@@ -81,7 +126,7 @@ class APIClient:
             }
             
             # POST 요청 보내기
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/chat",
                 json=data,
                 timeout=self.timeout
@@ -106,6 +151,52 @@ class APIClient:
         except Exception as e:
             return f"❌ 예상치 못한 오류가 발생했습니다: {str(e)}"
     
+    def stream_chat_with_memory(self, query: str, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> Iterator[str]:
+        """
+        멀티턴 메모리 채팅 스트리밍 API 호출
+        백엔드가 생성하는 응답 조각을 도착하는 즉시 하나씩 돌려준다
+        
+        Args:
+            query: 사용자 질문/요청
+            thread_id: 대화 세션 ID (없으면 자동 생성)
+            user_id: 사용자 ID (없으면 자동 생성)
+            
+        Yields:
+            str: AI 응답 조각 또는 에러 메시지
+        """
+        try:
+            data = {
+                "query": query,
+                "thread_id": thread_id,
+                "user_id": user_id
+            }
+            
+            with self.session.post(
+                f"{self.base_url}/api/chat/stream",
+                json=data,
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                response.encoding = response.encoding or "utf-8"
+                # chunk_size=None: 서버가 보낸 조각 단위 그대로 전달
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        # 인코딩을 지정했으므로 str이지만 타입상 bytes일 수 있어 직접 디코딩
+                        yield chunk.decode(response.encoding) if isinstance(chunk, bytes) else chunk
+            
+        except requests.exceptions.ConnectionError:
+            yield "❌ 백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."
+            
+        except requests.exceptions.Timeout:
+            yield "⏰ 요청 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+            
+        except requests.exceptions.HTTPError as e:
+            yield f"❌ HTTP 오류가 발생했습니다: {e}"
+            
+        except Exception as e:
+            yield f"❌ 예상치 못한 오류가 발생했습니다: {str(e)}"
+    
     def clear_thread_history(self, thread_id: str) -> dict:
         """
         특정 스레드의 대화 히스토리 삭제
@@ -117,7 +208,7 @@ class APIClient:
             dict: 삭제 결과
         """
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}/api/chat/history/{thread_id}",
                 timeout=self.timeout
             )
@@ -140,7 +231,7 @@ class APIClient:
             dict: 디버깅 정보
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/chat/debug/{thread_id}",
                 timeout=self.timeout
             )
@@ -152,6 +243,32 @@ class APIClient:
         except Exception as e:
             return {"status": "error", "message": f"오류가 발생했습니다: {str(e)}"}
     
+    def sync_history(self, thread_id: str, since: Optional[str] = None) -> dict:
+        """
+        스레드 대화 증분 동기화
+        
+        Args:
+            thread_id: 동기화할 스레드 ID
+            since: 이전 동기화 응답의 커서 (없으면 처음부터)
+            
+        Returns:
+            dict: {"history": [...새 턴...], "cursor": 다음 커서, "has_more": bool} 또는 에러 정보
+        """
+        try:
+            params = {"since": since} if since else None
+            response = self.session.get(
+                f"{self.base_url}/api/chat/sync/{thread_id}",
+                params=params,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+            
+        except requests.exceptions.ConnectionError:
+            return {"status": "error", "message": "백엔드 서버에 연결할 수 없습니다."}
+        except Exception as e:
+            return {"status": "error", "message": f"오류가 발생했습니다: {str(e)}"}
+    
     def health_check(self) -> bool:
         """
         백엔드 서버 상태 확인
@@ -160,7 +277,157 @@ class APIClient:
             bool: 서버가 정상 작동하면 True
         """
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.session.get(
+                f"{self.base_url}/health",
+                timeout=(CONNECT_TIMEOUT, HEALTH_READ_TIMEOUT)
+            )
             return response.status_code == 200
         except:
-            return False 
\ No newline at end of file
+            return False 
+
+class AsyncAPIClient:
+    """httpx 기반 비동기 API 클라이언트 (동시 요청/부하 테스트용)"""
+    
+    def __init__(self, base_url: str = "http://localhost:8000", client: Optional[httpx.AsyncClient] = None):
+        """
+        비동기 API 클라이언트 초기화
+        
+        Args:
+            base_url: 백엔드 서버 URL
+            client: 재사용할 httpx.AsyncClient (없으면 커넥션 풀 클라이언트 생성)
+        """
+        self.base_url = base_url
+        self.client = client or httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE),
+            # 연결 실패 시 재시도 (요청이 전송되기 전이므로 POST도 안전)
+            transport=httpx.AsyncHTTPTransport(retries=MAX_RETRIES)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """커넥션 풀 정리"""
+        await self.client.aclose()
+    
+    async def search_products(self, query: str) -> str:
+        """
+        상품 검색 API 호출 (단순 검색)
+        
+        Args:
+            query: 검색할 상품명
+            
+        Returns:
+            str: 검색 결과 또는 에러 메시지
+        """
+        try:
+            response = await self.client.post("/api/search", json={"query": query})
+            response.raise_for_status()
+            return response.json().get("result", "검색 결과를 가져올 수 없습니다.")
+            
+        except httpx.ConnectError:
+            return "❌ 백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."
+            
+        except httpx.TimeoutException:
+            return "⏰ 요청 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+            
+        except httpx.HTTPStatusError as e:
+            return f"❌ HTTP 오류가 발생했습니다: {e}"
+            
+        except Exception as e:
+            return f"❌ 예상치 못한 오류가 발생했습니다: {str(e)}"
+    
+    async def chat_with_memory(self, query: str, thread_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
+        """
+        멀티턴 메모리 기능을 가진 채팅 API 호출
+        
+        Args:
+            query: 사용자 질문/요청
+            thread_id: 대화 세션 ID (없으면 자동 생성)
+            user_id: 사용자 ID (없으면 자동 생성)
+            
+        Returns:
+            str: AI 응답 또는 에러 메시지
+        """
+        try:
+            data = {
+                "query": query,
+                "thread_id": thread_id,
+                "user_id": user_id
+            }
+            response = await self.client.post("/api/chat", json=data)
+            response.raise_for_status()
+            return response.json().get("response", "응답을 가져올 수 없습니다.")
+            
+        except httpx.ConnectError:
+            return "❌ 백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요."
+            
+        except httpx.TimeoutException:
+            return "⏰ 요청 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+            
+        except httpx.HTTPStatusError as e:
+            return f"❌ HTTP 오류가 발생했습니다: {e}"
+            
+        except Exception as e:
+            return f"❌ 예상치 못한 오류가 발생했습니다: {str(e)}"
+    
+    async def clear_thread_history(self, thread_id: str) -> dict:
+        """
+        특정 스레드의 대화 히스토리 삭제
+        
+        Args:
+            thread_id: 삭제할 스레드 ID
+            
+        Returns:
+            dict: 삭제 결과
+        """
+        try:
+            response = await self.client.delete(f"/api/chat/history/{thread_id}")
+            response.raise_for_status()
+            return response.json()
+            
+        except httpx.ConnectError:
+            return {"status": "error", "message": "백엔드 서버에 연결할 수 없습니다."}
+        except Exception as e:
+            return {"status": "error", "message": f"오류가 발생했습니다: {str(e)}"}
+    
+    async def get_thread_debug_info(self, thread_id: str) -> dict:
+        """
+        특정 스레드의 디버깅 정보 조회
+        
+        Args:
+            thread_id: 조회할 스레드 ID
+            
+        Returns:
+            dict: 디버깅 정보
+        """
+        try:
+            response = await self.client.get(f"/api/chat/debug/{thread_id}")
+            response.raise_for_status()
+            return response.json()
+            
+        except httpx.ConnectError:
+            return {"status": "error", "message": "백엔드 서버에 연결할 수 없습니다."}
+        except Exception as e:
+            return {"status": "error", "message": f"오류가 발생했습니다: {str(e)}"}
+    
+    async def health_check(self) -> bool:
+        """
+        백엔드 서버 상태 확인
+        
+        Returns:
+            bool: 서버가 정상 작동하면 True
+        """
+        try:
+            response = await self.client.get(
+                "/health",
+                timeout=httpx.Timeout(HEALTH_READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
@@ -4,6 +4,20 @@
 import streamlit as st
 import uuid
 from api_client import APIClient
+from history_cache import ThreadHistoryCache, TTLCache
+from load_test import MULTITURN_SELF_TEST, replay_conversation
+
+
+@st.cache_resource
+def get_history_cache() -> ThreadHistoryCache:
+    """스레드별 대화 턴 캐시 (세션/재실행 간 공유)"""
+    return ThreadHistoryCache()
+
+
+@st.cache_resource
+def get_response_cache() -> TTLCache:
+    """디버깅 정보 등 조회 응답 TTL 캐시 (세션/재실행 간 공유)"""
+    return TTLCache()
 
 
 def main():
@@ -23,13 +37,24 @@ def main():
     if "api_client" not in st.session_state:
         st.session_state.api_client = APIClient()
     
-    # 세션 상태 초기화
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
+    history_cache = get_history_cache()
+    response_cache = get_response_cache()
     
-    # 멀티턴 메모리를 위한 세션 ID 초기화
+    # 멀티턴 메모리를 위한 세션 ID 초기화 (재접속 시 URL의 thread 파라미터로 이어가기)
+    resumed = False
     if "thread_id" not in st.session_state:
-        st.session_state.thread_id = str(uuid.uuid4())
+        resumed = "thread" in st.query_params
+        st.session_state.thread_id = st.query_params.get("thread") or str(uuid.uuid4())
+        st.query_params["thread"] = st.session_state.thread_id
+    
+    # 세션 상태 초기화
+    if "messages" not in st.session_state:
+        if resumed:
+            # 캐시된 턴에 마지막 동기화 이후의 새 턴만 받아와 대화 복원
+            history_cache.sync(st.session_state.api_client, st.session_state.thread_id)
+            st.session_state.messages = history_cache.messages(st.session_state.thread_id)
+        else:
+            st.session_state.messages = []
     
     if "user_id" not in st.session_state:
         st.session_state.user_id = str(uuid.uuid4())
@@ -51,37 +76,34 @@ def main():
         st.markdown(f"**사용자 ID**: `{st.session_state.user_id[:8]}...`")
         st.markdown(f"**대화 수**: {len(st.session_state.messages) // 2}")
         
-        # 멀티턴 테스트 버튼 추가
+        # 멀티턴 테스트 버튼 추가 (부하 테스트 하네스와 같은 시나리오 사용)
         if st.button("멀티턴 테스트"):
             with st.spinner("멀티턴 메모리 테스트 중..."):
-                # 첫 번째 테스트
-                test_response1 = st.session_state.api_client.chat_with_memory(
-                    query="갤럭시 스마트폰 추천해줘",
-                    thread_id=st.session_state.thread_id,
-                    user_id=st.session_state.user_id
-                )
-                
-                # 두 번째 테스트
-                test_response2 = st.session_state.api_client.chat_with_memory(
-                    query="그 중에서 50만원 이하인 것만 추천해줘",
+                turn_results = replay_conversation(
+                    st.session_state.api_client,
+                    MULTITURN_SELF_TEST,
                     thread_id=st.session_state.thread_id,
                     user_id=st.session_state.user_id
                 )
                 
                 # 결과 표시
-                if "갤럭시 스마트폰" in test_response2:
+                failed = [r for r in turn_results if not r.memory_ok]
+                if not failed:
                     st.success("✅ 멀티턴 메모리 정상 작동!")
                 else:
                     st.error("❌ 멀티턴 메모리 문제 발생")
-                    st.text(f"응답: {test_response2[:100]}...")
+                    st.text(f"응답: {failed[0].response[:100]}...")
         
         if st.button("새 대화 시작"):
             # 백엔드 대화 히스토리 삭제
             old_thread_id = st.session_state.thread_id
             clear_result = st.session_state.api_client.clear_thread_history(old_thread_id)
+            history_cache.invalidate(old_thread_id)
+            response_cache.invalidate(("debug", old_thread_id))
             
             # 새로운 세션 시작
             st.session_state.thread_id = str(uuid.uuid4())
+            st.query_params["thread"] = st.session_state.thread_id
             st.session_state.messages = []
             
             if clear_result.get("status") == "success":
@@ -93,6 +115,8 @@ def main():
         if st.button("대화 기록 삭제"):
             # 백엔드 대화 히스토리 삭제
             clear_result = st.session_state.api_client.clear_thread_history(st.session_state.thread_id)
+            history_cache.invalidate(st.session_state.thread_id)
+            response_cache.invalidate(("debug", st.session_state.thread_id))
             
             # 프론트엔드 메시지 삭제
             st.session_state.messages = []
@@ -126,7 +150,11 @@ def main():
             
             # 백엔드 디버깅 정보 조회
             if st.button("백엔드 상태 확인"):
-                debug_info = st.session_state.api_client.get_thread_debug_info(st.session_state.thread_id)
+                thread_id = st.session_state.thread_id
+                debug_info = response_cache.get_or_fetch(
+                    ("debug", thread_id),
+                    lambda: st.session_state.api_client.get_thread_debug_info(thread_id)
+                )
                 if debug_info.get("status") != "error":
                     st.json(debug_info)
                 else:
@@ -147,19 +175,24 @@ def main():
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # AI 응답 생성 (멀티턴 메모리 사용)
+        # AI 응답 생성 (멀티턴 메모리 사용, 토큰이 도착하는 대로 표시)
         with st.chat_message("assistant"):
-            with st.spinner("AI가 이전 대화를 기억하며 응답 중..."):
-                # 멀티턴 메모리 API 호출
-                response = st.session_state.api_client.chat_with_memory(
+            response = st.write_stream(
+                st.session_state.api_client.stream_chat_with_memory(
                     query=prompt,
                     thread_id=st.session_state.thread_id,
                     user_id=st.session_state.user_id
                 )
-                st.markdown(response)
+            )
+            if not isinstance(response, str):
+                response = "".join(str(part) for part in response)
         
         # AI 응답 추가
         st.session_state.messages.append({"role": "assistant", "content": response})
+        
+        # 새 턴만 캐시에 동기화하고, 바뀐 디버깅 정보 캐시는 비움
+        history_cache.sync(st.session_state.api_client, st.session_state.thread_id, force=True)
+        response_cache.invalidate(("debug", st.session_state.thread_id))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""
+클라이언트 측 응답 캐시 및 대화 히스토리 증분 동기화
+Streamlit 재실행/재접속 시 백엔드에서 전체 대화를 다시 받지 않도록
+스레드별 턴을 message_id 기준으로 캐시하고 since 커서로 새 턴만 가져온다
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+# 디버깅 정보 등 단순 조회 응답 캐시 유지 시간 (초)
+DEFAULT_RESPONSE_TTL = 10.0
+
+# 히스토리 동기화 최소 간격 (초) - 이 시간 안의 재실행은 네트워크 요청 없이 캐시 사용
+DEFAULT_SYNC_TTL = 5.0
+
+
+class TTLCache:
+    """만료 시간을 가진 간단한 키-값 캐시 (st.cache_data와 같은 TTL 방식)"""
+
+    def __init__(self, ttl: float = DEFAULT_RESPONSE_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """캐시된 값이 유효하면 반환, 아니면 fetch() 결과를 저장 후 반환"""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        value = fetch()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """키에 해당하는 캐시 제거"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class _ThreadHistory:
+    """스레드 하나의 캐시 상태"""
+
+    def __init__(self):
+        self.turns: "OrderedDict[str, Dict]" = OrderedDict()
+        self.cursor: Optional[str] = None
+        self.synced_at: Optional[float] = None
+
+
+class ThreadHistoryCache:
+    """
+    스레드별 대화 턴 캐시
+
+    턴은 message_id로 중복 제거되어 도착 순서대로 보관되고,
+    sync()는 마지막 커서 이후의 새 턴만 백엔드에서 받아 병합한다.
+    """
+
+    def __init__(self, sync_ttl: float = DEFAULT_SYNC_TTL, clock: Callable[[], float] = time.monotonic):
+        self.sync_ttl = sync_ttl
+        self._clock = clock
+        self._threads: Dict[str, _ThreadHistory] = {}
+        self._lock = threading.Lock()
+
+    def _thread(self, thread_id: str) -> _ThreadHistory:
+        if thread_id not in self._threads:
+            self._threads[thread_id] = _ThreadHistory()
+        return self._threads[thread_id]
+
+    def sync(self, client, thread_id: str, force: bool = False) -> bool:
+        """
+        새 턴을 증분 동기화
+
+        Args:
+            client: sync_history(thread_id, since)를 가진 API 클라이언트
+            thread_id: 동기화할 스레드 ID
+            force: True면 TTL과 관계없이 동기화
+
+        Returns:
+            bool: 동기화 성공 여부 (TTL 안이라 건너뛴 경우도 True)
+        """
+        with self._lock:
+            entry = self._thread(thread_id)
+            fresh = entry.synced_at is not None and self._clock() - entry.synced_at < self.sync_ttl
+            if fresh and not force:
+                return True
+            cursor = entry.cursor
+
+        while True:
+            result = client.sync_history(thread_id, since=cursor)
+            if result.get("status") == "error":
+                return False
+
+            with self._lock:
+                entry = self._thread(thread_id)
+                for item in result.get("history", []):
+                    entry.turns[item["message_id"]] = item
+                entry.cursor = cursor = result.get("cursor", cursor)
+                entry.synced_at = self._clock()
+
+            if not result.get("has_more"):
+                return True
+
+    def messages(self, thread_id: str) -> List[Dict]:
+        """캐시된 턴을 Streamlit 채팅 메시지 목록으로 변환"""
+        with self._lock:
+            turns = list(self._thread(thread_id).turns.values())
+
+        messages = []
+        for turn in turns:
+            messages.append({"role": "user", "content": turn["user_message"], "id": turn["message_id"]})
+            messages.append({"role": "assistant", "content": turn["bot_response"], "id": turn["message_id"]})
+        return messages
+
+    def invalidate(self, thread_id: str):
+        """스레드 캐시 제거"""
+        with self._lock:
+            self._threads.pop(thread_id, None)
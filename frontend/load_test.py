@@ -0,0 +1,296 @@
+"""
+멀티턴 대화 부하/소크 테스트 하네스
+기록된 멀티턴 대화를 N명의 가상 사용자가 동시에 재생하며
+처리량, 지연 시간(p50/p95/p99), 메모리(맥락 유지) 정확도를 측정한다
+
+실행 예시:
+    python load_test.py --users 20 --iterations 5
+    python load_test.py --stub --users 50 --duration 60   # 로컬 스텁 백엔드로 실행
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from api_client import APIClient
+
+
+# 사이드바 "멀티턴 테스트"와 동일한 기본 시나리오
+# expect: 응답에 반드시 포함되어야 하는 문자열 (이전 턴의 맥락이 유지되는지 확인)
+MULTITURN_SELF_TEST = {
+    "name": "갤럭시 후속 질문",
+    "turns": [
+        {"query": "갤럭시 스마트폰 추천해줘"},
+        {"query": "그 중에서 50만원 이하인 것만 추천해줘", "expect": ["갤럭시 스마트폰"]}
+    ]
+}
+
+DEFAULT_CONVERSATIONS: List[Dict] = [
+    MULTITURN_SELF_TEST,
+    {
+        "name": "노트북 비교",
+        "turns": [
+            {"query": "맥북 에어 M3 가격 알려줘"},
+            {"query": "그거랑 LG 그램이랑 비교해줘", "expect": ["맥북 에어"]},
+            {"query": "둘 중에 배터리가 오래가는 건?", "expect": ["맥북 에어"]}
+        ]
+    },
+    {
+        "name": "이어폰 단일 질문",
+        "turns": [
+            {"query": "노이즈캔슬링 무선 이어폰 최저가"}
+        ]
+    }
+]
+
+# APIClient가 반환하는 에러 메시지 접두어
+ERROR_PREFIXES = ("❌", "⏰")
+
+
+@dataclass
+class TurnResult:
+    """한 턴(요청) 실행 결과"""
+    conversation: str
+    query: str
+    latency: float
+    ok: bool
+    memory_checked: bool = False
+    memory_ok: bool = True
+    response: str = ""
+
+
+@dataclass
+class LoadTestReport:
+    """부하 테스트 결과 요약"""
+    users: int
+    duration: float
+    results: List[TurnResult] = field(default_factory=list)
+
+    @property
+    def total_requests(self) -> int:
+        return len(self.results)
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for r in self.results if not r.ok)
+
+    @property
+    def throughput(self) -> float:
+        """초당 처리 요청 수"""
+        return self.total_requests / self.duration if self.duration > 0 else 0.0
+
+    def latency_percentile(self, percent: float) -> float:
+        """성공 요청 지연 시간의 백분위수 (초)"""
+        return percentile([r.latency for r in self.results if r.ok], percent)
+
+    @property
+    def memory_checks(self) -> int:
+        return sum(1 for r in self.results if r.memory_checked)
+
+    @property
+    def memory_correctness(self) -> float:
+        """맥락 유지 검사 통과율 (검사 대상이 없으면 1.0)"""
+        checked = [r for r in self.results if r.memory_checked]
+        if not checked:
+            return 1.0
+        return sum(1 for r in checked if r.memory_ok) / len(checked)
+
+    def to_dict(self) -> Dict:
+        """JSON 출력용 딕셔너리"""
+        return {
+            "users": self.users,
+            "duration_s": round(self.duration, 3),
+            "total_requests": self.total_requests,
+            "errors": self.error_count,
+            "throughput_rps": round(self.throughput, 2),
+            "latency_ms": {
+                "p50": round(self.latency_percentile(50) * 1000, 1),
+                "p95": round(self.latency_percentile(95) * 1000, 1),
+                "p99": round(self.latency_percentile(99) * 1000, 1)
+            },
+            "memory_checks": self.memory_checks,
+            "memory_correctness": round(self.memory_correctness, 4)
+        }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """선형 보간 백분위수 (값이 없으면 0.0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def replay_conversation(
+    client: APIClient,
+    conversation: Dict,
+    thread_id: Optional[str] = None,
+    user_id: Optional[str] = None
+) -> List[TurnResult]:
+    """
+    하나의 멀티턴 대화를 같은 세션으로 순서대로 재생
+
+    Args:
+        client: 사용할 API 클라이언트
+        conversation: {"name": ..., "turns": [{"query": ..., "expect": [...]}, ...]}
+        thread_id: 대화 세션 ID (없으면 새로 생성)
+        user_id: 사용자 ID (없으면 새로 생성)
+
+    Returns:
+        턴별 실행 결과 리스트
+    """
+    thread_id = thread_id or str(uuid.uuid4())
+    user_id = user_id or str(uuid.uuid4())
+    results = []
+
+    for turn in conversation["turns"]:
+        start = time.perf_counter()
+        response = client.chat_with_memory(query=turn["query"], thread_id=thread_id, user_id=user_id)
+        latency = time.perf_counter() - start
+
+        ok = not response.startswith(ERROR_PREFIXES)
+        expected = turn.get("expect", [])
+        results.append(TurnResult(
+            conversation=conversation.get("name", ""),
+            query=turn["query"],
+            latency=latency,
+            ok=ok,
+            memory_checked=bool(expected),
+            memory_ok=ok and all(text in response for text in expected),
+            response=response
+        ))
+
+    return results
+
+
+def run_load_test(
+    conversations: List[Dict],
+    users: int = 10,
+    iterations: int = 1,
+    duration: Optional[float] = None,
+    client_factory: Callable[[], APIClient] = APIClient
+) -> LoadTestReport:
+    """
+    가상 사용자 N명이 대화 시나리오를 동시에 반복 재생
+
+    Args:
+        conversations: 재생할 대화 시나리오 목록
+        users: 동시 가상 사용자 수
+        iterations: 사용자당 전체 시나리오 반복 횟수 (duration이 없을 때)
+        duration: 지정 시 반복 횟수 대신 이 시간(초) 동안 계속 재생 (소크 테스트)
+        client_factory: 사용자별 API 클라이언트 생성 함수 (사용자마다 keep-alive 세션 하나)
+
+    Returns:
+        LoadTestReport: 결과 요약
+    """
+    lock = threading.Lock()
+    results: List[TurnResult] = []
+
+    def simulate_user(index: int):
+        client = client_factory()
+        user_id = f"load-user-{index}-{uuid.uuid4().hex[:8]}"
+        deadline = time.perf_counter() + duration if duration else None
+        iteration = 0
+        try:
+            while True:
+                if deadline is None and iteration >= iterations:
+                    break
+                for conversation in conversations:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        return
+                    turn_results = replay_conversation(client, conversation, user_id=user_id)
+                    with lock:
+                        results.extend(turn_results)
+                iteration += 1
+        finally:
+            close = getattr(client, "close", None)
+            if close:
+                close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        list(executor.map(simulate_user, range(users)))
+    elapsed = time.perf_counter() - start
+
+    return LoadTestReport(users=users, duration=elapsed, results=results)
+
+
+def start_stub_backend(host: str = "127.0.0.1", port: int = 8765) -> str:
+    """
+    외부 LLM/검색 없이 동작하는 스텁 백엔드를 같은 프로세스에서 실행
+
+    백엔드 앱을 그대로 띄우되 LLM_PROVIDER/SEARCH_PROVIDER=fake 설정으로
+    백엔드의 가짜 제공자(app.agents.fake_providers)를 사용한다.
+    가짜 LLM은 프롬프트에 포함된 이전 대화의 사용자 질문을 응답에 다시 언급하므로
+    메모리 파이프라인이 깨지면 맥락 유지 검사가 실패한다.
+    지연 시간/에러율은 FAKE_* 환경 변수로 조정할 수 있다.
+
+    Returns:
+        스텁 백엔드 base URL
+    """
+    backend_dir = Path(__file__).resolve().parent.parent / "backend"
+    sys.path.insert(0, str(backend_dir))
+
+    # 백엔드 설정은 import 시점에 읽히므로 먼저 환경 변수를 지정
+    os.environ.setdefault("LLM_PROVIDER", "fake")
+    os.environ.setdefault("SEARCH_PROVIDER", "fake")
+
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://{host}:{port}"
+
+
+def load_conversations(path: Optional[str]) -> List[Dict]:
+    """JSON 파일에서 대화 시나리오 로드 (없으면 기본 시나리오)"""
+    if not path:
+        return DEFAULT_CONVERSATIONS
+    with open(path, encoding="utf-8") as f:
+        conversations: List[Dict] = json.load(f)
+    return conversations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멀티턴 대화 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="백엔드 서버 URL")
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--iterations", type=int, default=1, help="사용자당 시나리오 반복 횟수")
+    parser.add_argument("--duration", type=float, default=None, help="소크 테스트 시간(초)")
+    parser.add_argument("--scenarios", default=None, help="대화 시나리오 JSON 파일 경로")
+    parser.add_argument("--stub", action="store_true", help="스텁 LLM/검색을 사용하는 로컬 백엔드로 실행")
+    parser.add_argument("--min-correctness", type=float, default=1.0, help="이 값 미만이면 종료 코드 1")
+    args = parser.parse_args()
+
+    base_url = start_stub_backend() if args.stub else args.base_url
+    conversations = load_conversations(args.scenarios)
+
+    report = run_load_test(
+        conversations,
+        users=args.users,
+        iterations=args.iterations,
+        duration=args.duration,
+        client_factory=lambda: APIClient(base_url)
+    )
+
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    if report.error_count or report.memory_correctness < args.min_correctness:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 """
 FastAPI 백엔드 연동 테스트
 """
+import asyncio
+import httpx
 import pytest
-from unittest.mock import Mock, patch
-from api_client import APIClient
+from unittest.mock import MagicMock, Mock, patch
+from api_client import APIClient, AsyncAPIClient, CONNECT_TIMEOUT, READ_TIMEOUT
 
 
 class TestAPIIntegration:
@@ -16,7 +18,7 @@ class TestAPIIntegration:
         assert hasattr(client, 'base_url')
         assert client.base_url == "http://localhost:8000"
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_search_products_success(self, mock_post):
         """상품 검색 API 호출 성공 테스트"""
         # Mock 응답 설정
@@ -36,7 +38,7 @@ class TestAPIIntegration:
         assert "iPhone 15에 대한 검색 결과" in result
         mock_post.assert_called_once()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_search_products_error_handling(self, mock_post):
         """상품 검색 API 에러 처리 테스트"""
         # Mock 에러 응답 설정
@@ -54,4 +56,85 @@ class TestAPIIntegration:
     def test_api_client_url_configuration(self):
         """API 클라이언트 URL 설정 테스트"""
         client = APIClient("http://custom:9000")
-        assert client.base_url == "http://custom:9000" 
\ No newline at end of file
+        assert client.base_url == "http://custom:9000" 
+    
+    def test_api_client_reuses_pooled_session(self):
+        """요청마다 같은 keep-alive 세션을 재사용하는지 테스트"""
+        client = APIClient()
+        adapter = client.session.get_adapter("http://localhost:8000")
+        
+        assert adapter.max_retries.total > 0
+        assert 502 in adapter.max_retries.status_forcelist
+        
+        with patch.object(client.session, "post") as mock_post:
+            mock_post.return_value.json.return_value = {"response": "응답"}
+            client.chat_with_memory("질문")
+            client.chat_with_memory("질문")
+        
+        assert mock_post.call_count == 2
+        assert mock_post.call_args[1]["timeout"] == (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    
+    def test_stream_chat_yields_chunks(self):
+        """스트리밍 채팅이 응답 조각을 순서대로 돌려주는지 테스트"""
+        client = APIClient()
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.encoding = "utf-8"
+        mock_response.iter_content.return_value = iter(["갤럭시 ", "", "S24 추천"])
+        
+        with patch.object(client.session, "post", return_value=mock_response) as mock_post:
+            chunks = list(client.stream_chat_with_memory("갤럭시 추천", thread_id="t1"))
+        
+        assert chunks == ["갤럭시 ", "S24 추천"]
+        assert mock_post.call_args[1]["stream"] is True
+        assert mock_post.call_args[0][0].endswith("/api/chat/stream")
+    
+    def test_stream_chat_connection_error(self):
+        """스트리밍 채팅 연결 실패 시 에러 메시지 반환"""
+        import requests
+        client = APIClient()
+        
+        with patch.object(client.session, "post", side_effect=requests.exceptions.ConnectionError()):
+            chunks = list(client.stream_chat_with_memory("질문"))
+        
+        assert len(chunks) == 1
+        assert "연결할 수 없습니다" in chunks[0]
+
+class TestAsyncAPIClient:
+    """비동기 API 클라이언트 테스트"""
+    
+    def _client(self, handler):
+        transport = httpx.MockTransport(handler)
+        return AsyncAPIClient(client=httpx.AsyncClient(base_url="http://test", transport=transport))
+    
+    def test_async_chat_with_memory(self):
+        """비동기 채팅 호출 테스트"""
+        def handler(request):
+            assert request.url.path == "/api/chat"
+            return httpx.Response(200, json={"response": "비동기 응답"})
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await client.chat_with_memory("질문", thread_id="t1")
+        
+        assert asyncio.run(run()) == "비동기 응답"
+    
+    def test_async_http_error(self):
+        """비동기 HTTP 오류 처리 테스트"""
+        def handler(request):
+            return httpx.Response(500, json={"detail": "error"})
+        
+        async def run():
+            async with self._client(handler) as client:
+                return await client.search_products("테스트")
+        
+        assert "HTTP 오류" in asyncio.run(run())
+    
+    def test_async_health_check(self):
+        """비동기 헬스 체크 테스트"""
+        async def run():
+            async with self._client(lambda request: httpx.Response(200, json={})) as client:
+                return await client.health_check()
+        
+        assert asyncio.run(run()) is True
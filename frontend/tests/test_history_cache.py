@@ -0,0 +1,113 @@
+"""
+클라이언트 측 캐시 및 증분 히스토리 동기화 테스트
+"""
+import pytest
+from unittest.mock import Mock
+from history_cache import ThreadHistoryCache, TTLCache
+
+
+class FakeClock:
+    """테스트용 시계"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def turn(message_id, user_message="질문", bot_response="응답"):
+    return {"message_id": message_id, "user_message": user_message, "bot_response": bot_response}
+
+
+class TestTTLCache:
+    """TTL 캐시 테스트 클래스"""
+    
+    def test_cached_until_expiry(self):
+        """만료 전에는 fetch를 다시 호출하지 않음"""
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        fetch = Mock(side_effect=["첫 번째", "두 번째"])
+        
+        assert cache.get_or_fetch("key", fetch) == "첫 번째"
+        clock.now = 5
+        assert cache.get_or_fetch("key", fetch) == "첫 번째"
+        clock.now = 11
+        assert cache.get_or_fetch("key", fetch) == "두 번째"
+        assert fetch.call_count == 2
+    
+    def test_invalidate(self):
+        """무효화 후 다시 조회"""
+        cache = TTLCache(ttl=10)
+        fetch = Mock(side_effect=[1, 2])
+        cache.get_or_fetch("key", fetch)
+        cache.invalidate("key")
+        assert cache.get_or_fetch("key", fetch) == 2
+
+
+class TestThreadHistoryCache:
+    """스레드 히스토리 캐시 테스트 클래스"""
+    
+    def test_incremental_sync_uses_cursor(self):
+        """두 번째 동기화는 이전 커서 이후만 요청"""
+        client = Mock()
+        client.sync_history.side_effect = [
+            {"history": [turn("m1")], "cursor": "c1", "has_more": False},
+            {"history": [turn("m2", "후속 질문")], "cursor": "c2", "has_more": False}
+        ]
+        cache = ThreadHistoryCache(sync_ttl=0)
+        
+        assert cache.sync(client, "t1")
+        assert cache.sync(client, "t1")
+        
+        assert client.sync_history.call_args_list[1][1]["since"] == "c1"
+        messages = cache.messages("t1")
+        assert [m["content"] for m in messages] == ["질문", "응답", "후속 질문", "응답"]
+    
+    def test_sync_skipped_within_ttl(self):
+        """TTL 안에서는 네트워크 요청 없이 캐시 사용"""
+        clock = FakeClock()
+        client = Mock()
+        client.sync_history.return_value = {"history": [], "cursor": "c1", "has_more": False}
+        cache = ThreadHistoryCache(sync_ttl=5, clock=clock)
+        
+        cache.sync(client, "t1")
+        cache.sync(client, "t1")
+        assert client.sync_history.call_count == 1
+        
+        cache.sync(client, "t1", force=True)
+        assert client.sync_history.call_count == 2
+    
+    def test_dedupes_by_message_id_and_follows_has_more(self):
+        """message_id 중복 제거 및 has_more 페이지 연속 조회"""
+        client = Mock()
+        client.sync_history.side_effect = [
+            {"history": [turn("m1"), turn("m2")], "cursor": "c2", "has_more": True},
+            {"history": [turn("m2"), turn("m3")], "cursor": "c3", "has_more": False}
+        ]
+        cache = ThreadHistoryCache()
+        
+        cache.sync(client, "t1")
+        assert len(cache.messages("t1")) == 6
+    
+    def test_sync_error_keeps_cache(self):
+        """동기화 실패 시 기존 캐시 유지"""
+        client = Mock()
+        client.sync_history.side_effect = [
+            {"history": [turn("m1")], "cursor": "c1", "has_more": False},
+            {"status": "error", "message": "연결 실패"}
+        ]
+        cache = ThreadHistoryCache(sync_ttl=0)
+        
+        assert cache.sync(client, "t1")
+        assert not cache.sync(client, "t1")
+        assert len(cache.messages("t1")) == 2
+    
+    def test_invalidate(self):
+        """스레드 캐시 무효화"""
+        client = Mock()
+        client.sync_history.return_value = {"history": [turn("m1")], "cursor": "c1", "has_more": False}
+        cache = ThreadHistoryCache()
+        cache.sync(client, "t1")
+        cache.invalidate("t1")
+        assert cache.messages("t1") == []
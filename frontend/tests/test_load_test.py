@@ -0,0 +1,70 @@
+"""
+멀티턴 부하 테스트 하네스 테스트
+"""
+from typing import Dict, List, Optional
+
+import pytest
+from load_test import (
+    LoadTestReport, MULTITURN_SELF_TEST, TurnResult,
+    percentile, replay_conversation, run_load_test
+)
+
+
+class FakeClient:
+    """이전 질문을 기억하는 가짜 API 클라이언트"""
+    
+    def __init__(self, remember: bool = True):
+        self.remember = remember
+        self.threads: Dict[Optional[str], List[str]] = {}
+    
+    def chat_with_memory(self, query, thread_id=None, user_id=None):
+        history = self.threads.setdefault(thread_id, [])
+        context = history[0] if history and self.remember else ""
+        history.append(query)
+        return f"{context} 응답"
+
+
+class TestLoadTestHarness:
+    """부하 테스트 하네스 테스트 클래스"""
+    
+    def test_percentile(self):
+        """백분위수 계산 테스트"""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([], 95) == 0.0
+    
+    def test_replay_conversation_checks_memory(self):
+        """대화 재생 시 맥락 유지 검사"""
+        results = replay_conversation(FakeClient(), MULTITURN_SELF_TEST)
+        assert len(results) == 2
+        assert results[1].memory_checked
+        assert results[1].memory_ok
+        
+        broken = replay_conversation(FakeClient(remember=False), MULTITURN_SELF_TEST)
+        assert not broken[1].memory_ok
+    
+    def test_error_responses_are_counted(self):
+        """에러 메시지 응답은 실패로 집계"""
+        report = LoadTestReport(users=1, duration=1.0, results=[
+            TurnResult(conversation="c", query="q", latency=0.1, ok=True),
+            TurnResult(conversation="c", query="q", latency=0.2, ok=False)
+        ])
+        assert report.error_count == 1
+        assert report.throughput == 2.0
+    
+    def test_run_load_test_concurrent_users(self):
+        """여러 가상 사용자 동시 실행 결과 집계"""
+        report = run_load_test(
+            [MULTITURN_SELF_TEST],
+            users=4,
+            iterations=3,
+            client_factory=FakeClient
+        )
+        summary = report.to_dict()
+        
+        assert summary["total_requests"] == 4 * 3 * 2
+        assert summary["errors"] == 0
+        assert summary["memory_checks"] == 12
+        assert summary["memory_correctness"] == 1.0
+        assert summary["latency_ms"]["p99"] >= summary["latency_ms"]["p50"]